@@ -3,6 +3,7 @@ from pathlib import Path
 from dataset_foundry.actions.dataset.load_dataset import load_dataset
 from dataset_foundry.actions.item.generate_item import generate_item
 from dataset_foundry.actions.item.log_item import log_item
+from dataset_foundry.actions.item.parallel_item import parallel_item
 from dataset_foundry.actions.item.save_item_chat import save_item_chat
 from dataset_foundry.actions.item.set_item_metadata import set_item_metadata
 from dataset_foundry.actions.item.set_item_property import set_item_property
@@ -35,20 +36,24 @@ pipeline = ItemPipeline(
         set_item_metadata(),
         generate_item(prompt=Key("context.prompts.generate_functions_and_classes")),
         save_item_chat(filename=Template("{id}/chat_{metadata.created_at}_generate_all_from_spec.yaml")),
-        parse_item(xml_block="code", output_key="code"),
-        parse_item(xml_block="unit_tests", output_key="unit_tests"),
-        save_item(contents=Key("code"), filename=Template("{id}/source.py")),
-        save_item(contents=Key("unit_tests"), filename=Template("{id}/test.py")),
-        save_item(
-            contents=(lambda item: {
-                'id': item.id,
-                'metadata': item.data['metadata'],
-                'name': item.data['spec']['name'],
-                'language': item.data['spec']['language'],
-                **pick(['spec', 'source', 'test'], item.data),
-            }),
-            filename=Template("{id}/info.yaml"),
-            format="yaml"
-        ),
+        parallel_item([
+            parse_item(xml_block="code", output_key="code"),
+            parse_item(xml_block="unit_tests", output_key="unit_tests"),
+        ]),
+        parallel_item([
+            save_item(contents=Key("code"), filename=Template("{id}/source.py")),
+            save_item(contents=Key("unit_tests"), filename=Template("{id}/test.py")),
+            save_item(
+                contents=(lambda item: {
+                    'id': item.id,
+                    'metadata': item.data['metadata'],
+                    'name': item.data['spec']['name'],
+                    'language': item.data['spec']['language'],
+                    **pick(['spec', 'source', 'test'], item.data),
+                }),
+                filename=Template("{id}/info.yaml"),
+                format="yaml"
+            ),
+        ]),
     ]
 )
@@ -0,0 +1,103 @@
+import argparse
+import builtins
+import time
+from typing import Callable, List, NamedTuple
+
+from dataset_foundry.core.dataset_item import DatasetItem
+from dataset_foundry.utils.eval.compile_expression import compile_expression
+from dataset_foundry.utils.eval.item_eval import item_eval
+from dataset_foundry.utils.eval.safe_eval import ALLOWED_GLOBALS
+
+class EvalStats(NamedTuple):
+    """Timing statistics for a single run"""
+    mode: str
+    elapsed: float
+    per_check: float
+
+class FakeContext:
+    """Minimal context, since conditions in the benchmark don't read from it"""
+    params = {}
+
+def uncompiled_item_eval(expression: str, item: DatasetItem, context, variables: dict):
+    """Evaluate a condition the way `item_eval` did before conditions were compiled"""
+    locals = {
+        **variables,
+        **item.data,
+        'id': item.id,
+        'context': context,
+    }
+    safe_globals = {
+        "__builtins__": { name: getattr(builtins, name) for name in ALLOWED_GLOBALS },
+    }
+    return eval(expression, safe_globals, locals)
+
+def create_items(count: int, fields: int) -> List[DatasetItem]:
+    """Create items with many fields, like items late in a pipeline"""
+    return [
+        DatasetItem(f"{index:05d}", {
+            "tests_passed": index % 3 != 0,
+            "attempts": index % 5,
+            **{ f"field_{field}": f"value {field}" * 20 for field in range(fields) },
+        })
+        for index in range(count)
+    ]
+
+def run_benchmark(mode: str, check: Callable, items: List[DatasetItem], iterations: int):
+    """Check the condition for every item, as `while_item` does on each loop"""
+    context = FakeContext()
+
+    start = time.perf_counter()
+    for iteration in range(iterations):
+        for item in items:
+            check(item, context, { 'iteration': iteration })
+    elapsed = time.perf_counter() - start
+
+    return EvalStats(mode=mode, elapsed=elapsed, per_check=elapsed / (iterations * len(items)))
+
+def print_results(results: List[EvalStats]):
+    """Print a table comparing the runs"""
+    print(f"\n{'Mode':<12} {'Elapsed (s)':<14} {'Per check (us)':<16} {'Speedup':<10}")
+    print("-" * 52)
+    for result in results:
+        print(
+            f"{result.mode:<12} {result.elapsed:<14.3f} {result.per_check * 1e6:<16.2f}"
+            f" {results[0].elapsed / result.elapsed:<10.1f}"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare evaluating item conditions from strings against compiled conditions'
+    )
+    parser.add_argument('--items', type=int, default=10000, help='Number of items to check')
+    parser.add_argument('--fields', type=int, default=30, help='Number of fields in each item')
+    parser.add_argument('--iterations', type=int, default=3,
+                       help='Number of times to check each item')
+    parser.add_argument('--condition', type=str,
+                       default='not tests_passed and attempts < 3 and iteration < 5',
+                       help='The condition to evaluate')
+    args = parser.parse_args()
+
+    items = create_items(args.items, args.fields)
+    compiled_condition = compile_expression(args.condition)
+
+    results = [
+        run_benchmark(
+            "uncompiled",
+            lambda item, context, variables:
+                uncompiled_item_eval(args.condition, item, context, variables),
+            items,
+            args.iterations,
+        ),
+        run_benchmark(
+            "compiled",
+            lambda item, context, variables:
+                item_eval(compiled_condition, item, context, variables),
+            items,
+            args.iterations,
+        ),
+    ]
+
+    print_results(results)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+import argparse
+import asyncio
+import time
+from typing import List, NamedTuple
+
+import anyio
+
+from dataset_foundry.actions.item.run_in_process import run_in_process
+from dataset_foundry.actions.item.validate_code_syntax import validate_code_syntax
+from dataset_foundry.core.dataset_item import DatasetItem
+from dataset_foundry.core.key import Key
+from dataset_foundry.utils.concurrency.process_pool import get_process_pool, shutdown_process_pool
+
+class StallStats(NamedTuple):
+    """Event loop stall statistics for a single run"""
+    mode: str
+    elapsed: float
+    max_stall: float
+    total_stall: float
+
+class FakeContext:
+    """Minimal context with the parameters used by the benchmarked actions"""
+    def __init__(self, max_processes: int):
+        self.params = {"max_processes": max_processes}
+        self.config = {}
+
+def generate_code(num_functions: int) -> str:
+    """Generate a large but valid Python module"""
+    return "\n\n".join(
+        f"def function_{index}(a, b):\n"
+        f"    values = [a * {index}, b + {index}, (a - b) // {index + 1}]\n"
+        f"    return sum(value for value in values if value % 2 == 0)\n"
+        for index in range(num_functions)
+    )
+
+async def measure_stalls(done: anyio.Event, interval: float, stalls: List[float]):
+    """Record how much later than expected a periodic heartbeat wakes up"""
+    while not done.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        stalls.append(max(0.0, time.perf_counter() - start - interval))
+
+async def run_benchmark(mode: str, items: List[DatasetItem], concurrency: int, max_processes: int):
+    """Validate all items using the given mode while measuring event loop stalls"""
+    if mode == "process":
+        action = run_in_process(validate_code_syntax, input=Key("code"), fields=["code"])
+    else:
+        action = validate_code_syntax(input=Key("code"))
+
+    context = FakeContext(max_processes)
+    limiter = anyio.CapacityLimiter(concurrency)
+    done = anyio.Event()
+    stalls: List[float] = []
+
+    async def process(item: DatasetItem):
+        async with limiter:
+            await action(item, context)
+
+    start = time.perf_counter()
+    async with anyio.create_task_group() as monitor:
+        monitor.start_soon(measure_stalls, done, 0.001, stalls)
+
+        async with anyio.create_task_group() as tg:
+            for item in items:
+                tg.start_soon(process, item)
+
+        done.set()
+
+    return StallStats(
+        mode=mode,
+        elapsed=time.perf_counter() - start,
+        max_stall=max(stalls, default=0.0),
+        total_stall=sum(stalls),
+    )
+
+def print_results(results: List[StallStats]):
+    """Print a table comparing the runs"""
+    print(f"\n{'Mode':<10} {'Elapsed (s)':<14} {'Max stall (ms)':<16} {'Total stall (s)':<16}")
+    print("-" * 56)
+    for result in results:
+        print(
+            f"{result.mode:<10} {result.elapsed:<14.3f} {result.max_stall * 1000:<16.1f}"
+            f" {result.total_stall:<16.3f}"
+        )
+
+async def main_async(args: argparse.Namespace):
+    code = generate_code(args.functions)
+    results = []
+
+    # Start the pool up front so process startup isn't counted as a stall
+    get_process_pool(args.processes).submit(int).result()
+
+    for mode in ["inline", "process"]:
+        items = [DatasetItem(f"{index:04d}", {"code": code}) for index in range(args.items)]
+        results.append(await run_benchmark(mode, items, args.concurrency, args.processes))
+
+    shutdown_process_pool()
+    print_results(results)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Measure event loop stalls caused by CPU-bound item actions'
+    )
+    parser.add_argument('--items', type=int, default=200, help='Number of items to validate')
+    parser.add_argument('--functions', type=int, default=500,
+                       help='Number of functions in the code for each item')
+    parser.add_argument('--concurrency', type=int, default=10,
+                       help='Number of items processed concurrently')
+    parser.add_argument('--processes', type=int, default=4,
+                       help='Number of worker processes in the process pool')
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args))
+
+if __name__ == '__main__':
+    main()
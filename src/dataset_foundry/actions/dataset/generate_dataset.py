@@ -9,6 +9,8 @@ from ...core.context import Context
 from ...core.dataset import Dataset
 from ...core.dataset_item import DatasetItem
 from ...core.key import Key
+from ...core.model_registry import get_model
+from ...core.resource_pools import resource_pools
 from ...types.dataset_action import DatasetAction
 from ...utils.params.resolve_dataset_value import resolve_dataset_value
 from ...utils.get_pipeline_metadata import get_pipeline_metadata
@@ -24,6 +26,7 @@ def generate_dataset(
         output_key: Optional[Union[Callable,Key,str]] = None,
         dataset_metadata_key: Optional[Union[Callable,Key,str]] = None,
         dataset_chat_key: Optional[Union[Callable,Key,str]] = "chat",
+        resource: Optional[Union[Callable,Key,str]] = "llm",
     ) -> DatasetAction:
     """
     Generate a dataset by given a prompt to a model and parsing the response.
@@ -38,6 +41,7 @@ def generate_dataset(
             metadata will be merged with the existing metadata instead.
         dataset_chat_key: The key to save the chat messages used to generate the dataset. If not
             provided, the chat messages will not be saved.
+        resource: The resource pool to hold while calling the model (default: "llm").
 
     Returns:
         A dataset action that can be used to generate a dataset.
@@ -45,11 +49,14 @@ def generate_dataset(
 
     async def generate_dataset_action(dataset: Dataset, context: Context):
         resolved_prompt = resolve_dataset_value(prompt, dataset, context, required_as="prompt")
-        resolved_model = resolve_dataset_value(model, dataset, context, required_as="model")
+        resolved_model = get_model(
+            resolve_dataset_value(model, dataset, context, required_as="model")
+        )
         resolved_parser = resolve_dataset_value(parser, dataset, context)
         resolved_output_key = resolve_dataset_value(output_key, dataset, context)
         resolved_dataset_metadata_key = resolve_dataset_value(dataset_metadata_key, dataset, context)
         resolved_dataset_chat_key = resolve_dataset_value(dataset_chat_key, dataset, context)
+        resolved_resource = resolve_dataset_value(resource, dataset, context)
 
         # Build the prompt
         variables = re.findall(variable_regex, resolved_prompt)
@@ -69,7 +76,8 @@ def generate_dataset(
 
         # Generate the response
         messages = await model_prompt.aformat_messages()
-        response = await resolved_model.ainvoke(messages)
+        async with resource_pools.acquire(resolved_resource):
+            response = await resolved_model.ainvoke(messages)
 
         if resolved_parser:
             contents = resolved_parser(response.content)
@@ -91,7 +99,7 @@ def generate_dataset(
         metadata = {
             "num_samples": len(contents),
             "pipeline": get_pipeline_metadata(context),
-            "model": context.model.info,
+            "model": resolved_model.info,
             "created_at": datetime.now().isoformat(),
         }
 
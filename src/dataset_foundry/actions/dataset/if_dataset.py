@@ -2,6 +2,7 @@ import logging
 from ...core.context import Context
 from ...core.dataset import Dataset
 from ...types.dataset_action import DatasetAction
+from ...utils.eval.compile_expression import compile_expression
 from ...utils.eval.dataset_eval import dataset_eval
 
 logger = logging.getLogger(__name__)
@@ -19,8 +20,10 @@ def if_dataset(condition: str, if_actions: list, else_actions: list = None) -> D
         function: A function that takes a Dataset and Context and executes the actions if the
             condition is true.
     """
+    compiled_condition = compile_expression(condition)
+
     async def if_dataset_action(dataset: Dataset, context: Context):
-        if dataset_eval(condition, dataset, context):
+        if dataset_eval(compiled_condition, dataset, context):
             logger.debug(f"Condition '{condition}' met. Executing 'if' actions.")
             for action in if_actions:
                 await action(dataset, context)
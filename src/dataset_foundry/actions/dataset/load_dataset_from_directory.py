@@ -1,6 +1,8 @@
 import datason.json as json
 import logging
-from typing import Callable, Literal, Optional, Union
+from typing import Any, AsyncIterator, Callable, Literal, Optional, Union
+
+import anyio
 import yaml
 
 from ...core.context import Context
@@ -8,6 +10,7 @@ from ...core.dataset import Dataset
 from ...core.dataset_item import DatasetItem
 from ...core.key import Key
 from ...types.dataset_action import DatasetAction
+from ...types.dataset_source import DatasetSource
 from ...utils.params.resolve_dataset_value import resolve_dataset_value
 from ...utils.find_files import find_files
 
@@ -20,7 +23,8 @@ def load_dataset_from_directory(
         property: Union[Callable,Key,str] = None,
         format: Optional[Union[Callable,Literal['auto', 'text', 'json', 'yaml']]] = 'auto',
         merge: bool = False,
-    ) -> DatasetAction:
+        stream: bool = False,
+    ) -> DatasetAction | DatasetSource:
     async def load_dataset_from_directory_action(dataset: Dataset, context: Context):
         resolved_dir = resolve_dataset_value(dir, dataset, context, required_as="dir")
         resolved_include = resolve_dataset_value(include, dataset, context, required_as="include")
@@ -36,28 +40,10 @@ def load_dataset_from_directory(
         logger.debug(f"Loading data from files matching {include_path}")
 
         for file_info in file_infos:
-            if resolved_format == "auto":
-                if file_info['path'].endswith((".yaml", ".yml")):
-                    file_format = "yaml"
-                elif file_info['path'].endswith(".json"):
-                    file_format = "json"
-                else:
-                    file_format = "text"
-            else:
-                file_format = resolved_format
-
-            with open(file_info['path']) as file:
-                if file_format == "yaml":
-                    data = yaml.safe_load(file)
-                elif file_format == "json":
-                    data = json.load(file)
-                else:
-                    data = file.read()
-
-                dataset_items.append({
-                    'data': data,
-                    'metadata': file_info['metadata']
-                })
+            dataset_items.append({
+                'data': _read_file(file_info['path'], resolved_format),
+                'metadata': file_info['metadata']
+            })
 
         logger.debug(f"Loaded {len(dataset_items)} rows from {include_path}")
 
@@ -66,25 +52,78 @@ def load_dataset_from_directory(
             dataset_items = dataset_items[:context['limit']]
 
         for i, item_info in enumerate(dataset_items):
-            data = item_info['data']
-            metadata = item_info['metadata']
-
-            # Merge metadata except for 'id' into data
-            if isinstance(data, dict):
-                data.update({
-                    key: value for key, value in metadata.items() if key != 'id' and key not in data
-                })
-
-            if isinstance(data, dict) and 'id' in data:
-                id = data['id']
-                del data['id']
-            else:
-                id = metadata['id'] if 'id' in metadata else f"{i+1:03d}"
-
-            item = DatasetItem(
-                id=id,
-                data={ resolved_property: data } if resolved_property else data
-            )
+            item = _create_item(i, item_info['data'], item_info['metadata'], resolved_property)
+            dataset.add(item, merge)
+
+    async def load_dataset_from_directory_source(
+            dataset: Dataset,
+            context: Context,
+        ) -> AsyncIterator[DatasetItem]:
+        resolved_dir = resolve_dataset_value(dir, dataset, context, required_as="dir")
+        resolved_include = resolve_dataset_value(include, dataset, context, required_as="include")
+        resolved_exclude = resolve_dataset_value(exclude, dataset, context)
+        resolved_property = resolve_dataset_value(property, dataset, context)
+        resolved_format = resolve_dataset_value(format, dataset, context)
+
+        include_path = resolved_dir / resolved_include
+        exclude_path = resolved_dir / resolved_exclude if resolved_exclude else None
+        file_infos = find_files(include_path, exclude_path)
+
+        if context['limit'] and len(file_infos) > context['limit']:
+            logger.debug(f"Limiting dataset to {context['limit']} samples")
+            file_infos = file_infos[:context['limit']]
+
+        logger.debug(f"Streaming data from {len(file_infos)} files matching {include_path}")
+
+        for i, file_info in enumerate(file_infos):
+            # Read in a thread so items already loaded keep being processed
+            data = await anyio.to_thread.run_sync(_read_file, file_info['path'], resolved_format)
+            item = _create_item(i, data, file_info['metadata'], resolved_property)
+
+            # Items merged into an existing item aren't new, so only yield added items
+            count = len(dataset.items)
             dataset.add(item, merge)
+            if len(dataset.items) > count:
+                yield item
+
+    if stream:
+        return load_dataset_from_directory_source
+    else:
+        return load_dataset_from_directory_action
+
+
+def _read_file(path: str, format: str) -> Any:
+    if format == "auto":
+        if path.endswith((".yaml", ".yml")):
+            format = "yaml"
+        elif path.endswith(".json"):
+            format = "json"
+        else:
+            format = "text"
+
+    with open(path) as file:
+        if format == "yaml":
+            return yaml.safe_load(file)
+        elif format == "json":
+            return json.load(file)
+        else:
+            return file.read()
+
+
+def _create_item(index: int, data: Any, metadata: dict, property: Optional[str]) -> DatasetItem:
+    # Merge metadata except for 'id' into data
+    if isinstance(data, dict):
+        data.update({
+            key: value for key, value in metadata.items() if key != 'id' and key not in data
+        })
+
+    if isinstance(data, dict) and 'id' in data:
+        id = data['id']
+        del data['id']
+    else:
+        id = metadata['id'] if 'id' in metadata else f"{index+1:03d}"
 
-    return load_dataset_from_directory_action
+    return DatasetItem(
+        id=id,
+        data={ property: data } if property else data
+    )
@@ -0,0 +1,180 @@
+import asyncio
+import glob
+import logging
+import shutil
+from pathlib import Path
+from typing import Callable, List, Union
+
+import datason.json as json
+import yaml
+from mergedeep import Strategy, merge
+
+from ...core.context import Context
+from ...core.dataset import Dataset
+from ...core.key import Key
+from ...types.dataset_action import DatasetAction
+from ...utils.params.resolve_dataset_value import resolve_dataset_value
+
+logger = logging.getLogger(__name__)
+
+def merge_dataset_shards(
+        shard_dirs: Union[Callable,Key,List[str],str],
+        dir: Union[Callable,Key,str] = Key("context.output_dir"),
+        filename: Union[Callable,Key,str] = "dataset.yaml",
+        metadata_filename: Union[Callable,Key,str] = "metadata.yaml",
+    ) -> DatasetAction:
+    """
+    Merges the output directories of runs on separate shards of a dataset (see `--shard`) into a
+    single directory.
+
+    The dataset files saved by `save_dataset` are concatenated in shard order, loading one shard at
+    a time, so the whole dataset doesn't need to fit in memory. The metadata files are merged, with
+    lists from each shard combined, and every other file and directory (e.g. per-item directories)
+    is copied.
+    When two shards contain the same file, the one from the earlier shard is kept.
+
+    Args:
+        shard_dirs: The output directories of the shards, or a glob pattern matching them.
+        dir: The directory to write the merged output to (default: `Key("context.output_dir")`).
+        filename: The name of the dataset file in each shard (default: "dataset.yaml").
+        metadata_filename: The name of the metadata file in each shard (default: "metadata.yaml").
+
+    Returns:
+        function: A function that takes a Dataset and Context and merges the shards.
+    """
+    async def merge_dataset_shards_action(dataset: Dataset, context: Context):
+        resolved_shard_dirs = resolve_dataset_value(
+            shard_dirs, dataset, context, required_as="shard_dirs"
+        )
+        resolved_dir = Path(resolve_dataset_value(dir, dataset, context, required_as="dir"))
+        resolved_filename = resolve_dataset_value(
+            filename, dataset, context, required_as="filename"
+        )
+        resolved_metadata_filename = resolve_dataset_value(metadata_filename, dataset, context)
+
+        if isinstance(resolved_shard_dirs, str):
+            resolved_shard_dirs = sorted(glob.glob(resolved_shard_dirs))
+
+        shard_paths = [Path(shard_dir) for shard_dir in resolved_shard_dirs]
+
+        if resolved_dir.resolve() in [shard_path.resolve() for shard_path in shard_paths]:
+            raise ValueError("The merged output directory can't be one of the shard directories")
+
+        resolved_dir.mkdir(parents=True, exist_ok=True)
+        logger.info(f"Merging {len(shard_paths)} shards into {resolved_dir}")
+
+        num_items = await asyncio.to_thread(
+            _concatenate_yaml_lists,
+            [shard_path / resolved_filename for shard_path in shard_paths],
+            resolved_dir / resolved_filename,
+        )
+
+        if resolved_metadata_filename:
+            metadata = await asyncio.to_thread(
+                _merge_metadata,
+                [shard_path / resolved_metadata_filename for shard_path in shard_paths],
+                resolved_dir / resolved_metadata_filename,
+            )
+            if metadata is not None:
+                dataset.metadata = metadata
+
+        merged_files = { resolved_filename, resolved_metadata_filename }
+        copied_files = set()
+        for shard_path in shard_paths:
+            await asyncio.to_thread(
+                _copy_shard_files, shard_path, resolved_dir, merged_files, copied_files
+            )
+
+        logger.info(f"Merged {num_items} items into {resolved_dir / resolved_filename}")
+
+    return merge_dataset_shards_action
+
+
+class _NoAliasDumper(yaml.SafeDumper):
+    """
+    A dumper that writes repeated values in full instead of as anchors and aliases, since anchor
+    names restart in each dump and would collide when the dumps are concatenated.
+    """
+    def ignore_aliases(self, data) -> bool:
+        return True
+
+
+def _concatenate_yaml_lists(sources: List[Path], destination: Path) -> int:
+    """
+    Concatenate files containing YAML lists, loading one file at a time, returning the number of
+    items.
+    """
+    num_items = 0
+
+    with open(destination, "w") as output:
+        for source in sources:
+            if not source.exists():
+                logger.warning(f"Skipping missing dataset file {source}")
+                continue
+
+            with open(source) as input:
+                items = yaml.safe_load(input)
+
+            if items is None:
+                continue
+            elif not isinstance(items, list):
+                raise ValueError(f"The dataset file {source} must contain a YAML list")
+            elif items:
+                yaml.dump(items, output, Dumper=_NoAliasDumper, sort_keys=False)
+                num_items += len(items)
+
+    if num_items == 0:
+        destination.write_text("[]\n")
+
+    return num_items
+
+
+def _merge_metadata(sources: List[Path], destination: Path) -> dict | None:
+    """
+    Merge metadata files into a single file, returning the merged metadata or `None` if no shard
+    has a metadata file.
+    """
+    merged = None
+
+    for source in sources:
+        if not source.exists():
+            continue
+
+        with open(source) as file:
+            metadata = json.load(file) if source.suffix == ".json" else yaml.safe_load(file)
+
+        merged = merge(merged or {}, metadata or {}, strategy=Strategy.ADDITIVE)
+
+    if merged is not None:
+        with open(destination, "w") as file:
+            if destination.suffix == ".json":
+                file.write(json.dumps(merged, indent=2))
+            else:
+                yaml.safe_dump(merged, file, sort_keys=False)
+
+    return merged
+
+
+def _copy_shard_files(
+        shard_path: Path,
+        destination: Path,
+        merged_files: set,
+        copied_files: set,
+    ) -> None:
+    """
+    Copy the files of a shard, other than those already merged, into the destination. Files copied
+    from an earlier shard are skipped, and the files copied are added to `copied_files`.
+    """
+    for source in shard_path.rglob("*"):
+        relative_path = str(source.relative_to(shard_path))
+
+        if source.is_dir() or relative_path in merged_files:
+            continue
+        elif relative_path in copied_files:
+            logger.warning(f"Skipping {source} since an earlier shard contains the same file")
+            continue
+
+        target = destination / relative_path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(source, target)
+        copied_files.add(relative_path)
@@ -0,0 +1,124 @@
+import logging
+from contextlib import nullcontext
+from typing import List, Optional, Tuple, Union
+
+import anyio
+
+from ...core.concurrency_budget import ConcurrencyBudget
+from ...core.context import Context
+from ...core.dataset import Dataset
+from ...core.dataset_item import DatasetItem
+from ...core.pipeline import PipelineAction
+from ...types.dataset_action import DatasetAction
+from ...utils.concurrency.get_first_error import get_first_error
+
+logger = logging.getLogger(__name__)
+
+Branch = Union[PipelineAction, List[PipelineAction]]
+
+def parallel(
+        branches: List[Branch],
+        fork: bool = False,
+        max_concurrency: Optional[int] = None,
+    ) -> DatasetAction:
+    """
+    Creates an action that runs independent branches of dataset actions or pipelines at the same
+    time. Each branch is a single action or pipeline, or a list of them run in order.
+
+    By default, every branch works on the same dataset, so branches shouldn't change the same items.
+    With `fork`, each branch works on its own copy of the dataset, and once every branch has
+    finished their changes are merged back in the order the branches are listed, regardless of the
+    order they finished in:
+
+    - The data pushed onto each existing item is pushed onto the original item, so when branches set
+      the same key, the value from the last branch listed wins.
+    - Items added by each branch are appended to the dataset.
+    - Metadata set by each branch is copied to the dataset.
+    - Items removed by a branch are kept.
+
+    Items are copied shallowly, so branches should push new values onto items rather than modify
+    the existing values in place.
+
+    Item pipelines in different branches share a `ConcurrencyBudget`, created from the
+    `concurrency_budget` parameter, or `max_concurrent_items`, if the context doesn't have one yet,
+    so running branches at once doesn't multiply the number of items processed at once.
+
+    Args:
+        branches (List[Branch]): The branches to run.
+        fork (bool): Whether to run each branch on its own copy of the dataset (default: False).
+        max_concurrency (Optional[int]): The maximum number of branches to run at once (default: no
+            limit).
+
+    Returns:
+        function: A function that takes a Dataset and Context and runs the branches.
+    """
+    branch_steps = [branch if isinstance(branch, list) else [branch] for branch in branches]
+
+    async def parallel_action(dataset: Dataset, context: Context):
+        limiter = anyio.CapacityLimiter(max_concurrency) if max_concurrency else None
+        branch_context = _with_concurrency_budget(context)
+        forks = [_fork_dataset(dataset) for _ in branch_steps] if fork else None
+
+        logger.debug(f"Running {len(branch_steps)} branches in parallel")
+
+        async def run_branch(index: int):
+            branch_dataset = forks[index][0] if forks else dataset
+
+            async with limiter or nullcontext():
+                await context.pipeline._do_steps(
+                    branch_steps[index], branch_dataset, branch_context
+                )
+
+        try:
+            async with anyio.create_task_group() as tg:
+                for index in range(len(branch_steps)):
+                    tg.start_soon(run_branch, index)
+        except ExceptionGroup as group:
+            raise get_first_error(group) from None
+
+        if forks:
+            for branch_dataset, copies in forks:
+                _merge_fork(dataset, branch_dataset, copies)
+
+    return parallel_action
+
+
+def _with_concurrency_budget(context: Context) -> Context:
+    if context.concurrency_budget:
+        return context
+
+    total_tokens = context.params.get("concurrency_budget") or \
+        context.params.get("max_concurrent_items") or 1
+    return context.create_child(concurrency_budget=ConcurrencyBudget(int(total_tokens)))
+
+
+def _fork_dataset(dataset: Dataset) -> Tuple[Dataset, List[Tuple[DatasetItem, DatasetItem]]]:
+    """
+    Copy a dataset, returning the copy along with pairs of each original item and its copy.
+    """
+    copies = [(item, DatasetItem(item.id, dict(item.data))) for item in dataset.items]
+    forked = Dataset([copy for _, copy in copies], dict(dataset.metadata))
+
+    return forked, copies
+
+
+def _merge_fork(
+        dataset: Dataset,
+        forked: Dataset,
+        copies: List[Tuple[DatasetItem, DatasetItem]],
+    ) -> None:
+    copied_items = set()
+
+    for original, copy in copies:
+        copied_items.add(id(copy))
+        for record in copy.data_history:
+            original.push(record["data"], record["step"])
+
+    # Adding through `Dataset.add` would reject the new items, since the ids registered when they
+    # were added to the fork are shared by every dataset
+    dataset.items.extend(item for item in forked.items if id(item) not in copied_items)
+
+    dataset.metadata.update({
+        key: value for key, value in forked.metadata.items()
+        if key not in dataset.metadata or dataset.metadata[key] is not value
+    })
@@ -1,4 +1,3 @@
-import importlib
 from typing import Callable, Optional, Union
 
 from ...core.context import Context
@@ -6,6 +5,7 @@ from ...core.dataset import Dataset
 from ...core.pipeline import Pipeline
 from ...core.key import Key
 from ...types.dataset_action import DatasetAction
+from ...utils.imports.load_pipeline import load_pipeline
 from ...utils.params.resolve_dataset_value import resolve_dataset_value
 
 def run_pipeline(
@@ -22,7 +22,7 @@ def run_pipeline(
         resolved_args = resolve_dataset_value(args, dataset, context)
 
         if isinstance(resolved_pipeline, str):
-            resolved_pipeline = importlib.import_module(resolved_pipeline).pipeline
+            resolved_pipeline = load_pipeline(resolved_pipeline)
 
         if isinstance(resolved_pipeline, Pipeline):
             await resolved_pipeline.run(dataset, context, resolved_args)
@@ -0,0 +1,142 @@
+import hashlib
+import inspect
+import json
+import logging
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Union
+
+import anyio
+
+from ...core.action_cache import ACTION_CACHE_FILENAME, ActionCache, get_action_cache
+from ...core.context import Context
+from ...core.dataset_item import DatasetItem
+from ...core.key import Key
+from ...core.template import Template
+from ...types.item_action import ItemAction
+from ...utils.params.resolve_item_value import resolve_item_value
+
+logger = logging.getLogger(__name__)
+
+def cached(
+        action: Callable[..., ItemAction],
+        *args,
+        fields: Optional[List[str]] = None,
+        key: Optional[Union[Callable,Key,str]] = None,
+        **kwargs,
+    ) -> ItemAction:
+    """
+    Creates an action that caches the data an item action pushes onto items, so running it again on
+    the same inputs, in this run or a later one, replays the data instead of redoing the work.
+
+    Since the inputs must be known before running the action, pass the function that creates the
+    action along with its arguments rather than the action itself. For example,
+    `cached(validate_code_syntax, input=Key("code"))`. The cache key is a hash of the name of the
+    function and its arguments, including defaults, with any `Key` or `Template` arguments resolved
+    against the item, plus the item fields listed in `fields` and the resolved `key`.
+
+    Only use this with deterministic actions whose results depend solely on these inputs. Values
+    the action reads from the item other than through its arguments must be listed in `fields`.
+    Data that can't be pickled isn't cached, and failed actions aren't cached.
+
+    The cache is stored at the `action_cache_file` parameter, or in `ACTION_CACHE_FILENAME` within
+    `log_dir`, and is limited to `action_cache_max_size` bytes, evicting the least recently used
+    results when full. If neither parameter is set, the action runs without caching.
+
+    Args:
+        action (Callable[..., ItemAction]): The function that creates the item action to run.
+        *args: Positional arguments to pass to `action`.
+        fields (Optional[List[str]]): Additional item data fields the action reads.
+        key (Optional[Union[Callable,Key,str]]): An additional value to include in the cache key,
+            such as a version to invalidate previous results.
+        **kwargs: Keyword arguments to pass to `action`.
+
+    Returns:
+        function: A function that takes a DatasetItem and Context and runs the action, or replays
+            its cached results.
+    """
+    item_action = action(*args, **kwargs)
+    signature = inspect.signature(action).bind(*args, **kwargs)
+    signature.apply_defaults()
+    action_name = f"{action.__module__}.{action.__qualname__}"
+
+    async def cached_action(item: DatasetItem, context: Context):
+        cache = _get_cache(context)
+        if not cache:
+            return await item_action(item, context)
+
+        try:
+            cache_key = _hash({
+                "action": action_name,
+                "arguments": {
+                    name: _resolve_argument(value, item, context)
+                    for name, value in signature.arguments.items()
+                },
+                "fields": { field: item.data.get(field) for field in fields or [] },
+                "key": resolve_item_value(key, item, context),
+            })
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Not caching {action_name} for item {item.id}: {e}")
+            return await item_action(item, context)
+
+        pushes = await anyio.to_thread.run_sync(cache.get, cache_key)
+        if pushes is not None:
+            logger.debug(f"Using cached results of {action_name} for item {item.id}")
+            for step_name, data in pushes:
+                item.push(data, step_name)
+            return
+
+        history_length = len(item.data_history)
+        await item_action(item, context)
+
+        pushes = [(push["step"], push["data"]) for push in item.data_history[history_length:]]
+        await anyio.to_thread.run_sync(cache.put, cache_key, pushes)
+
+    cached_action.__name__ = f"cached({getattr(item_action, '__name__', action_name)})"
+
+    return cached_action
+
+
+def _get_cache(context: Context) -> Optional[ActionCache]:
+    path = context.params.get("action_cache_file")
+    log_dir = context.params.get("log_dir")
+
+    if not path and log_dir:
+        path = Path(log_dir) / ACTION_CACHE_FILENAME
+    elif not path:
+        return None
+
+    return get_action_cache(path, context.params.get("action_cache_max_size"))
+
+
+def _resolve_argument(value: Any, item: DatasetItem, context: Context) -> Any:
+    # Only resolve keys and templates, since other callables may be used by the action itself
+    # (e.g. a custom parser) rather than resolved to a value
+    if isinstance(value, (Key, Template)):
+        return resolve_item_value(value, item, context)
+    else:
+        return value
+
+
+def _hash(value: Any) -> str:
+    serialized = json.dumps(value, sort_keys=True, default=_serialize)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+def _serialize(value: Any) -> Any:
+    """
+    Serialize values JSON doesn't support so they can be hashed. Values without a stable
+    representation hash differently each run, which only causes cache misses.
+    """
+    if callable(value):
+        # Lambdas and nested functions share names, so only functions defined at the top level of a
+        # module are identified by name
+        qualname = getattr(value, "__qualname__", "<unknown>")
+        return repr(value) if "<" in qualname else f"{getattr(value, '__module__', '')}.{qualname}"
+    elif isinstance(value, bytes):
+        return hashlib.sha256(value).hexdigest()
+    elif isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    elif isinstance(value, Path):
+        return str(value)
+    else:
+        return repr(value)
@@ -1,4 +1,3 @@
-import importlib
 from typing import Callable, Union
 
 from ...core.context import Context
@@ -6,6 +5,7 @@ from ...core.dataset_item import DatasetItem
 from ...core.item_pipeline import ItemPipeline
 from ...core.key import Key
 from ...types.dataset_action import DatasetAction
+from ...utils.imports.load_pipeline import load_pipeline
 from ...utils.params.resolve_item_value import resolve_item_value
 
 def do_item_steps(
@@ -15,7 +15,7 @@ def do_item_steps(
         resolved_pipeline = resolve_item_value(pipeline, item, context, required_as="pipeline")
 
         if isinstance(resolved_pipeline, str):
-            resolved_pipeline = importlib.import_module(resolved_pipeline).pipeline
+            resolved_pipeline = load_pipeline(resolved_pipeline)
 
         if isinstance(resolved_pipeline, ItemPipeline):
             await resolved_pipeline.process_data_item(item, context.create_child(resolved_pipeline))
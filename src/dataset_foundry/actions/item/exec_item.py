@@ -7,6 +7,7 @@ from pathlib import Path
 from ...core.context import Context
 from ...core.dataset_item import DatasetItem
 from ...core.key import Key
+from ...core.resource_pools import resource_pools
 from ...types.item_action import ItemAction
 from ...utils.params.resolve_item_value import resolve_item_value
 
@@ -17,6 +18,7 @@ def exec_item(
         cwd: Optional[Union[Callable, Key, str]] = Key("context.output_dir"),
         output_key: Union[Callable, Key, str] = "exec_result",
         timeout: Union[Callable,Key,int] = 10,
+        resource: Optional[Union[Callable,Key,str]] = "cpu",
     ) -> ItemAction:
     """
     Runs a shell command in the specified working directory and stores the result in the item.
@@ -25,13 +27,16 @@ def exec_item(
         command: The shell command to run (string or callable/key).
         cwd: The working directory to run the command in (string or callable/key).
         output_key: The key to store the result under in the item (default: 'exec_result').
-        timeout: The timeout for the command in seconds (default: 10).
+        timeout: The timeout for the command in seconds (default: 10). Shortened to fit the time
+            remaining for the item, if it has a deadline.
+        resource: The resource pool to hold while the command runs (default: 'cpu').
     """
     async def exec_item_action(item: DatasetItem, context: Context):
         resolved_command = resolve_item_value(command, item, context, required_as="command")
         resolved_cwd = resolve_item_value(cwd, item, context, required_as="cwd")
         resolved_output_key = resolve_item_value(output_key, item, context)
-        resolved_timeout = resolve_item_value(timeout, item, context)
+        resolved_timeout = context.get_timeout(resolve_item_value(timeout, item, context))
+        resolved_resource = resolve_item_value(resource, item, context)
 
         if isinstance(resolved_cwd, str):
             resolved_cwd = Path(resolved_cwd)
@@ -64,7 +69,8 @@ def exec_item(
                     "stderr": str(e),
                 }
 
-        exec_result = await asyncio.to_thread(run_command)
+        async with resource_pools.acquire(resolved_resource):
+            exec_result = await asyncio.to_thread(run_command)
 
         item.push({ resolved_output_key: exec_result }, exec_item)
 
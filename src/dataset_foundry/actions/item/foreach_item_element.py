@@ -1,5 +1,8 @@
 import logging
-from typing import Callable, Union
+from contextlib import nullcontext
+from typing import Callable, List, Literal, Optional, Tuple, Union
+
+import anyio
 
 from ...core.context import Context
 from ...core.dataset_item import DatasetItem
@@ -9,17 +12,35 @@ from ...utils.params.resolve_item_value import resolve_item_value
 
 logger = logging.getLogger(__name__)
 
+ElementOrder = Literal["input", "completion"]
+
 def foreach_item_element(
         collection: Union[Callable, Key, list, tuple],
         actions: list,
+        max_concurrency: Optional[Union[Callable, Key, int]] = None,
+        output_key: Optional[Union[Callable, Key, str]] = None,
+        order: Union[Callable, Key, ElementOrder] = "input",
     ) -> ItemAction:
     """
     Creates an action that executes a list of actions on each element in a collection belonging to
     the current item.
 
+    By default, elements are processed one at a time and an error in any element stops the loop.
+    When `max_concurrency` is greater than 1, up to that many elements are processed at once, also
+    limited by the concurrency budget shared with the pipeline, if any. As with items in an item
+    pipeline, an error in one element is logged and doesn't stop the other elements.
+
     Args:
         collection (Union[Callable, Key, list, tuple]): The collection to iterate over.
         actions (list): A list of actions to execute for each element in the collection.
+        max_concurrency (Optional[Union[Callable, Key, int]]): The maximum number of elements to
+            process at once (default: 1).
+        output_key (Optional[Union[Callable, Key, str]]): If set, the data of each element that
+            finished successfully, other than its `parent`, is collected into a list and pushed to
+            the current item under this key.
+        order (Union[Callable, Key, ElementOrder]): The order of the collected results, either
+            `input` to keep the order of the elements or `completion` to use the order they
+            finished in (default: "input").
 
     Returns:
         function: A function that takes a DatasetItem and Context and executes the actions
@@ -27,14 +48,20 @@ def foreach_item_element(
     """
     async def foreach_item_element_action(item: DatasetItem, context: Context):
         resolved_collection = resolve_item_value(collection, item, context)
+        resolved_max_concurrency = resolve_item_value(max_concurrency, item, context)
+        resolved_output_key = resolve_item_value(output_key, item, context)
+        resolved_order = resolve_item_value(order, item, context)
 
         if not isinstance(resolved_collection, (list, tuple)):
             raise ValueError("'collection' is not iterable; it must resolve to a list or tuple")
 
+        if resolved_order not in ("input", "completion"):
+            raise ValueError(f"Invalid order for foreach_item_element: {resolved_order}")
+
         logger.debug(f"Executing foreach over {len(resolved_collection)} items")
 
-        for index, element in enumerate(resolved_collection):
-            element_item = DatasetItem(
+        element_items = [
+            DatasetItem(
                 id=f"{item.id}_{index}",
                 data={
                     'parent': item,
@@ -42,11 +69,65 @@ def foreach_item_element(
                     'element': element,
                 }
             )
+            for index, element in enumerate(resolved_collection)
+        ]
+        completed: List[Tuple[int, DatasetItem]] = []
+
+        if resolved_max_concurrency and int(resolved_max_concurrency) > 1:
+            await _process_concurrently(
+                element_items, actions, context, int(resolved_max_concurrency), completed
+            )
+        else:
+            for index, element_item in enumerate(element_items):
+                for action in actions:
+                    await action(element_item, context)
+
+                completed.append((index, element_item))
+
+        if resolved_output_key:
+            if resolved_order == "input":
+                completed.sort(key=lambda entry: entry[0])
+
+            item.push({
+                resolved_output_key: [
+                    { key: value for key, value in element_item.data.items() if key != "parent" }
+                    for _, element_item in completed
+                ],
+            }, foreach_item_element)
+
+    return foreach_item_element_action
+
+
+async def _process_concurrently(
+        element_items: List[DatasetItem],
+        actions: list,
+        context: Context,
+        max_concurrency: int,
+        completed: List[Tuple[int, DatasetItem]],
+    ) -> None:
+    limiter = anyio.CapacityLimiter(max_concurrency)
+    budget = context.concurrency_budget
+    slot = context.concurrency_slot
+
+    async def process_element(index: int, element_item: DatasetItem):
+        async with limiter, (budget.acquire() if budget else nullcontext()) as element_slot:
+            element_context = context.create_child(concurrency_slot=element_slot) \
+                if element_slot else context
 
-            for action in actions:
-                await action(element_item, context)
+            try:
+                for action in actions:
+                    await action(element_item, element_context)
+            except anyio.get_cancelled_exc_class():
+                raise
+            except Exception as e:
+                # Don't re-raise exceptions - allow other elements to continue processing
+                logger.error(f"Error processing element {element_item.id}: {e}", exc_info=True)
+                return
 
-            # TODO: Maybe store the result of any changes to `element` in the item data. If so,
-            #       save a copy of `element` in the `DataItem` above. [fastfedora 14.Jul.25]
+        completed.append((index, element_item))
 
-    return foreach_item_element_action
\ No newline at end of file
+    # The current item waits on its elements, so lend them its slot in the budget
+    async with (slot.released() if slot else nullcontext()):
+        async with anyio.create_task_group() as tg:
+            for index, element_item in enumerate(element_items):
+                tg.start_soon(process_element, index, element_item)
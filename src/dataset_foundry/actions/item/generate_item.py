@@ -1,10 +1,16 @@
-from typing import Callable, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
+import anyio
+from langchain_core.messages import BaseMessage
 from langchain_core.prompts import ChatPromptTemplate
 
+from ...core.batch_model import DEFAULT_POLL_INTERVAL, BatchModel
 from ...core.context import Context
 from ...core.dataset_item import DatasetItem
 from ...core.key import Key
+from ...core.model_registry import get_model
+from ...core.resource_pools import resource_pools
+from ...types.batch_item_action import BatchItemAction
 from ...types.item_action import ItemAction
 from ...utils.params.resolve_item_value import resolve_item_value
 from ...utils.format.preprocess_template import preprocess_template
@@ -18,17 +24,28 @@ def generate_item(
         prompt: Union[Callable,Key,str] = Key("context.prompt"),
         model: Union[Callable,Key,str] = Key("context.model"),
         output_key: Union[Callable,Key,str] = "output",
+        resource: Optional[Union[Callable,Key,str]] = "llm",
+        batch: bool = False,
+        max_batch_size: int = 100,
+        max_wait: float = 5.0,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
     ) -> ItemAction:
-    async def generate_item_action(item: DatasetItem, context: Context):
+    async def format_messages(item: DatasetItem, context: Context):
         resolved_prompt = resolve_item_value(prompt, item, context, required_as="prompt")
-        resolved_model = resolve_item_value(model, item, context, required_as="model")
-        resolved_output_key = resolve_item_value(output_key, item, context)
 
         if (isinstance(resolved_prompt, str)):
             resolved_prompt = build_prompt(resolved_prompt, { "id": item.id, **item.data })
 
-        messages = await resolved_prompt.aformat_messages()
-        response = await resolved_model.ainvoke(messages)
+        return await resolved_prompt.aformat_messages()
+
+    async def generate_item_action(item: DatasetItem, context: Context):
+        resolved_model = get_model(resolve_item_value(model, item, context, required_as="model"))
+        resolved_output_key = resolve_item_value(output_key, item, context)
+        resolved_resource = resolve_item_value(resource, item, context)
+
+        messages = await format_messages(item, context)
+        async with resource_pools.acquire(resolved_resource):
+            response = await resolved_model.ainvoke(messages)
 
         item.push({
                 "messages": messages,
@@ -36,4 +53,63 @@ def generate_item(
                 resolved_output_key: response.content,
         }, generate_item);
 
+    async def generate_items_batch(items: List[DatasetItem], context: Context):
+        errors: Dict[str, Exception] = {}
+
+        # Items can use different models and resources, so send one batch job for each
+        groups: Dict[Tuple[int, Any], List[Tuple[DatasetItem, List[BaseMessage], str]]] = {}
+        models = {}
+        for item in items:
+            try:
+                resolved_model = get_model(
+                    resolve_item_value(model, item, context, required_as="model")
+                )
+                resolved_resource = resolve_item_value(resource, item, context)
+                resolved_output_key = resolve_item_value(output_key, item, context)
+                messages = await format_messages(item, context)
+            except Exception as e:
+                errors[item.id] = e
+                continue
+
+            key = (id(resolved_model), resolved_resource)
+            groups.setdefault(key, []).append((item, messages, resolved_output_key))
+            models[id(resolved_model)] = resolved_model
+
+        async def generate_group(key: Tuple[int, Any]):
+            model_id, resolved_resource = key
+            group = groups[key]
+
+            try:
+                batch_model = BatchModel(models[model_id], poll_interval=poll_interval)
+                async with resource_pools.acquire(resolved_resource):
+                    responses = await batch_model.abatch([messages for _, messages, _ in group])
+            except Exception as e:
+                # Fail only the items in this batch job, not the items sent in other jobs
+                responses = [e] * len(group)
+
+            for (item, messages, resolved_output_key), response in zip(group, responses):
+                if isinstance(response, Exception):
+                    errors[item.id] = response
+                    continue
+
+                item.push({
+                        "messages": messages,
+                        "response": response,
+                        resolved_output_key: response.content,
+                }, generate_item)
+
+        async with anyio.create_task_group() as tg:
+            for key in groups:
+                tg.start_soon(generate_group, key)
+
+        return errors
+
+    if batch:
+        return BatchItemAction(
+            generate_items_batch,
+            max_batch_size=max_batch_size,
+            max_wait=max_wait,
+            name="generate_item",
+        )
+
     return generate_item_action
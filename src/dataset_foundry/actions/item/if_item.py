@@ -2,6 +2,7 @@ import logging
 from ...core.context import Context
 from ...core.dataset_item import DatasetItem
 from ...types.item_action import ItemAction
+from ...utils.eval.compile_expression import compile_expression
 from ...utils.eval.item_eval import item_eval
 
 logger = logging.getLogger(__name__)
@@ -19,8 +20,10 @@ def if_item(condition: str, if_actions: list, else_actions: list = []) -> ItemAc
         function: A function that takes a Dataset and Context and executes the corresponding
             actions based on the evaluated condition.
     """
+    compiled_condition = compile_expression(condition)
+
     async def if_item_action(item: DatasetItem, context: Context):
-        if item_eval(condition, item, context):
+        if item_eval(compiled_condition, item, context):
             logger.debug(f"Condition '{condition}' met. Executing 'if' actions.")
             for action in if_actions:
                 await action(item, context)
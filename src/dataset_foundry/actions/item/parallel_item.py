@@ -0,0 +1,58 @@
+from contextlib import nullcontext
+from typing import List, Optional, Union
+
+import anyio
+
+from ...core.context import Context
+from ...core.dataset_item import DatasetItem
+from ...types.item_action import ItemAction
+from ...utils.concurrency.get_first_error import get_first_error
+
+ItemBranch = Union[ItemAction, List[ItemAction]]
+
+def parallel_item(
+        branches: List[ItemBranch],
+        max_concurrency: Optional[int] = None,
+    ) -> ItemAction:
+    """
+    Creates an action that runs independent branches of item actions on the current item at the
+    same time, such as parsing or saving several outputs of the same generation. Each branch is a
+    single action or a list of actions run in order.
+
+    Each branch runs on its own copy of the item, so branches can't see each other's changes. Once
+    every branch has finished, the data pushed by each branch is pushed onto the item in the order
+    the branches are listed, regardless of the order they finished in, so when branches set the
+    same key, the value from the last branch listed wins. If any branch fails, the other branches
+    are cancelled, no data is pushed and the error is raised.
+
+    Args:
+        branches (List[ItemBranch]): The branches to run.
+        max_concurrency (Optional[int]): The maximum number of branches to run at once (default: no
+            limit).
+
+    Returns:
+        function: A function that takes a DatasetItem and Context and runs the branches.
+    """
+    branch_actions = [branch if isinstance(branch, list) else [branch] for branch in branches]
+
+    async def parallel_item_action(item: DatasetItem, context: Context):
+        limiter = anyio.CapacityLimiter(max_concurrency) if max_concurrency else None
+        copies = [DatasetItem(item.id, dict(item.data)) for _ in branch_actions]
+
+        async def run_branch(index: int):
+            async with limiter or nullcontext():
+                for action in branch_actions[index]:
+                    await action(copies[index], context)
+
+        try:
+            async with anyio.create_task_group() as tg:
+                for index in range(len(branch_actions)):
+                    tg.start_soon(run_branch, index)
+        except ExceptionGroup as group:
+            raise get_first_error(group) from None
+
+        for copy in copies:
+            for record in copy.data_history:
+                item.push(record["data"], record["step"])
+
+    return parallel_item_action
@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import pickle
+from typing import Callable, List, Optional, Tuple, Union
+
+from ...core.context import Context
+from ...core.dataset import Dataset
+from ...core.dataset_item import DatasetItem
+from ...core.dataset_pipeline import DatasetPipeline
+from ...types.item_action import ItemAction
+from ...utils.concurrency.pickle_values import pickle_values
+from ...utils.concurrency.process_pool import get_process_pool
+
+logger = logging.getLogger(__name__)
+
+PushRecord = Tuple[str, dict]
+
+def run_in_process(
+        action: Callable[..., ItemAction],
+        *args,
+        fields: Optional[List[str]] = None,
+        **kwargs,
+    ) -> ItemAction:
+    """
+    Creates an action that runs an item action in the shared process pool instead of on the event
+    loop, so CPU-bound work (parsing, validation, serialization) doesn't stall other items.
+
+    Since the action must be rebuilt in the worker process, pass the function that creates the
+    action along with its arguments rather than the action itself. For example,
+    `run_in_process(validate_code_syntax, input=Key("code"))`. The function and its arguments must
+    be importable and picklable, so lambdas and functions defined in pipeline files can't be used.
+
+    The action runs against a copy of the item's data and a context containing the picklable
+    parameters and config of the current context. Any data the action pushes to the item is sent
+    back and pushed to the original item.
+
+    Args:
+        action (Callable[..., ItemAction]): The function that creates the item action to run.
+        *args: Positional arguments to pass to `action`.
+        fields (Optional[List[str]]): The item data fields to send to the worker process. Defaults
+            to all picklable fields.
+        **kwargs: Keyword arguments to pass to `action`.
+
+    Returns:
+        function: A function that takes a DatasetItem and Context and runs the action in the
+            process pool.
+    """
+    async def run_in_process_action(item: DatasetItem, context: Context):
+        data = item.data if fields is None else { key: item.data[key] for key in fields }
+
+        # Pickle the inputs here so the executor only has to copy bytes to the worker process
+        payload = (
+            pickle_values(data),
+            pickle_values(context.params),
+            pickle_values(dict(context.config)),
+        )
+
+        pool = get_process_pool(context.params.get("max_processes"))
+        loop = asyncio.get_running_loop()
+        pushes = await loop.run_in_executor(
+            pool,
+            _run_action,
+            action,
+            args,
+            kwargs,
+            item.id,
+            payload,
+        )
+
+        for step, pushed_data in pushes:
+            item.push(pushed_data, step)
+
+    run_in_process_action.__name__ = f"run_in_process({getattr(action, '__name__', action)})"
+
+    return run_in_process_action
+
+
+class _RecordingItem(DatasetItem):
+    """
+    A dataset item that records the data pushed to it so it can be replayed on another item.
+    """
+
+    def __init__(self, id: str = None, data: dict = None):
+        super().__init__(id, data)
+        self.pushes: List[PushRecord] = []
+
+    def push(self, data: dict, step: Union[Callable, str]):
+        step_name = step.__name__ if callable(step) else (step or f"{len(self.pushes) + 1}")
+        self.pushes.append((step_name, data))
+        self.data.update(data)
+
+
+def _run_action(
+        action: Callable[..., ItemAction],
+        args: tuple,
+        kwargs: dict,
+        item_id: str,
+        payload: Tuple[bytes, bytes, bytes],
+    ) -> List[PushRecord]:
+    """
+    Build and run an item action within a worker process, returning the data it pushed.
+    """
+    data, params, config = (pickle.loads(values) for values in payload)
+    item = _RecordingItem(item_id, data)
+    context = Context(DatasetPipeline([], config=config), Dataset(), params)
+
+    asyncio.run(action(*args, **kwargs)(item, context))
+
+    return item.pushes
+
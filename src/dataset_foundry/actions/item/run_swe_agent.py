@@ -1,12 +1,14 @@
 from typing import Callable, Union, Optional
 from pathlib import Path
 import asyncio
+import math
 import shutil
 import yaml
 
 from ...core.context import Context
 from ...core.dataset_item import DatasetItem
 from ...core.key import Key
+from ...core.resource_pools import resource_pools
 from ...types.item_action import ItemAction
 from ...utils.params.resolve_item_value import resolve_item_value
 from ...utils.format.format_template import format_template
@@ -24,6 +26,7 @@ def run_swe_agent(
         max_retries: Union[Callable, Key, int] = 3,
         output_key: Union[Callable, Key, str] = "agent_result",
         stream_logs: Union[Callable, Key, bool] = False,
+        resource: Optional[Union[Callable, Key, str]] = "agent",
     ) -> ItemAction:
     """
     Run a software engineering agent in a Docker container.
@@ -35,10 +38,12 @@ def run_swe_agent(
         output_dir: Directory where agent output should be saved
         agent: Name of the agent to run (e.g., "codex", "claude-code")
         repo_path: Optional path to pre-existing repository
-        timeout: Maximum execution time in seconds
+        timeout: Maximum execution time in seconds for each attempt, shortened to fit the time
+            remaining for the item if it has a deadline
         max_retries: Maximum number of retry attempts
         output_key: Key to store the agent result in item data
         stream_logs: Whether to stream container logs to logger.info (default: False)
+        resource: The resource pool to hold while the agent container runs (default: "agent")
     """
 
     async def run_swe_agent_action(item: DatasetItem, context: Context):
@@ -52,6 +57,7 @@ def run_swe_agent(
         resolved_max_retries = resolve_item_value(max_retries, item, context)
         resolved_output_key = resolve_item_value(output_key, item, context)
         resolved_stream_logs = resolve_item_value(stream_logs, item, context)
+        resolved_resource = resolve_item_value(resource, item, context)
 
         if isinstance(resolved_output_dir, str):
             resolved_output_dir = format_template(resolved_output_dir, {
@@ -85,13 +91,17 @@ def run_swe_agent(
             try:
                 agent_inputs.context_data["attempt"] = attempt + 1
 
-                result = await agent_runner.run(
-                    inputs=agent_inputs,
-                    output_dir=output_path,
-                    timeout=resolved_timeout,
-                    attempt=attempt + 1,
-                    stream_logs=resolved_stream_logs
-                )
+                # Recalculate for each attempt, since earlier attempts use up the item's budget
+                attempt_timeout = context.get_timeout(resolved_timeout)
+
+                async with resource_pools.acquire(resolved_resource):
+                    result = await agent_runner.run(
+                        inputs=agent_inputs,
+                        output_dir=output_path,
+                        timeout=math.ceil(attempt_timeout) if attempt_timeout else attempt_timeout,
+                        attempt=attempt + 1,
+                        stream_logs=resolved_stream_logs
+                    )
                 break
             except Exception as e:
                 last_error = e
@@ -1,10 +1,12 @@
 import logging
+import math
 from typing import Callable, Union, Optional, List
 from pathlib import Path
 
 from ...core.context import Context
 from ...core.dataset_item import DatasetItem
 from ...core.key import Key
+from ...core.resource_pools import resource_pools
 from ...types.item_action import ItemAction
 from ...utils.params.resolve_item_value import resolve_item_value
 from ...utils.unit_tests.run_python_unit_tests import run_python_unit_tests
@@ -13,6 +15,9 @@ from ...utils.docker.sandbox_runner import SandboxRunner
 
 logger = logging.getLogger(__name__)
 
+# Marks an omitted `resource`, since `None` means not to use a resource pool
+_DEFAULT_RESOURCE = object()
+
 def run_unit_tests(
         filename: Union[Callable,Key,str],
         dir: Union[Callable,Key,str] = Key("context.input_dir"),
@@ -21,6 +26,7 @@ def run_unit_tests(
         stream_logs: Union[Callable,Key,bool] = False,
         timeout: Union[Callable,Key,int] = 300,
         setup_repo: Optional[Union[Callable,Key,bool]] = False,
+        resource: Optional[Union[Callable,Key,str]] = _DEFAULT_RESOURCE,
     ) -> ItemAction:
     async def run_unit_tests_action(item: DatasetItem, context: Context):
         resolved_filename = resolve_item_value(filename, item, context, required_as="filename")
@@ -28,8 +34,12 @@ def run_unit_tests(
         resolved_property = resolve_item_value(property, item, context, required_as="property")
         resolved_sandbox = resolve_item_value(sandbox, item, context)
         resolved_stream_logs = resolve_item_value(stream_logs, item, context)
-        resolved_timeout = resolve_item_value(timeout, item, context)
+        resolved_timeout = context.get_timeout(resolve_item_value(timeout, item, context))
         resolved_setup_repo = resolve_item_value(setup_repo, item, context)
+        if resource is _DEFAULT_RESOURCE:
+            resolved_resource = "container" if resolved_sandbox else "cpu"
+        else:
+            resolved_resource = resolve_item_value(resource, item, context)
 
         if resolved_sandbox:
             if isinstance(resolved_sandbox, str):
@@ -45,19 +55,24 @@ def run_unit_tests(
                     command.insert(0, setup_command)
 
             logger.info(f"Running tests in sandbox with command: {' '.join(command)}")
-            sandbox_result = await sandbox_manager.run(
-                target_file=resolved_filename,
-                workspace_dir=resolved_dir,
-                command=command,
-                timeout=resolved_timeout,
-                stream_logs=resolved_stream_logs
-            )
+            async with resource_pools.acquire(resolved_resource):
+                sandbox_result = await sandbox_manager.run(
+                    target_file=resolved_filename,
+                    workspace_dir=resolved_dir,
+                    command=command,
+                    timeout=math.ceil(resolved_timeout) if resolved_timeout else resolved_timeout,
+                    stream_logs=resolved_stream_logs
+                )
 
             result = parse_python_unit_test_results(sandbox_result)
             result.command = command
         else:
             # Run tests locally
-            result = run_python_unit_tests(Path(resolved_dir) / resolved_filename)
+            async with resource_pools.acquire(resolved_resource):
+                result = run_python_unit_tests(
+                    Path(resolved_dir) / resolved_filename,
+                    timeout=resolved_timeout,
+                )
 
         item.push({ resolved_property: result }, run_unit_tests)
 
@@ -3,6 +3,7 @@ import logging
 from ...core.context import Context
 from ...core.dataset_item import DatasetItem
 from ...types.item_action import ItemAction
+from ...utils.eval.compile_expression import compile_expression
 from ...utils.eval.item_eval import item_eval
 
 logger = logging.getLogger(__name__)
@@ -20,12 +21,14 @@ def while_item(condition: str, actions: list, max_iterations: int = 10) -> ItemA
         function: A function that takes a Dataset and Context and executes the actions while the
             condition is true.
     """
+    compiled_condition = compile_expression(condition)
+
     async def while_item_action(item: DatasetItem, context: Context):
         iterations = 0
 
         # TODO: Think about whether we want to bind `**item.data` here to make things simpler. I
         #       think other item actions are doing this [fastfedora 3.Mar.2025]
-        while item_eval(condition, item, context, { 'iteration': iterations }):
+        while item_eval(compiled_condition, item, context, { 'iteration': iterations }):
             logger.debug(f"Condition '{condition}' met. Executing loop {iterations + 1}.")
             for action in actions:
                 await action(item, context)
@@ -16,3 +16,4 @@ DEFAULT_NUM_SAMPLES = 10
 
 # Pipeline configuration
 DEFAULT_MAX_CONCURRENT_ITEMS = 10
+DEFAULT_EXECUTION_MODE = "auto"
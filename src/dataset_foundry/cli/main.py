@@ -1,22 +1,30 @@
 import asyncio
 import logging
 import signal
+import sys
 from datetime import datetime
 from pathlib import Path
+from typing import List, Optional, Tuple
 
-from ..core.model import Model
+from ..core.model_cache import MODEL_CACHE_FILENAME, ModelCache
+from ..core.model_registry import get_model, model_registry
+from ..core.retry_policy import RetryPolicy
+from ..core.sharding import parse_shard
+from ..core.work_queue import WORK_QUEUE_FILENAME, WorkQueue
+from ..core.work_queue_worker import WorkQueueWorker
+from ..displays.core.display import Display
 from ..displays.get_display import get_display
 from ..utils.imports.import_module import import_module
 from ..utils.params.parse_dir_arg import parse_dir_arg
 from .advanced_argparse import AdvancedArgumentParser
 from .config import DATASET_DIR, LOG_DIR
 from .config import DEFAULT_MODEL, DEFAULT_MODEL_TEMPERATURE, DEFAULT_NUM_SAMPLES
-from .config import DEFAULT_MAX_CONCURRENT_ITEMS
+from .config import DEFAULT_MAX_CONCURRENT_ITEMS, DEFAULT_EXECUTION_MODE
 
 logger = logging.getLogger(__name__)
 
-async def main_cli():
-    parser = AdvancedArgumentParser(description="Build and refine datasets using data pipelines")
+def create_parser(description: str) -> AdvancedArgumentParser:
+    parser = AdvancedArgumentParser(description=description)
     parser.add_argument(
         "pipeline",
         env="DF_PIPELINE",
@@ -91,6 +99,80 @@ async def main_cli():
         default=DEFAULT_MODEL_TEMPERATURE,
         help=f"Temperature for generation (default: {DEFAULT_MODEL_TEMPERATURE})"
     )
+    parser.add_argument(
+        "--hedge-percentile",
+        type=float,
+        env="DF_HEDGE_PERCENTILE",
+        default=None,
+        help="Send a duplicate model request when a call takes longer than this percentile of "
+            "recent latencies (e.g. 0.95), using the first response (default: no hedging)"
+    )
+    parser.add_argument(
+        "--hedge-model",
+        type=str,
+        env="DF_HEDGE_MODEL",
+        default=None,
+        help="Model to send duplicate requests for --model to, in format 'provider/model_name' "
+            "(default: the model being hedged)"
+    )
+    parser.add_argument(
+        "--hedge-max-extra",
+        type=float,
+        env="DF_HEDGE_MAX_EXTRA",
+        default=0.1,
+        help="Maximum number of duplicate requests to send as a fraction of model calls "
+            "(default: 0.1)"
+    )
+    parser.add_argument(
+        "--model-retries",
+        type=int,
+        env="DF_MODEL_RETRIES",
+        default=None,
+        help="Maximum number of times to retry a model call that fails with a rate limit, server "
+            "or connection error, using exponential backoff with jitter and honouring "
+            "Retry-After (default: no retries beyond those of the provider client)"
+    )
+    parser.add_argument(
+        "--model-retry-budget",
+        type=float,
+        env="DF_MODEL_RETRY_BUDGET",
+        default=0.2,
+        help="Maximum number of model retries as a fraction of model calls, so retries can't "
+            "overload a failing provider (default: 0.2)"
+    )
+    parser.add_argument(
+        "--model-cache-dir",
+        type=str,
+        env="DF_MODEL_CACHE_DIR",
+        default=None,
+        help="Directory to cache model responses in, so identical requests aren't sent again "
+            "(default: no cache)"
+    )
+    parser.add_argument(
+        "--model-cache-mode",
+        type=str,
+        env="DF_MODEL_CACHE_MODE",
+        default="use",
+        choices=["use", "replay", "refresh"],
+        help="How to use the model cache: `use` cached responses and cache new ones, only "
+            "`replay` cached responses and fail on others, or `refresh` every response "
+            "(default: use)"
+    )
+    parser.add_argument(
+        "--model-cache-max-size",
+        type=float,
+        env="DF_MODEL_CACHE_MAX_SIZE",
+        default=1024,
+        help="Maximum size of the model cache in MB before the least recently used responses "
+            "are evicted (default: 1024)"
+    )
+    parser.add_argument(
+        "--model-cache-max-age",
+        type=float,
+        env="DF_MODEL_CACHE_MAX_AGE",
+        default=None,
+        help="Number of hours a cached model response stays valid (default: no limit)"
+    )
     parser.add_argument(
         "--display",
         type=str,
@@ -113,6 +195,100 @@ async def main_cli():
         default=DEFAULT_MAX_CONCURRENT_ITEMS,
         help=f"Maximum number of items to process concurrently"
     )
+    parser.add_argument(
+        "--min-items",
+        type=int,
+        env="DF_MIN_ITEMS",
+        default=1,
+        help="Minimum number of items to process concurrently when using adaptive concurrency"
+    )
+    parser.add_argument(
+        "--adaptive-concurrency",
+        action="store_true",
+        env="DF_ADAPTIVE_CONCURRENCY",
+        default=False,
+        help="Adjust the number of items processed concurrently between --min-items and "
+            "--max-items based on model latency, rate limits and failures (default: False)"
+    )
+    parser.add_argument(
+        "--execution-mode",
+        type=str,
+        env="DF_EXECUTION_MODE",
+        default=DEFAULT_EXECUTION_MODE,
+        choices=["auto", "tasks", "workers", "staged", "queue"],
+        help=f"How item pipelines schedule items (default: {DEFAULT_EXECUTION_MODE})"
+    )
+    parser.add_argument(
+        "--item-order",
+        type=str,
+        env="DF_ITEM_ORDER",
+        default="input",
+        choices=["input", "longest_first"],
+        help="Order in which item pipelines start items; `longest_first` uses durations from "
+            "previous runs (default: input)"
+    )
+    parser.add_argument(
+        "--item-timeout",
+        type=float,
+        env="DF_ITEM_TIMEOUT",
+        default=None,
+        help="Maximum number of seconds to spend processing each item (default: no limit)"
+    )
+    parser.add_argument(
+        "--step-timeout",
+        type=float,
+        env="DF_STEP_TIMEOUT",
+        default=None,
+        help="Maximum number of seconds to spend on each step of an item (default: no limit)"
+    )
+    parser.add_argument(
+        "--resource-limit",
+        action="append",
+        type=lambda x: dict(item.split("=") for item in x.split(",") if "=" in item),
+        dest="resource_limits",
+        help="Limit for a named resource pool (e.g. 'llm=20,container=4'). Can be specified "
+            "multiple times."
+    )
+    parser.add_argument(
+        "--rate-limit",
+        action="append",
+        type=lambda x: dict(item.split("=") for item in x.split(",") if "=" in item),
+        dest="rate_limits",
+        help="Requests and estimated tokens per minute to send to a model, given as "
+            "MODEL=RPM[:TPM] (e.g. 'openai/gpt-4o-mini=500:200000'). Can be specified multiple "
+            "times."
+    )
+    parser.add_argument(
+        "--shard",
+        type=parse_shard,
+        env="DF_SHARD",
+        default=None,
+        help="Only process the items in shard INDEX of COUNT shards, given as INDEX/COUNT "
+            "(e.g. 0/4). Items are assigned to shards using a hash of their id."
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        env="DF_RESUME",
+        default=False,
+        help="Resume an interrupted run using the checkpoints in the log directory, skipping "
+            "the items and steps that already completed (default: False)"
+    )
+    parser.add_argument(
+        "--work-queue",
+        type=str,
+        env="DF_WORK_QUEUE",
+        help="Path of the work queue shared with workers in the `queue` execution mode "
+            f"(defaults to <log-dir>/{WORK_QUEUE_FILENAME})"
+    )
+    parser.add_argument(
+        "--lease-duration",
+        type=float,
+        env="DF_LEASE_DURATION",
+        default=None,
+        help="Seconds a worker can hold an item without renewing its lease before the item is "
+            "given to another worker (default: 60)"
+    )
     parser.add_argument(
         "-P",
         action="append",
@@ -121,7 +297,17 @@ async def main_cli():
         help="Pipeline parameters in the format 'key=value'. Can be specified multiple times."
     )
 
-    args = vars(parser.parse_args())
+    return parser
+
+def parse_args(
+        parser: AdvancedArgumentParser,
+        argv: Optional[List[str]] = None,
+    ) -> Tuple[Display, dict]:
+    """
+    Parse the command line arguments, set up logging and return the display to use along with the
+    parameters to run the pipeline with.
+    """
+    args = vars(parser.parse_args(argv))
     log_level = getattr(logging, args["log_level"].upper())
 
     display = get_display(args["display"])
@@ -131,22 +317,136 @@ async def main_cli():
     args["output_dir"] = parse_dir_arg(args["output_dir"], DATASET_DIR / args["dataset"], True)
     args["config_dir"] = parse_dir_arg(args["config_dir"], Path(args["pipeline"]).parent, False)
     args["log_dir"] = parse_dir_arg(args["log_dir"], LOG_DIR / args["dataset"], True)
-    args["model"] = Model(
-        model=args["model"],
-        temperature=args["temperature"]
+
+    # Apply the model options to models that actions resolve from strings as well
+    model_registry.set_defaults(
+        temperature=args["temperature"],
+        hedging=get_hedging_args(args),
+        cache=create_model_cache(args),
+        retry=create_retry_policy(args),
     )
+    if args["hedge_model"]:
+        # Only the main model hedges to `--hedge-model`; other models hedge to themselves
+        model_registry.get_hedging_policy(
+            args["model"],
+            hedge_model=model_registry.get(args["hedge_model"], temperature=args["temperature"]),
+        )
+    args["model"] = get_model(args["model"])
+
+    resource_limits = {}
+    resource_limit_list = args.pop("resource_limits", []) or []
+    for limit_dict in resource_limit_list:
+        resource_limits.update(limit_dict)
+
+    rate_limits = {}
+    rate_limit_list = args.pop("rate_limits", []) or []
+    for limit_dict in rate_limit_list:
+        rate_limits.update(limit_dict)
 
     pipeline_parameters = {
         "max_concurrent_items": args["max_items"],
+        "min_concurrent_items": args["min_items"],
+        "adaptive_concurrency": args["adaptive_concurrency"],
+        "execution_mode": args["execution_mode"],
+        "item_order": args["item_order"],
+        "item_timeout": args["item_timeout"],
+        "step_timeout": args["step_timeout"],
+        "work_queue": args["work_queue"] or args["log_dir"] / WORK_QUEUE_FILENAME,
+        "lease_duration": args["lease_duration"],
+        "shard": args["shard"],
+        "resume": args["resume"],
+        **({ "resource_limits": resource_limits } if resource_limits else {}),
+        **({ "rate_limits": rate_limits } if rate_limits else {}),
     }
     parameter_list = args.pop("pipeline_parameters", []) or []
     for param_dict in parameter_list:
         pipeline_parameters.update(param_dict)
 
-    module = import_module(args["pipeline"])
-    logger.info(f"Loaded pipeline: {args['pipeline']}")
+    return display, { **args, **pipeline_parameters }
+
+def get_hedging_args(args: dict) -> Optional[dict]:
+    """
+    Get the arguments of the hedging policy created for each model from the command line
+    arguments, if enabled.
+    """
+    if not args["hedge_percentile"]:
+        return None
+
+    return {
+        "percentile": args["hedge_percentile"],
+        "max_extra_ratio": args["hedge_max_extra"],
+    }
+
+def create_retry_policy(args: dict) -> Optional[RetryPolicy]:
+    """
+    Create the retry policy for the model from the command line arguments, if enabled.
+    """
+    if args["model_retries"] is None:
+        return None
+
+    return RetryPolicy(
+        budgets={
+            "rate_limit": args["model_retries"],
+            "server": args["model_retries"],
+            "connection": args["model_retries"],
+        },
+        max_retry_ratio=args["model_retry_budget"],
+    )
+
+def create_model_cache(args: dict) -> Optional[ModelCache]:
+    """
+    Create the cache of model responses from the command line arguments, if enabled.
+    """
+    if not args["model_cache_dir"]:
+        return None
+
+    max_age = args["model_cache_max_age"]
+
+    return ModelCache(
+        Path(args["model_cache_dir"]) / MODEL_CACHE_FILENAME,
+        mode=args["model_cache_mode"],
+        max_size=int(args["model_cache_max_size"] * 1024 * 1024),
+        max_age=max_age * 60 * 60 if max_age else None,
+    )
+
+async def main_cli(argv: Optional[List[str]] = None):
+    parser = create_parser(description="Build and refine datasets using data pipelines")
+    display, params = parse_args(parser, argv)
+
+    module = import_module(params["pipeline"])
+    logger.info(f"Loaded pipeline: {params['pipeline']}")
+
+    try:
+        await display.run_pipeline(module.pipeline, params=params)
+    finally:
+        await model_registry.aclose()
+
+async def worker_cli(argv: Optional[List[str]] = None):
+    parser = create_parser(
+        description="Process items published to a work queue by a pipeline run using "
+            "`--execution-mode queue`"
+    )
+    parser.add_argument(
+        "--worker-id",
+        type=str,
+        env="DF_WORKER_ID",
+        help="Id of this worker (defaults to a unique id based on the host and process)"
+    )
+    display, params = parse_args(parser, argv)
+
+    module = import_module(params["pipeline"])
+    logger.info(f"Loaded pipeline: {params['pipeline']}")
+
+    worker = WorkQueueWorker(
+        module.pipeline,
+        WorkQueue(params["work_queue"]),
+        worker_id=params["worker_id"],
+    )
 
-    await display.run_pipeline(module.pipeline, params={ **args, **pipeline_parameters })
+    try:
+        await display.run_pipeline(worker, params=params)
+    finally:
+        await model_registry.aclose()
 
 # Set up signal handler for graceful interruption
 def signal_handler(_signum, _frame):
@@ -158,7 +458,10 @@ signal.signal(signal.SIGINT, signal_handler)
 signal.signal(signal.SIGTERM, signal_handler)
 
 def main():
-    asyncio.run(main_cli())
+    if len(sys.argv) > 1 and sys.argv[1] == "worker":
+        asyncio.run(worker_cli(sys.argv[2:]))
+    else:
+        asyncio.run(main_cli())
 
 if __name__ == "__main__":
-    asyncio.run(main_cli())
+    main()
@@ -0,0 +1,112 @@
+import logging
+import pickle
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..utils.concurrency.pickle_values import pickle_values
+from .sqlite_lru_cache import DEFAULT_MAX_SIZE, SqliteLruCache
+
+logger = logging.getLogger(__name__)
+
+ACTION_CACHE_FILENAME = "action_cache.sqlite"
+"""
+The name of the file in the log directory used for the action cache when no path is given.
+"""
+
+PushRecord = Tuple[str, Dict[str, Any]]
+
+_caches: Dict[Path, "ActionCache"] = {}
+_caches_lock = threading.Lock()
+
+
+class ActionCache(SqliteLruCache):
+    """
+    An on-disk cache of the data item actions pushed onto items, keyed by a hash of the inputs to
+    the action, stored in a SQLite database.
+
+    When the results stored exceed `max_size` bytes, the least recently used entries are evicted.
+    The number of hits, misses and evictions since the cache was opened are kept as counters.
+
+    Each call opens its own connection, so a cache can be shared between threads and processes.
+    """
+
+    def __init__(
+            self,
+            path: Path | str,
+            max_size: int = DEFAULT_MAX_SIZE,
+            busy_timeout: float = 30.0,
+        ):
+        """
+        Initialize the cache, creating the database if it doesn't exist.
+
+        Args:
+            path: The path of the SQLite database.
+            max_size: The maximum number of bytes of results to store.
+            busy_timeout: The number of seconds to wait for other processes to release a lock.
+        """
+        super().__init__(path, max_size=max_size, busy_timeout=busy_timeout)
+
+    def get(self, key: str) -> Optional[List[PushRecord]]:
+        """
+        Get the data stored for a key, marking it as recently used.
+
+        Args:
+            key: The key of the entry.
+
+        Returns:
+            Optional[List[PushRecord]]: The data pushed by the action, as (step name, data) pairs,
+                or `None` if the key isn't in the cache.
+        """
+        value = self._get_value(key)
+
+        pushes = None
+        if value is not None:
+            try:
+                pushes = [
+                    (step_name, pickle.loads(data)) for step_name, data in pickle.loads(value)
+                ]
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable action cache entry {key}: {e}")
+
+        self._record_lookup(pushes is not None)
+
+        return pushes
+
+    def put(self, key: str, pushes: List[PushRecord]) -> None:
+        """
+        Store the data pushed by an action, evicting the least recently used entries if the cache
+        grows past its maximum size.
+
+        Args:
+            key: The key of the entry.
+            pushes: The data pushed by the action, as (step name, data) pairs. Values that can't be
+                pickled are dropped.
+        """
+        self._put_value(key, pickle.dumps(
+            [(step_name, pickle_values(data)) for step_name, data in pushes],
+            protocol=pickle.HIGHEST_PROTOCOL,
+        ))
+
+
+def get_action_cache(path: Path | str, max_size: Optional[int] = None) -> ActionCache:
+    """
+    Get the action cache stored at a path, opening it on first use, so every action using the same
+    file shares its counters.
+
+    Args:
+        path: The path of the SQLite database.
+        max_size: The maximum number of bytes of results to store. Ignored if the cache is already
+            open. Defaults to `DEFAULT_MAX_SIZE`.
+
+    Returns:
+        ActionCache: The cache stored at `path`.
+    """
+    path = Path(path).resolve()
+
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = ActionCache(path, max_size=int(max_size or DEFAULT_MAX_SIZE))
+            logger.debug(f"Opened action cache {path}")
+
+        return _caches[path]
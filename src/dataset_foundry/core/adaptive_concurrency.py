@@ -0,0 +1,178 @@
+import logging
+import math
+import statistics
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+import anyio
+
+from .model import ModelEventType, model_events
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveConcurrencyController:
+    """
+    Adjusts the capacity of a limiter at runtime using additive-increase/multiplicative-decrease
+    (AIMD).
+
+    The capacity is increased by `increase_step` after every `window_size` healthy observations
+    (successful model calls or items). It is multiplied by `decrease_factor` when a model call is
+    rate limited, when the average latency of recent model calls rises above `latency_tolerance`
+    times the best average seen so far, or when more than `max_failure_rate` of recent items fail.
+    Decreases are spaced at least `cooldown` seconds apart so a single burst of errors is only
+    counted once. The capacity always stays between `min_concurrency` and `max_concurrency`.
+
+    Model calls are observed through `model_events`, so calls from any model in the process are
+    taken into account.
+    """
+
+    def __init__(
+            self,
+            limiter: anyio.CapacityLimiter,
+            min_concurrency: int = 1,
+            max_concurrency: Optional[int] = None,
+            initial_concurrency: Optional[int] = None,
+            increase_step: int = 1,
+            decrease_factor: float = 0.5,
+            window_size: int = 10,
+            latency_tolerance: float = 2.0,
+            max_failure_rate: float = 0.25,
+            cooldown: float = 5.0,
+            on_change: Optional[Callable[[int], None]] = None,
+        ):
+        """
+        Initialize the controller.
+
+        Args:
+            limiter: The limiter whose capacity should be adjusted.
+            min_concurrency: The lowest capacity to allow.
+            max_concurrency: The highest capacity to allow. Defaults to the limiter's capacity.
+            initial_concurrency: The capacity to start with. Defaults to half of `max_concurrency`.
+            increase_step: The amount to add to the capacity after each healthy window.
+            decrease_factor: The factor to multiply the capacity by when backing off.
+            window_size: The number of observations used to judge latency, failure rates and
+                whether to increase the capacity.
+            latency_tolerance: How many times slower than the best average latency recent calls
+                can be before backing off.
+            max_failure_rate: The fraction of recent items that can fail before backing off.
+            cooldown: The minimum number of seconds between decreases.
+            on_change: A callback invoked with the new capacity whenever it changes.
+        """
+        max_concurrency = int(max_concurrency or limiter.total_tokens)
+        min_concurrency = max(1, min(int(min_concurrency), max_concurrency))
+
+        self._limiter = limiter
+        self._min_concurrency = min_concurrency
+        self._max_concurrency = max_concurrency
+        self._initial_concurrency = int(initial_concurrency or max(1, max_concurrency // 2))
+        self._increase_step = int(increase_step)
+        self._decrease_factor = float(decrease_factor)
+        self._window_size = int(window_size)
+        self._latency_tolerance = float(latency_tolerance)
+        self._max_failure_rate = float(max_failure_rate)
+        self._cooldown = float(cooldown)
+        self._on_change = on_change
+
+        self._latencies: Deque[float] = deque(maxlen=self._window_size)
+        self._item_results: Deque[bool] = deque(maxlen=self._window_size)
+        self._baseline_latency: Optional[float] = None
+        self._healthy_observations = 0
+        self._last_decrease_time = -math.inf
+
+        # Keep a single bound method so the same callback can be removed from `model_events`
+        self._model_event_callback = self._on_model_event
+
+    @property
+    def concurrency(self) -> int:
+        """The current capacity of the limiter."""
+        return int(self._limiter.total_tokens)
+
+    def start(self) -> None:
+        """
+        Set the initial capacity and start observing model calls.
+        """
+        self._set_concurrency(self._initial_concurrency, "initial")
+        model_events.on("invoke_succeeded", self._model_event_callback)
+        model_events.on("invoke_failed", self._model_event_callback)
+
+    def stop(self) -> None:
+        """
+        Stop observing model calls.
+        """
+        model_events.off("invoke_succeeded", self._model_event_callback)
+        model_events.off("invoke_failed", self._model_event_callback)
+
+    def record_item(self, succeeded: bool) -> None:
+        """
+        Record the outcome of processing an item.
+
+        Args:
+            succeeded: Whether the item was processed successfully.
+        """
+        self._item_results.append(succeeded)
+
+        if len(self._item_results) == self._window_size:
+            failure_rate = self._item_results.count(False) / self._window_size
+            if failure_rate > self._max_failure_rate:
+                self._decrease(f"item failure rate {failure_rate:.0%}")
+                return
+
+        if succeeded:
+            self._record_healthy_observation()
+
+    def _on_model_event(self, event_type: ModelEventType, payload: Dict[str, Any]) -> None:
+        if event_type == "invoke_failed":
+            if payload.get("rate_limited"):
+                self._decrease("rate limited")
+            return
+
+        self._latencies.append(payload["latency"])
+
+        if len(self._latencies) == self._window_size:
+            average_latency = statistics.fmean(self._latencies)
+
+            if self._baseline_latency is None or average_latency < self._baseline_latency:
+                self._baseline_latency = average_latency
+            elif average_latency > self._baseline_latency * self._latency_tolerance:
+                self._decrease(
+                    f"latency {average_latency:.1f}s vs baseline {self._baseline_latency:.1f}s"
+                )
+                return
+
+        self._record_healthy_observation()
+
+    def _record_healthy_observation(self) -> None:
+        self._healthy_observations += 1
+
+        if self._healthy_observations >= self._window_size:
+            self._healthy_observations = 0
+            self._set_concurrency(self.concurrency + self._increase_step, "healthy")
+
+    def _decrease(self, reason: str) -> None:
+        self._healthy_observations = 0
+
+        now = time.monotonic()
+        if now - self._last_decrease_time < self._cooldown:
+            return
+
+        self._last_decrease_time = now
+        self._latencies.clear()
+        self._item_results.clear()
+        self._set_concurrency(math.floor(self.concurrency * self._decrease_factor), reason)
+
+    def _set_concurrency(self, concurrency: int, reason: str) -> None:
+        concurrency = max(self._min_concurrency, min(self._max_concurrency, concurrency))
+        previous_concurrency = self.concurrency
+
+        if concurrency == previous_concurrency:
+            return
+
+        # Lowering the capacity doesn't revoke tokens already borrowed, so items in progress finish
+        # while new items wait until the number in progress drops below the new capacity
+        self._limiter.total_tokens = concurrency
+        logger.info(f"Adjusted concurrency from {previous_concurrency} to {concurrency} ({reason})")
+
+        if self._on_change:
+            self._on_change(concurrency)
@@ -0,0 +1,252 @@
+import json
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+import anyio
+from langchain_core.messages import BaseMessage
+
+from .model import Model
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL = 30.0
+"""
+The default number of seconds to wait between checks of whether a batch job has finished.
+"""
+
+
+class BatchRequestError(Exception):
+    """
+    Raised for a request in a batch job that the provider failed to process.
+    """
+
+
+class BatchModel:
+    """
+    Sends requests to a model through its provider's batch API, which has higher throughput limits
+    and a lower cost than sending each request on its own, but can take much longer to respond.
+
+    The requests are submitted as one batch job, which is polled every `poll_interval` seconds until
+    it finishes, after which the response to each request is returned in the order the requests
+    were given. Requests the provider fails to process are returned as `BatchRequestError`s, so one
+    bad request doesn't fail the others.
+
+    The batch job is sent using the client of the model, so the same API key and base URL are used
+    (e.g. `OPENAI_BASE_URL` or `ANTHROPIC_BASE_URL` to send batches to a local server).
+    """
+
+    def __init__(
+            self,
+            model: Model,
+            poll_interval: float = DEFAULT_POLL_INTERVAL,
+            timeout: Optional[float] = None,
+        ):
+        """
+        Initialize the batch model.
+
+        Args:
+            model: The model to send the requests to.
+            poll_interval: The number of seconds to wait between checks of the batch job.
+            timeout: The number of seconds to wait for the batch job to finish before cancelling it,
+                or `None` to wait until the provider ends it.
+        """
+        self._model = model
+        self._poll_interval = poll_interval
+        self._timeout = timeout
+        self._client = _create_batch_client(model)
+
+    @property
+    def model(self) -> Model:
+        """The model the requests are sent to."""
+        return self._model
+
+    async def abatch(
+            self,
+            requests: List[List[BaseMessage]],
+            **kwargs,
+        ) -> List[BaseMessage | BatchRequestError]:
+        """
+        Send a list of requests as one batch job and wait for the responses.
+
+        Args:
+            requests: The messages of each request.
+            **kwargs: Arguments passed with every request.
+
+        Returns:
+            List[BaseMessage | BatchRequestError]: The response or error for each request, in the
+                order of `requests`.
+        """
+        if not requests:
+            return []
+
+        custom_ids = [f"request-{index}" for index in range(len(requests))]
+        batch_id = await self._client.submit({
+            custom_id: self._client.get_payload(messages, **kwargs)
+            for custom_id, messages in zip(custom_ids, requests)
+        })
+        logger.info(f"Submitted batch {batch_id} of {len(requests)} requests")
+
+        try:
+            with anyio.fail_after(self._timeout):
+                while not await self._client.is_finished(batch_id):
+                    await anyio.sleep(self._poll_interval)
+        except BaseException:
+            logger.warning(f"Cancelling batch {batch_id}")
+            with anyio.CancelScope(shield=True):
+                try:
+                    await self._client.cancel(batch_id)
+                except Exception as e:
+                    logger.warning(f"Failed to cancel batch {batch_id}: {e}")
+            raise
+
+        results = await self._client.get_results(batch_id)
+        logger.info(f"Received results of batch {batch_id}")
+
+        return [
+            results.get(custom_id) or BatchRequestError(f"No result for request in {batch_id}")
+            for custom_id in custom_ids
+        ]
+
+
+class _BatchClient(ABC):
+    def __init__(self, model: Model):
+        self._chat_model = model._model
+
+    def get_payload(self, messages: List[BaseMessage], **kwargs) -> Dict[str, Any]:
+        return self._chat_model._get_request_payload(messages, **kwargs)
+
+    @abstractmethod
+    async def submit(self, payloads: Dict[str, Dict[str, Any]]) -> str:
+        ...
+
+    @abstractmethod
+    async def is_finished(self, batch_id: str) -> bool:
+        ...
+
+    @abstractmethod
+    async def get_results(self, batch_id: str) -> Dict[str, BaseMessage | BatchRequestError]:
+        ...
+
+    @abstractmethod
+    async def cancel(self, batch_id: str) -> None:
+        ...
+
+
+class _OpenAIBatchClient(_BatchClient):
+    """
+    Sends batches using the OpenAI Batch API, which reads the requests from an uploaded JSONL file
+    and writes the responses to an output file.
+    """
+
+    def __init__(self, model: Model):
+        super().__init__(model)
+        self._client = self._chat_model.root_async_client
+
+    def get_payload(self, messages: List[BaseMessage], **kwargs) -> Dict[str, Any]:
+        payload = super().get_payload(messages, **kwargs)
+        payload.pop("stream", None)
+        return payload
+
+    async def submit(self, payloads: Dict[str, Dict[str, Any]]) -> str:
+        lines = [
+            json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": payload,
+            })
+            for custom_id, payload in payloads.items()
+        ]
+        file = await self._client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch",
+        )
+        batch = await self._client.batches.create(
+            input_file_id=file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        return batch.id
+
+    async def is_finished(self, batch_id: str) -> bool:
+        batch = await self._client.batches.retrieve(batch_id)
+        return batch.status in ("completed", "failed", "expired", "cancelled")
+
+    async def get_results(self, batch_id: str) -> Dict[str, BaseMessage | BatchRequestError]:
+        batch = await self._client.batches.retrieve(batch_id)
+        results: Dict[str, BaseMessage | BatchRequestError] = {}
+
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+
+            content = await self._client.files.content(file_id)
+            for line in content.text.splitlines():
+                if line.strip():
+                    result = json.loads(line)
+                    results[result["custom_id"]] = self._parse_result(result)
+
+        return results
+
+    async def cancel(self, batch_id: str) -> None:
+        await self._client.batches.cancel(batch_id)
+
+    def _parse_result(self, result: Dict[str, Any]) -> BaseMessage | BatchRequestError:
+        response = result.get("response") or {}
+
+        if result.get("error") or response.get("status_code") != 200:
+            return BatchRequestError(str(result.get("error") or response.get("body")))
+
+        chat_result = self._chat_model._create_chat_result(response["body"])
+        return chat_result.generations[0].message
+
+
+class _AnthropicBatchClient(_BatchClient):
+    """
+    Sends batches using the Anthropic Message Batches API.
+    """
+
+    def __init__(self, model: Model):
+        super().__init__(model)
+        self._client = self._chat_model._async_client
+
+    async def submit(self, payloads: Dict[str, Dict[str, Any]]) -> str:
+        batch = await self._client.messages.batches.create(requests=[
+            { "custom_id": custom_id, "params": payload }
+            for custom_id, payload in payloads.items()
+        ])
+        return batch.id
+
+    async def is_finished(self, batch_id: str) -> bool:
+        batch = await self._client.messages.batches.retrieve(batch_id)
+        return batch.processing_status == "ended"
+
+    async def get_results(self, batch_id: str) -> Dict[str, BaseMessage | BatchRequestError]:
+        results: Dict[str, BaseMessage | BatchRequestError] = {}
+
+        async for result in await self._client.messages.batches.results(batch_id):
+            if result.result.type == "succeeded":
+                chat_result = self._chat_model._format_output(result.result.message)
+                results[result.custom_id] = chat_result.generations[0].message
+            else:
+                error = getattr(result.result, "error", None)
+                results[result.custom_id] = BatchRequestError(
+                    f"Request {result.result.type}" + (f": {error}" if error else "")
+                )
+
+        return results
+
+    async def cancel(self, batch_id: str) -> None:
+        await self._client.messages.batches.cancel(batch_id)
+
+
+def _create_batch_client(model: Model) -> _BatchClient:
+    provider = model.info["provider"]
+
+    if provider == "openai":
+        return _OpenAIBatchClient(model)
+    elif provider == "anthropic":
+        return _AnthropicBatchClient(model)
+    else:
+        raise ValueError(f"Batch requests are not supported for model provider: {provider}")
@@ -0,0 +1,250 @@
+import logging
+import os
+import pickle
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..utils.concurrency.pickle_values import pickle_values
+from .dataset_item import DatasetItem
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINTS_DIRNAME = "checkpoints"
+"""
+The name of the directory in the log directory where item pipelines keep their checkpoint journals.
+"""
+
+DEFAULT_SYNC_INTERVAL = 1.0
+"""
+The default number of seconds between syncs of a checkpoint journal to disk.
+"""
+
+PushRecord = Tuple[str, Dict[str, Any]]
+
+@dataclass
+class ItemCheckpoint:
+    """
+    The progress of an item recorded in a checkpoint journal.
+    """
+    completed_steps: int = 0
+    """The number of steps of the pipeline the item completed, in order."""
+
+    finished: bool = False
+    """Whether the item finished every step of the pipeline."""
+
+    pushes: List[PushRecord] = field(default_factory=list)
+    """The data pushed onto the item by the completed steps, as (step name, data) pairs."""
+
+
+class CheckpointJournal:
+    """
+    An append-only journal of the steps completed by each item in an item pipeline, along with the
+    data each step pushed onto the item, so an interrupted run can be resumed.
+
+    Records are written to the file as they happen, but only synced to disk by a background thread
+    every `sync_interval` seconds, so a run with many items doesn't wait on a sync for every step.
+    If the process dies, at most the last interval of steps are lost and redone on resume.
+    """
+
+    def __init__(
+            self,
+            path: Path | str,
+            resume: bool = False,
+            sync_interval: float = DEFAULT_SYNC_INTERVAL,
+        ):
+        """
+        Open the journal, loading the checkpoints already in it when resuming.
+
+        Args:
+            path: The path of the journal file.
+            resume: Whether to load and append to an existing journal. If `False`, any existing
+                journal is replaced.
+            sync_interval: The number of seconds between syncs of the journal to disk.
+        """
+        self._path = Path(path)
+        self._checkpoints: Dict[str, ItemCheckpoint] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._closed = threading.Event()
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+
+        if resume and self._path.exists():
+            self._load()
+            self._file = open(self._path, "ab")
+        else:
+            self._file = open(self._path, "wb")
+
+        self._sync_thread = threading.Thread(
+            target=self._sync_periodically,
+            args=(sync_interval,),
+            name=f"checkpoint-journal-{self._path.name}",
+            daemon=True,
+        )
+        self._sync_thread.start()
+
+    @property
+    def path(self) -> Path:
+        """The path of the journal file."""
+        return self._path
+
+    def get_checkpoint(self, item_id: str) -> Optional[ItemCheckpoint]:
+        """
+        Get the progress recorded for an item when the journal was loaded.
+
+        Args:
+            item_id: The id of the item.
+
+        Returns:
+            Optional[ItemCheckpoint]: The checkpoint for the item, or `None` if it has none.
+        """
+        return self._checkpoints.get(item_id)
+
+    def get_completed_steps(self, item_id: str) -> int:
+        """
+        Get the number of steps an item completed before the run was resumed.
+
+        Args:
+            item_id: The id of the item.
+
+        Returns:
+            int: The number of steps to skip for the item.
+        """
+        checkpoint = self._checkpoints.get(item_id)
+        return checkpoint.completed_steps if checkpoint else 0
+
+    def restore_item(self, item: DatasetItem) -> bool:
+        """
+        Replay the data pushed by the completed steps of an item onto it.
+
+        Args:
+            item: The item to restore.
+
+        Returns:
+            bool: `True` if the item already finished every step, `False` otherwise.
+        """
+        checkpoint = self._checkpoints.get(item.id)
+        if not checkpoint:
+            return False
+
+        for step_name, data in checkpoint.pushes:
+            item.push(data, step_name)
+
+        return checkpoint.finished
+
+    def record_step(
+            self,
+            item_id: str,
+            step_index: int,
+            pushes: List[PushRecord],
+        ) -> None:
+        """
+        Record that an item completed a step.
+
+        Args:
+            item_id: The id of the item.
+            step_index: The index of the step within the pipeline.
+            pushes: The data pushed onto the item by the step. Values that can't be pickled are
+                dropped.
+        """
+        self._append((
+            "step",
+            item_id,
+            step_index,
+            [(step_name, pickle_values(data)) for step_name, data in pushes],
+        ))
+
+    def record_finished(self, item_id: str) -> None:
+        """
+        Record that an item completed every step.
+
+        Args:
+            item_id: The id of the item.
+        """
+        self._append(("finished", item_id))
+
+    def sync(self) -> None:
+        """
+        Flush the records written so far and sync them to disk.
+        """
+        with self._lock:
+            if not self._dirty or self._file.closed:
+                return
+
+            self._file.flush()
+            self._dirty = False
+            fd = self._file.fileno()
+
+        # Sync outside the lock so steps finishing meanwhile can keep appending records
+        try:
+            os.fsync(fd)
+        except OSError as e:
+            logger.warning(f"Unable to sync checkpoint journal {self._path}: {e}")
+
+    def close(self) -> None:
+        """
+        Sync any remaining records and close the journal.
+        """
+        self._closed.set()
+        self._sync_thread.join()
+        self.sync()
+
+        with self._lock:
+            self._file.close()
+
+    def _append(self, record: tuple) -> None:
+        with self._lock:
+            if self._file.closed:
+                return
+
+            self._file.write(pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL))
+            self._dirty = True
+
+    def _sync_periodically(self, interval: float) -> None:
+        while not self._closed.wait(interval):
+            self.sync()
+
+    def _load(self) -> None:
+        valid_length = 0
+
+        with open(self._path, "rb") as file:
+            while True:
+                try:
+                    record = pickle.load(file)
+                except EOFError:
+                    break
+                except Exception as e:
+                    # Most likely the last record was only partially written when the run died
+                    logger.warning(
+                        f"Ignoring checkpoint journal {self._path} from byte {valid_length}: {e}"
+                    )
+                    break
+
+                self._apply(record)
+                valid_length = file.tell()
+
+        # Drop any partial record so new records aren't appended after it
+        if valid_length < self._path.stat().st_size:
+            os.truncate(self._path, valid_length)
+
+        logger.info(
+            f"Loaded checkpoints for {len(self._checkpoints)} items from {self._path}"
+        )
+
+    def _apply(self, record: tuple) -> None:
+        kind, item_id, *rest = record
+        checkpoint = self._checkpoints.setdefault(item_id, ItemCheckpoint())
+
+        if kind == "finished":
+            checkpoint.finished = True
+        elif kind == "step":
+            step_index, pushes = rest
+
+            # A step can only be resumed after if every step before it also completed
+            if step_index == checkpoint.completed_steps:
+                checkpoint.completed_steps += 1
+                checkpoint.pushes.extend(
+                    (step_name, pickle.loads(data)) for step_name, data in pushes
+                )
@@ -0,0 +1,115 @@
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict
+
+import anyio
+
+logger = logging.getLogger(__name__)
+
+
+class ConcurrencySlot:
+    """
+    A slot held in a `ConcurrencyBudget` by an item while it's being processed.
+    """
+
+    def __init__(self, limiter: anyio.CapacityLimiter):
+        self._limiter = limiter
+        self._borrower = object()
+        self._held = False
+
+    @property
+    def held(self) -> bool:
+        """Whether the slot is currently held."""
+        return self._held
+
+    async def acquire(self) -> None:
+        """
+        Wait until the budget has capacity and take the slot.
+        """
+        # Use a unique borrower so the same task can hold several slots (e.g. an item whose nested
+        # pipeline processes items in the same task) without anyio treating it as re-entrant.
+        await self._limiter.acquire_on_behalf_of(self._borrower)
+        self._held = True
+
+    def release(self) -> None:
+        """
+        Give the slot back to the budget, if held.
+        """
+        if self._held:
+            self._held = False
+            self._limiter.release_on_behalf_of(self._borrower)
+
+    @asynccontextmanager
+    async def released(self) -> AsyncIterator[None]:
+        """
+        Give the slot back for the duration of the context, taking it again afterwards.
+
+        Used while an item waits on nested work that draws from the same budget, so the waiting
+        item doesn't count against the budget and can't deadlock its own children.
+        """
+        if not self._held:
+            yield
+            return
+
+        self.release()
+        try:
+            yield
+        finally:
+            # If cancelled while waiting, the slot stays released and the holder won't release it
+            await self.acquire()
+
+
+class ConcurrencyBudget:
+    """
+    A limit on the number of items processed at once, shared by a pipeline and every pipeline
+    nested within its items.
+
+    Each item holds a slot while it's processed. When an item runs a nested item pipeline, it gives
+    up its slot until the nested pipeline finishes, so only items doing their own work count
+    against the budget. Without this, the concurrency of nested pipelines multiplies: 10 outer
+    items each running 10 inner items would process 100 items at once.
+    """
+
+    def __init__(self, total_tokens: int):
+        """
+        Initialize the budget.
+
+        Args:
+            total_tokens: The maximum number of items processed at once.
+        """
+        self._limiter = anyio.CapacityLimiter(max(1, int(total_tokens)))
+
+    @property
+    def total_tokens(self) -> int:
+        """The maximum number of items processed at once."""
+        return int(self._limiter.total_tokens)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[ConcurrencySlot]:
+        """
+        Hold a slot in the budget for the duration of the context.
+
+        Yields:
+            ConcurrencySlot: The slot, which nested pipelines release while they run.
+        """
+        slot = ConcurrencySlot(self._limiter)
+        await slot.acquire()
+        try:
+            yield slot
+        finally:
+            slot.release()
+
+    def get_usage(self) -> Dict[str, float]:
+        """
+        Get the usage of the budget.
+
+        Returns:
+            A dict with the number of `borrowed` and `total` slots and the number of items
+            `waiting` for a slot.
+        """
+        statistics = self._limiter.statistics()
+        return {
+            "borrowed": statistics.borrowed_tokens,
+            "total": statistics.total_tokens,
+            "waiting": statistics.tasks_waiting,
+        }
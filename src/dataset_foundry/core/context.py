@@ -1,5 +1,7 @@
+import time
 from typing import Optional
 
+from .concurrency_budget import ConcurrencyBudget, ConcurrencySlot
 from .config import Config
 from .pipeline import Pipeline
 from .dataset import Dataset
@@ -13,6 +15,9 @@ class Context:
     _params: dict
     _dataset: Dataset
     _parent: Optional['Context'] = None
+    _deadline: Optional[float] = None
+    _concurrency_budget: Optional[ConcurrencyBudget] = None
+    _concurrency_slot: Optional[ConcurrencySlot] = None
 
     @property
     def pipeline(self) -> Pipeline:
@@ -49,6 +54,60 @@ class Context:
         """
         return self._parent
 
+    @property
+    def deadline(self) -> Optional[float]:
+        """
+        The time, as returned by `time.monotonic()`, by which work done with this context must
+        finish, or `None` if there is no deadline.
+        """
+        return self._deadline
+
+    @property
+    def concurrency_budget(self) -> Optional[ConcurrencyBudget]:
+        """
+        The budget limiting how many items are processed at once by the pipelines sharing this
+        context, or `None` if no item pipeline has started one.
+        """
+        return self._concurrency_budget
+
+    @property
+    def concurrency_slot(self) -> Optional[ConcurrencySlot]:
+        """
+        The slot in the concurrency budget held by the item being processed with this context, if
+        any.
+        """
+        return self._concurrency_slot
+
+    @property
+    def remaining_time(self) -> Optional[float]:
+        """
+        The number of seconds left before the deadline, or `None` if there is no deadline.
+        """
+        if self._deadline is None:
+            return None
+
+        return max(0.0, self._deadline - time.monotonic())
+
+    def get_timeout(self, timeout: Optional[float] = None) -> Optional[float]:
+        """
+        Get a timeout for an operation that doesn't extend past the deadline of this context.
+
+        Args:
+            timeout (Optional[float]): The timeout requested for the operation, in seconds.
+
+        Returns:
+            Optional[float]: The smaller of `timeout` and the remaining time, or `None` if neither
+                is set.
+        """
+        remaining_time = self.remaining_time
+
+        if timeout is None:
+            return remaining_time
+        elif remaining_time is None:
+            return timeout
+        else:
+            return min(timeout, remaining_time)
+
     def __init__(self, pipeline: Pipeline, dataset: Dataset, params: Optional[dict] = None):
         """
         Initialize the context.
@@ -125,6 +184,9 @@ class Context:
             dataset: Optional[Dataset] = None,
             params: Optional[dict] = None,
             merge_params: bool = True,
+            timeout: Optional[float] = None,
+            concurrency_budget: Optional[ConcurrencyBudget] = None,
+            concurrency_slot: Optional[ConcurrencySlot] = None,
         ) -> 'Context':
         """
         Create a child context that inherits from this context.
@@ -135,11 +197,25 @@ class Context:
             params (Optional[dict]): The parameters to use for the child context.
             merge_params (bool): Whether to merge the parameters of the parent context with
                 `params`, with keys in `params` taking precedence. Defaults to `True`.
+            timeout (Optional[float]): The number of seconds work done with the child context has to
+                finish. The child's deadline never extends past the deadline of this context.
+            concurrency_budget (Optional[ConcurrencyBudget]): The concurrency budget for the child
+                context. Defaults to the budget of this context.
+            concurrency_slot (Optional[ConcurrencySlot]): The slot held by the item processed with
+                the child context. Defaults to the slot of this context.
         """
         if merge_params:
             params = {**self.params, **(params or {})}
 
         context = Context(pipeline or self.pipeline, dataset or self.dataset, params)
         context._parent = self
+        context._deadline = self._deadline
+        context._concurrency_budget = concurrency_budget or self._concurrency_budget
+        context._concurrency_slot = concurrency_slot or self._concurrency_slot
+
+        if timeout is not None:
+            deadline = time.monotonic() + timeout
+            if context._deadline is None or deadline < context._deadline:
+                context._deadline = deadline
 
         return context
@@ -16,12 +16,20 @@ class DatasetItem:
 
     def __init__(self, id: str = None, data: dict = None):
         self._id = id
+        self._data_history = []
         self.data = data if data else {}
 
     @property
     def id(self) -> str:
         return self._id
 
+    @property
+    def data_history(self) -> List[DataHistoryRecord]:
+        """
+        The data pushed onto this item, in the order it was pushed.
+        """
+        return self._data_history
+
     def push(self, data: dict, step: Union[Callable, str]):
         step_name = step.__name__ if callable(step) else (step or f"{len(self._data_history) + 1}")
         self._data_history.append({
@@ -0,0 +1,128 @@
+import heapq
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, List
+
+import anyio
+
+
+@dataclass(order=True)
+class _Waiter:
+    start_tag: float
+    sequence: int
+    event: anyio.Event = field(compare=False, default_factory=anyio.Event)
+    granted: bool = field(compare=False, default=False)
+    cancelled: bool = field(compare=False, default=False)
+
+
+class FairLimiter:
+    """
+    A capacity limiter that shares its tokens between flows (e.g. pipeline executions) using
+    weighted fair queuing, rather than granting them in arrival order.
+
+    Each acquire is given a virtual start tag: the later of the current virtual time and the tag
+    where the previous acquire of its flow finished, with every acquire taking `1 / weight` units
+    of virtual time. When tokens are free they are granted immediately, and when there's
+    contention they are granted to the waiter with the lowest start tag (start-time fair queuing).
+    As a result, a flow with weight 2 gets twice the tokens of a flow with weight 1 while both are
+    waiting, and a flow that arrives late isn't starved by one that started first.
+    """
+
+    def __init__(self, total_tokens: float):
+        """
+        Initialize the limiter.
+
+        Args:
+            total_tokens: The maximum number of tokens held at once, or `math.inf` for no limit.
+        """
+        self._total_tokens = total_tokens
+        self._borrowed = 0
+        self._waiting = 0
+        self._waiters: List[_Waiter] = []
+        self._sequence = 0
+        self._virtual_time = 0.0
+        self._finish_tags: Dict[Hashable, float] = {}
+
+    @property
+    def total_tokens(self) -> float:
+        """The maximum number of tokens held at once."""
+        return self._total_tokens
+
+    @total_tokens.setter
+    def total_tokens(self, value: float) -> None:
+        self._total_tokens = value
+        self._grant()
+
+    def get_usage(self) -> Dict[str, float]:
+        """
+        Get the usage of the limiter.
+
+        Returns:
+            A dict with the number of `borrowed` and `total` tokens and the number of `waiting`
+            acquires.
+        """
+        return {
+            "borrowed": self._borrowed,
+            "total": self._total_tokens,
+            "waiting": self._waiting,
+        }
+
+    async def acquire(self, flow: Hashable = None, weight: float = 1.0) -> None:
+        """
+        Wait for a token and take it.
+
+        Args:
+            flow: The flow the token is acquired for.
+            weight: The share of the tokens the flow should get relative to other flows.
+        """
+        if self._total_tokens == math.inf:
+            self._borrowed += 1
+            return
+
+        start_tag = max(self._virtual_time, self._finish_tags.get(flow, 0.0))
+        self._finish_tags[flow] = start_tag + 1.0 / max(weight, 1e-6)
+
+        if self._borrowed < self._total_tokens and not self._waiting:
+            self._borrowed += 1
+            self._virtual_time = start_tag
+            return
+
+        self._sequence += 1
+        waiter = _Waiter(start_tag, self._sequence)
+        heapq.heappush(self._waiters, waiter)
+        self._waiting += 1
+
+        try:
+            await waiter.event.wait()
+        except BaseException:
+            if waiter.granted:
+                self.release()
+            else:
+                waiter.cancelled = True
+                self._waiting -= 1
+            raise
+
+    def release(self) -> None:
+        """
+        Give back a token, granting it to the next waiter, if any.
+        """
+        self._borrowed -= 1
+        self._grant()
+
+    def _grant(self) -> None:
+        while self._waiters and self._borrowed < self._total_tokens:
+            waiter = heapq.heappop(self._waiters)
+            if waiter.cancelled:
+                continue
+
+            waiter.granted = True
+            self._waiting -= 1
+            self._borrowed += 1
+            self._virtual_time = max(self._virtual_time, waiter.start_tag)
+            waiter.event.set()
+
+        # Flows whose tags have fallen behind the virtual time would start at it anyway
+        if len(self._finish_tags) > 64:
+            self._finish_tags = {
+                flow: tag for flow, tag in self._finish_tags.items() if tag > self._virtual_time
+            }
@@ -0,0 +1,127 @@
+import math
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Dict, Optional
+
+if TYPE_CHECKING:
+    from .model import Model
+
+
+class HedgingPolicy:
+    """
+    A policy for hedging model calls: when a call hasn't returned within the `percentile` latency
+    of recent calls, a duplicate request is sent, to `hedge_model` if given or the same model
+    otherwise. The first response is used and the other request is cancelled.
+
+    Hedging only starts once `min_samples` latencies have been observed, and the number of hedges
+    is capped at `max_extra_ratio` of the calls made, so at most that fraction of extra requests
+    is paid for.
+
+    The number of calls, hedges fired and hedges that returned first are kept as counters.
+    """
+
+    def __init__(
+            self,
+            percentile: float = 0.95,
+            max_extra_ratio: float = 0.1,
+            hedge_model: Optional["Model"] = None,
+            min_samples: int = 20,
+            window_size: int = 200,
+            min_delay: float = 0.0,
+        ):
+        """
+        Initialize the policy.
+
+        Args:
+            percentile: The percentile of recent latencies after which to send a hedge, between 0
+                and 1.
+            max_extra_ratio: The maximum number of hedges to send as a fraction of calls made.
+            hedge_model: The model to send hedges to. Defaults to the model being called.
+            min_samples: The number of latencies to observe before hedging.
+            window_size: The number of recent latencies used to compute the percentile.
+            min_delay: The minimum number of seconds to wait before sending a hedge.
+        """
+        if not 0 < percentile < 1:
+            raise ValueError(f"Hedging percentile must be between 0 and 1: {percentile}")
+
+        self._percentile = float(percentile)
+        self._max_extra_ratio = max(0.0, float(max_extra_ratio))
+        self._hedge_model = hedge_model
+        self._min_samples = max(1, int(min_samples))
+        self._min_delay = float(min_delay)
+        self._latencies: Deque[float] = deque(maxlen=max(int(window_size), self._min_samples))
+
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    @property
+    def hedge_model(self) -> Optional["Model"]:
+        """The model hedges are sent to, or `None` to use the model being called."""
+        return self._hedge_model
+
+    def get_delay(self) -> Optional[float]:
+        """
+        Get the number of seconds to wait for a call before sending a hedge.
+
+        Returns:
+            Optional[float]: The delay, or `None` if too few latencies have been observed.
+        """
+        if len(self._latencies) < self._min_samples:
+            return None
+
+        latencies = sorted(self._latencies)
+        index = max(0, math.ceil(self._percentile * len(latencies)) - 1)
+
+        return max(self._min_delay, latencies[index])
+
+    def record_latency(self, latency: float) -> None:
+        """
+        Record the latency of a call to the model being hedged.
+
+        Args:
+            latency: The number of seconds the call took.
+        """
+        self._latencies.append(latency)
+
+    def start_call(self) -> None:
+        """
+        Count a call that may be hedged.
+        """
+        self.calls += 1
+
+    def try_start_hedge(self) -> bool:
+        """
+        Count a hedge, if sending one stays within `max_extra_ratio` of the calls made.
+
+        Returns:
+            bool: Whether the hedge can be sent.
+        """
+        if self.hedges + 1 > self._max_extra_ratio * self.calls:
+            return False
+
+        self.hedges += 1
+        return True
+
+    def record_hedge_win(self) -> None:
+        """
+        Count a hedge that returned before the call it duplicated.
+        """
+        self.hedge_wins += 1
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Get the counters of the policy.
+
+        Returns:
+            Dict[str, float]: The number of `calls`, `hedges` sent and `hedge_wins`, along with the
+                `hedge_rate` (hedges per call), the `win_rate` (wins per hedge) and the current
+                `delay`, which is `None` while warming up.
+        """
+        return {
+            "calls": self.calls,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedge_rate": self.hedges / self.calls if self.calls else 0.0,
+            "win_rate": self.hedge_wins / self.hedges if self.hedges else 0.0,
+            "delay": self.get_delay(),
+        }
@@ -0,0 +1,171 @@
+import logging
+import math
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, Iterable, List, Optional
+
+import anyio
+
+from ..types.batch_item_action import BatchItemAction
+from .context import Context
+from .dataset_item import DatasetItem
+
+logger = logging.getLogger(__name__)
+
+_current_item_batchers: ContextVar[Dict[int, "ItemBatcher"]] = ContextVar("item_batchers")
+
+
+@dataclass
+class _BatchEntry:
+    item: DatasetItem
+    context: Context
+    done: anyio.Event = field(default_factory=anyio.Event)
+    error: Optional[BaseException] = None
+    cancelled: bool = False
+
+
+class ItemBatcher:
+    """
+    Collects the items reaching a `BatchItemAction` into batches and runs the action once per
+    batch.
+
+    A batch is run as soon as it has `max_batch_size` items, or `max_wait` seconds after its first
+    item arrived. Batches run concurrently with the collection of the next batch.
+    """
+
+    def __init__(self, action: BatchItemAction):
+        """
+        Initialize the batcher.
+
+        Args:
+            action: The action to run on each batch.
+        """
+        self._action = action
+        self._send_stream, self._receive_stream = \
+            anyio.create_memory_object_stream[_BatchEntry](math.inf)
+
+    @property
+    def action(self) -> BatchItemAction:
+        """The action run on each batch."""
+        return self._action
+
+    async def submit(self, item: DatasetItem, context: Context) -> None:
+        """
+        Add an item to the next batch and wait until the batch has been processed.
+
+        Args:
+            item: The item to process.
+            context: The context of the item.
+
+        Raises:
+            Exception: The error raised by the action, if it failed.
+        """
+        entry = _BatchEntry(item, context)
+        await self._send_stream.send(entry)
+
+        try:
+            await entry.done.wait()
+        except anyio.get_cancelled_exc_class():
+            # Items that time out before their batch starts are left out of it
+            entry.cancelled = True
+            raise
+
+        if entry.error:
+            raise entry.error
+
+    async def run(self) -> None:
+        """
+        Collect and run batches until `close` is called.
+        """
+        max_batch_size = max(1, int(self._action.max_batch_size))
+
+        async with anyio.create_task_group() as tg, self._receive_stream:
+            while True:
+                try:
+                    batch = [await self._receive_stream.receive()]
+                except anyio.EndOfStream:
+                    break
+
+                with anyio.move_on_after(self._action.max_wait):
+                    try:
+                        while len(batch) < max_batch_size:
+                            batch.append(await self._receive_stream.receive())
+                    except anyio.EndOfStream:
+                        pass
+
+                tg.start_soon(self._run_batch, batch)
+
+    def close(self) -> None:
+        """
+        Stop accepting items, letting `run` return once the batches already submitted finish.
+        """
+        self._send_stream.close()
+
+    async def _run_batch(self, batch: List[_BatchEntry]) -> None:
+        entries = [entry for entry in batch if not entry.cancelled]
+        if not entries:
+            return
+
+        logger.debug(f"Running {self._action.__name__} on a batch of {len(entries)} items")
+
+        try:
+            errors = await self._action.function(
+                [entry.item for entry in entries], entries[0].context
+            )
+            for entry in entries:
+                entry.error = (errors or {}).get(entry.item.id)
+        except anyio.get_cancelled_exc_class():
+            raise
+        except Exception as e:
+            for entry in entries:
+                entry.error = e
+        finally:
+            for entry in entries:
+                entry.done.set()
+
+
+@asynccontextmanager
+async def start_item_batchers(actions: Iterable) -> AsyncIterator[None]:
+    """
+    Start a batcher for each `BatchItemAction` in `actions` for the duration of the context. Within
+    the context, and any tasks started from it, `get_item_batcher` returns these batchers.
+
+    Args:
+        actions: The steps of an item pipeline.
+    """
+    batchers = {
+        id(action): ItemBatcher(action)
+        for action in actions
+        if isinstance(action, BatchItemAction)
+    }
+
+    if not batchers:
+        yield
+        return
+
+    async with anyio.create_task_group() as tg:
+        for batcher in batchers.values():
+            tg.start_soon(batcher.run)
+
+        token = _current_item_batchers.set(batchers)
+        try:
+            yield
+        finally:
+            _current_item_batchers.reset(token)
+
+            for batcher in batchers.values():
+                batcher.close()
+
+
+def get_item_batcher(action) -> Optional[ItemBatcher]:
+    """
+    Get the batcher started for an action by `start_item_batchers`, if any.
+
+    Args:
+        action: The action to get the batcher for.
+
+    Returns:
+        Optional[ItemBatcher]: The batcher for the action, or `None` if it isn't batched.
+    """
+    return _current_item_batchers.get({}).get(id(action))
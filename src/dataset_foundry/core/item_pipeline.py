@@ -1,9 +1,26 @@
 import logging
+import os
+import socket
+import statistics
+import time
+import uuid
 import anyio
+from contextlib import nullcontext
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Literal, Optional, Tuple
 
+from ..types.dataset_item_execution_info import DatasetItemExecutionInfo
+from ..types.dataset_source import DatasetSource
 from ..types.item_action import ItemAction
+from ..types.stage_execution_info import StageExecutionInfo
+from .adaptive_concurrency import AdaptiveConcurrencyController
+from .concurrency_budget import ConcurrencyBudget, ConcurrencySlot
+from .checkpoint_journal import CHECKPOINTS_DIRNAME, DEFAULT_SYNC_INTERVAL, CheckpointJournal
+from .execution_context import current_item_id, current_pipeline_execution_id
+from .item_batcher import get_item_batcher, start_item_batchers
+from .item_timings import ITEM_TIMINGS_FILENAME, ItemTimings
+from .work_queue import WORK_QUEUE_FILENAME, WorkItem, WorkItemResult, WorkQueue
 from .pipeline_service import pipeline_service
 from .dataset import Dataset
 from .dataset_item import DatasetItem
@@ -12,6 +29,35 @@ from .pipeline import Pipeline, PipelineAction
 
 logger = logging.getLogger(__name__)
 
+ItemExecutionMode = Literal["auto", "tasks", "workers", "staged", "queue"]
+
+ItemOrder = Literal["input", "longest_first"] | Callable[[DatasetItem, Optional[float]], Any]
+
+IndexedItem = Tuple[int, DatasetItem]
+
+StagedItem = Tuple[int, DatasetItem, Optional[DatasetItemExecutionInfo], Optional[Context]]
+
+ItemFeed = List[IndexedItem] | MemoryObjectReceiveStream[IndexedItem]
+"""
+The items to process, either as a list or as a stream filled while a `DatasetSource` loads them.
+"""
+
+WORKERS_MODE_MIN_ITEMS = 1000
+"""
+The number of items above which the `auto` execution mode processes items using a fixed pool of
+workers instead of starting a task for every item.
+"""
+
+DEFAULT_LEASE_DURATION = 60.0
+"""
+The number of seconds a worker holds an item leased from a work queue before it must renew it.
+"""
+
+DEFAULT_WORK_QUEUE_POLL_INTERVAL = 1.0
+"""
+The number of seconds between checks of a work queue for new items or results.
+"""
+
 class ItemPipeline(Pipeline):
     """
     A pipeline that can be used to process a dataset of items.
@@ -48,53 +94,969 @@ class ItemPipeline(Pipeline):
         )
         self._steps = steps
 
-    async def execute(self, dataset: Optional[Dataset], context: Optional[Context]) -> None:
+    async def execute(
+            self,
+            dataset: Optional[Dataset],
+            context: Optional[Context],
+            source: Optional[DatasetSource] = None,
+        ) -> None:
         """
         Execute the data-processing steps of this pipeline.
 
+        The `execution_mode` parameter controls how items are scheduled:
+
+        - `tasks`: start a task for every item up front and limit how many run at once.
+        - `workers`: start `max_concurrent_items` workers that pull items one at a time, so the
+          number of tasks stays proportional to the concurrency rather than the dataset size.
+        - `staged`: treat each step as a stage with its own workers and bounded input queue, with
+          items flowing from one stage to the next. The number of workers per stage defaults to
+          `max_concurrent_items` and can be set per stage index or step name using the
+          `stage_workers` parameter. The size of each queue is set by `stage_buffer_size`.
+        - `queue`: publish the items to a `WorkQueue` at the `work_queue` parameter (or
+          `WORK_QUEUE_FILENAME` in `log_dir`) and wait for worker processes, started with
+          `dataset-foundry worker`, to process them. Results are merged back into the items as
+          workers commit them. Only the outermost item pipeline uses the queue; item pipelines
+          nested within an item use `tasks` instead, since they run within a worker's item.
+        - `auto`: use `workers` for datasets with more than `WORKERS_MODE_MIN_ITEMS` items and
+          `tasks` otherwise (default).
+
+        When the `adaptive_concurrency` parameter is set, the `tasks` and `workers` modes treat
+        `max_concurrent_items` as a ceiling and adjust the number of items processed at once based
+        on model latency, rate limits and item failures, never going below `min_concurrent_items`.
+        The parameter can also be a dict of options for `AdaptiveConcurrencyController`.
+
+        The `item_order` parameter controls the order in which items are started:
+
+        - `input`: process items in the order they appear in the dataset (default).
+        - `longest_first`: start the items that took longest in previous runs first, so a few
+          slow items don't leave most of the slots idle at the end of the run. Items without a
+          previous duration are assumed to take an average amount of time.
+        - a function taking an item and its previous duration in seconds (or `None`) and returning
+          a sort key.
+
+        Durations of successful items are saved on every run to the `item_timings_file` parameter,
+        or to `ITEM_TIMINGS_FILENAME` in the `log_dir` parameter, and are only read when ordering
+        by duration. When no durations are available, items are processed in input order. Items
+        keep their original `index` regardless of order.
+
+        The `item_timeout` and `step_timeout` parameters limit how many seconds each item, and each
+        step of an item, can take. The deadline is carried on the context passed to each step, so
+        nested actions can shorten their own timeouts to fit. Items that run out of time are given
+        a `timeout` status.
+
+        Unless run within a step of another item or in `queue` mode, the steps each item completes,
+        and the data they push onto it, are recorded in a journal at the `checkpoint_journal_file`
+        parameter, or in the `CHECKPOINTS_DIRNAME` directory of `log_dir`. When the `resume`
+        parameter is set, the data in the journal is restored onto the items, items that finished
+        are skipped and the rest continue from the step after the last one they completed. The
+        journal is synced to disk every `checkpoint_sync_interval` seconds.
+
+        Steps that are a `BatchItemAction` collect the items reaching them into batches and
+        process each batch at once. Batches only fill up when enough items reach the step at the
+        same time, so `max_concurrent_items` (or the stage's workers) should be at least the
+        action's `max_batch_size`.
+
+        Item pipelines nested within the items of another share a `ConcurrencyBudget` carried on the
+        context, so nesting doesn't multiply the number of items processed at once. The outermost
+        item pipeline creates the budget with `concurrency_budget` slots, defaulting to its
+        `max_concurrent_items`. An item gives up its slot while a nested pipeline runs and
+        `max_concurrent_items` still caps the items processed at once by each pipeline. Since
+        stages already have their own workers, items in `staged` mode don't take slots, though
+        pipelines nested within their steps do.
+
+        When the last setup step is a `DatasetSource` (e.g. `load_dataset_from_directory` with
+        `stream=True`), it's passed as `source` and items are processed as they load rather than
+        after setup finishes. Loading waits while `source_buffer_size` items (defaulting to
+        `max_concurrent_items`) are waiting to be processed. Streaming isn't supported in `queue`
+        mode or with an `item_order` other than `input`, since these need every item up front, so
+        in those cases the source is run during setup instead. In `auto` mode, streamed items are
+        processed using `workers`, since the size of the dataset isn't known up front.
+
         Args:
             dataset (Dataset): The dataset to process.
             context (Context): The context to use for processing.
+            source (Optional[DatasetSource]): The source loading more items into the dataset, if
+                any.
         """
         max_concurrent_items = context.params.get("max_concurrent_items", 1)
+        execution_mode = self._get_execution_mode(dataset, context, streaming=bool(source))
+
+        if source:
+            logger.info(
+                f"Processing dataset items as they load "
+                f"(concurrency: {max_concurrent_items}, mode: {execution_mode})"
+            )
+        else:
+            logger.info(
+                f"Processing {len(dataset.items)} dataset items "
+                f"(concurrency: {max_concurrent_items}, mode: {execution_mode})"
+            )
+
+            if not dataset.items:
+                return
+
+        journal = self._open_checkpoint_journal(context, execution_mode)
+        timings = self._get_item_timings(context)
+        items = self._order_items(dataset.items, context, timings) if not source else None
+
+        if journal and items:
+            items = self._restore_items(items, journal)
+
+        context = self._with_concurrency_budget(context, max_concurrent_items)
+        slot = context.concurrency_slot
+
+        try:
+            # The item running this pipeline waits on its nested items, so lend them its slot
+            async with (
+                slot.released() if slot else nullcontext(),
+                start_item_batchers(self._steps),
+            ):
+                if source:
+                    await self._execute_streamed_items(
+                        dataset, source, context, execution_mode, max_concurrent_items, journal
+                    )
+                else:
+                    await self._execute_items(
+                        items, context, execution_mode, max_concurrent_items, journal
+                    )
+        finally:
+            # Save even if interrupted, since the durations of finished items are still useful
+            self._save_item_timings(timings)
+
+            if journal:
+                journal.close()
+
+    def _supports_streaming(self, context: Context) -> bool:
+        execution_mode = self._get_requested_execution_mode(context)
+        item_order = context.params.get("item_order") or "input"
+
+        return execution_mode != "queue" and item_order == "input"
+
+    async def _execute_streamed_items(
+            self,
+            dataset: Dataset,
+            source: DatasetSource,
+            context: Context,
+            execution_mode: ItemExecutionMode,
+            max_concurrent_items: int,
+            journal: Optional[CheckpointJournal] = None,
+        ) -> None:
+        buffer_size = int(context.params.get("source_buffer_size") or max_concurrent_items)
+        send_stream, receive_stream = anyio.create_memory_object_stream[IndexedItem](buffer_size)
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(self._load_items, dataset, source, context, send_stream, journal)
+
+            async with receive_stream:
+                await self._execute_items(
+                    receive_stream, context, execution_mode, max_concurrent_items, journal
+                )
+
+    async def _load_items(
+            self,
+            dataset: Dataset,
+            source: DatasetSource,
+            context: Context,
+            send_stream: MemoryObjectSendStream[IndexedItem],
+            journal: Optional[CheckpointJournal] = None,
+        ) -> None:
+        """
+        Send the items already in the dataset, then the items loaded by `source`, to the items
+        being processed, skipping items that finished in a previous run.
+        """
+        item_index = 0
+        skipped = 0
+
+        async def send_item(item: DatasetItem):
+            nonlocal item_index, skipped
+
+            if journal and item.id is not None and journal.restore_item(item):
+                skipped += 1
+            else:
+                # Waits while the buffer is full, so loading doesn't run ahead of processing
+                await send_stream.send((item_index, item))
+
+            item_index += 1
+
+        async with send_stream:
+            for item in list(dataset.items):
+                await send_item(item)
+
+            async for item in source(dataset, context):
+                pipeline_service.add_item(item)
+                await send_item(item)
+
+        logger.info(f"Finished loading {item_index} dataset items")
+        if skipped:
+            logger.info(f"Skipped {skipped} items that finished in a previous run")
+
+    async def _execute_items(
+            self,
+            items: ItemFeed,
+            context: Context,
+            execution_mode: ItemExecutionMode,
+            max_concurrent_items: int,
+            journal: Optional[CheckpointJournal] = None,
+        ) -> None:
+        if execution_mode in ("staged", "queue"):
+            if context.params.get("adaptive_concurrency"):
+                logger.warning(
+                    f"Adaptive concurrency is not supported in {execution_mode} mode; ignoring"
+                )
+
+            if execution_mode == "queue":
+                return await self._execute_with_queue(items, context)
+            else:
+                return await self._execute_in_stages(
+                    items, context, max_concurrent_items, journal
+                )
+
         limiter = anyio.CapacityLimiter(max_concurrent_items)
+        controller = self._create_concurrency_controller(limiter, context, max_concurrent_items)
+
+        if controller:
+            controller.start()
 
-        logger.info(f"Processing {len(dataset.items)} dataset items (concurrency: {max_concurrent_items})")
+        try:
+            if execution_mode == "workers":
+                await self._execute_with_workers(
+                    items, context, max_concurrent_items, limiter, controller, journal
+                )
+            else:
+                await self._execute_with_tasks(items, context, limiter, controller, journal)
+        finally:
+            if controller:
+                controller.stop()
 
+    async def _execute_with_tasks(
+            self,
+            items: ItemFeed,
+            context: Context,
+            limiter: anyio.CapacityLimiter,
+            controller: Optional[AdaptiveConcurrencyController] = None,
+            journal: Optional[CheckpointJournal] = None,
+        ) -> None:
         async def process_with_limit(data_item: DatasetItem, item_index: int):
-            await limiter.acquire()
-            try:
-                info = pipeline_service.start_item(data_item)
-                try:
-                    data_item.push({ "index": item_index }, "item_pipeline")
-                    await self.process_data_item(data_item, context)
-                    pipeline_service.stop_item(info, status="success")
-                except anyio.get_cancelled_exc_class():
-                    # Re-raise cancellation to allow proper cleanup
-                    pipeline_service.stop_item(info, status="cancelled")
-                    raise
-                except Exception as e:
-                    # Don't re-raise exceptions - allow other items to continue processing
-                    pipeline_service.stop_item(info, status="error")
-                    logger.error(f"Error processing item {data_item.id}: {e}", exc_info=True)
-            finally:
-                limiter.release()
-
-        if dataset.items:
+            async with limiter:
+                info = await self._process_item(data_item, item_index, context, journal)
+            if controller:
+                controller.record_item(info.status == "success")
+
+        async with anyio.create_task_group() as tg:
+            async for item_index, item in _iterate_items(items):
+                tg.start_soon(process_with_limit, item, item_index)
+
+    async def _execute_with_workers(
+            self,
+            items: ItemFeed,
+            context: Context,
+            max_concurrent_items: int,
+            limiter: Optional[anyio.CapacityLimiter] = None,
+            controller: Optional[AdaptiveConcurrencyController] = None,
+            journal: Optional[CheckpointJournal] = None,
+        ) -> None:
+        # Workers share a single iterator; `next()` never awaits, so each item is only handed out
+        # once even though many workers are pulling from it. Streams hand each item to one
+        # receiver, so workers can share them directly.
+        pending_items = iter(items) if isinstance(items, list) else items
+
+        async def worker():
+            while (entry := await _next_item(pending_items)) is not None:
+                item_index, item = entry
+
+                # With adaptive concurrency there are more workers than allowed to run at once, so
+                # the limiter decides how many of them are processing an item
+                if controller:
+                    async with limiter:
+                        info = await self._process_item(item, item_index, context, journal)
+                    controller.record_item(info.status == "success")
+                else:
+                    await self._process_item(item, item_index, context, journal)
+
+        num_workers = min(max_concurrent_items, len(items)) if isinstance(items, list) \
+            else max_concurrent_items
+
+        async with anyio.create_task_group() as tg:
+            for _ in range(num_workers):
+                tg.start_soon(worker)
+
+    async def _execute_in_stages(
+            self,
+            items: ItemFeed,
+            context: Context,
+            max_concurrent_items: int,
+            journal: Optional[CheckpointJournal] = None,
+        ) -> None:
+        if not self._steps:
+            return await self._execute_with_workers(
+                items, context, max_concurrent_items, journal=journal
+            )
+
+        buffer_size = int(context.params.get("stage_buffer_size") or max_concurrent_items)
+        stages = [
+            pipeline_service.add_stage(
+                name=_get_step_name(action),
+                workers=self._get_stage_workers(index, action, context, max_concurrent_items),
+                buffer_size=buffer_size,
+            )
+            for index, action in enumerate(self._steps)
+        ]
+        streams = [
+            anyio.create_memory_object_stream[StagedItem](buffer_size) for _ in stages
+        ]
+        active_items: Dict[str, DatasetItemExecutionInfo] = {}
+        remaining_workers = [stage.workers for stage in stages]
+
+        async def feed_items(send_stream: MemoryObjectSendStream[StagedItem]):
+            async with send_stream:
+                async for item_index, item in _iterate_items(items):
+                    await send_stream.send((item_index, item, None, None))
+                    self._update_stage_queue(stages[0], send_stream)
+
+        async def stage_worker(
+                stage: StageExecutionInfo,
+                receive_stream: MemoryObjectReceiveStream[StagedItem],
+                send_stream: Optional[MemoryObjectSendStream[StagedItem]],
+            ):
+            action = self._steps[stage.index]
+            next_stage = stages[stage.index + 1] if send_stream else None
+
+            async with receive_stream:
+                async for item_index, item, info, item_context in receive_stream:
+                    self._update_stage_queue(stage, receive_stream)
+
+                    if info is None:
+                        info = pipeline_service.start_item(item, bind_context=False)
+                        item_context = self._create_item_context(context, None)
+                        active_items[item.id] = info
+                        item.push({ "index": item_index }, "item_pipeline")
+
+                    # Resumed items pass through the stages they completed in a previous run
+                    if journal and stage.index < journal.get_completed_steps(item.id):
+                        succeeded = True
+                    else:
+                        succeeded = await self._process_stage_item(
+                            stage, action, item, info, item_context, journal
+                        )
+
+                    if not succeeded:
+                        active_items.pop(item.id, None)
+                    elif send_stream:
+                        await send_stream.send((item_index, item, info, item_context))
+                        self._update_stage_queue(next_stage, send_stream)
+                    else:
+                        active_items.pop(item.id, None)
+                        pipeline_service.stop_item(info, status="success")
+
+                        if journal:
+                            journal.record_finished(item.id)
+
+            if send_stream:
+                await send_stream.aclose()
+
+            remaining_workers[stage.index] -= 1
+            if remaining_workers[stage.index] == 0:
+                pipeline_service.update_stage(stage, { "end_time": time.time() })
+
+        try:
             async with anyio.create_task_group() as tg:
-                for item_index, item in enumerate(dataset.items):
-                    tg.start_soon(process_with_limit, item, item_index)
+                first_send_stream, _ = streams[0]
+                tg.start_soon(feed_items, first_send_stream)
+
+                for stage in stages:
+                    _, receive_stream = streams[stage.index]
+                    next_send_stream = streams[stage.index + 1][0] \
+                        if stage.index + 1 < len(stages) else None
+
+                    for _ in range(stage.workers):
+                        tg.start_soon(
+                            stage_worker,
+                            stage,
+                            receive_stream.clone(),
+                            next_send_stream.clone() if next_send_stream else None,
+                        )
+
+                    # Each worker holds its own clones, so close the originals to let the streams
+                    # end once every worker from the previous stage has finished
+                    receive_stream.close()
+                    if next_send_stream:
+                        next_send_stream.close()
+        except anyio.get_cancelled_exc_class():
+            # Items waiting between stages aren't owned by any worker, so mark them here
+            for info in active_items.values():
+                if info.status == "running":
+                    pipeline_service.stop_item(info, status="cancelled")
+            raise
+
+    async def _process_stage_item(
+            self,
+            stage: StageExecutionInfo,
+            action: ItemAction,
+            item: DatasetItem,
+            info: DatasetItemExecutionInfo,
+            context: Context,
+            journal: Optional[CheckpointJournal] = None,
+        ) -> bool:
+        """
+        Run the action for a stage on an item, updating the stats for the stage.
+
+        Returns:
+            bool: `True` if the item should continue to the next stage, `False` otherwise.
+        """
+        pipeline_service.update_stage(stage, { "in_progress": stage.in_progress + 1 })
+
+        start_time = time.time()
+        token = current_item_id.set(item.id)
+        succeeded = False
+
+        try:
+            await self._run_step(action, item, context, stage.index, journal)
+            succeeded = True
+        except anyio.get_cancelled_exc_class():
+            pipeline_service.stop_item(info, status="cancelled")
+            raise
+        except TimeoutError:
+            pipeline_service.stop_item(info, status="timeout")
+        except Exception as e:
+            # Don't re-raise exceptions - allow other items to continue processing
+            pipeline_service.stop_item(info, status="error")
+            logger.error(f"Error processing item {item.id}: {e}", exc_info=True)
+        finally:
+            current_item_id.reset(token)
+            pipeline_service.update_stage(stage, {
+                "in_progress": stage.in_progress - 1,
+                "completed": stage.completed + (1 if succeeded else 0),
+                "failed": stage.failed + (0 if succeeded else 1),
+                "busy_time": stage.busy_time + (time.time() - start_time),
+            })
+
+        return succeeded
+
+    async def _execute_with_queue(self, items: List[IndexedItem], context: Context) -> None:
+        queue = self._get_work_queue(context)
+        poll_interval = float(
+            context.params.get("work_queue_poll_interval") or DEFAULT_WORK_QUEUE_POLL_INTERVAL
+        )
+        items_by_id = { item.id: item for _, item in items }
+        active_items: Dict[str, DatasetItemExecutionInfo] = {}
+        version = 0
+
+        count = await anyio.to_thread.run_sync(
+            queue.publish,
+            items,
+            {
+                "pipeline": self.name,
+                "module": self.module,
+                "params": context.params,
+            },
+        )
+        logger.info(
+            f"Published {count} items to work queue {queue.path}. Start workers using "
+            f"`dataset-foundry worker <pipeline> --work-queue {queue.path}`"
+        )
+
+        try:
+            while True:
+                # Check before reading updates so results committed in between aren't missed
+                finished = not await anyio.to_thread.run_sync(queue.has_unfinished_items)
+
+                for update in await anyio.to_thread.run_sync(queue.get_updates, version):
+                    version = max(version, update.version)
+                    self._apply_work_item_update(update, items_by_id, active_items)
+
+                if finished:
+                    break
+
+                await anyio.sleep(poll_interval)
+        except anyio.get_cancelled_exc_class():
+            for info in active_items.values():
+                pipeline_service.stop_item(info, status="cancelled")
+            raise
+        finally:
+            with anyio.CancelScope(shield=True):
+                await anyio.to_thread.run_sync(queue.close)
+
+    def _apply_work_item_update(
+            self,
+            update: WorkItemResult,
+            items_by_id: Dict[str, DatasetItem],
+            active_items: Dict[str, DatasetItemExecutionInfo],
+        ) -> None:
+        item = items_by_id.get(update.id)
+        if not item or update.status == "pending":
+            return
+
+        info = active_items.get(item.id)
+        if not info:
+            info = pipeline_service.start_item(item, bind_context=False)
+            active_items[item.id] = info
+
+        if update.status == "leased":
+            logger.debug(f"Item {item.id} leased by worker {update.worker_id}")
+            return
+
+        active_items.pop(item.id)
+        item.push(update.data, "work_queue")
+        pipeline_service.stop_item(info, status=update.status)
+
+        if update.status != "success":
+            logger.error(
+                f"Item {item.id} finished with status {update.status} on worker {update.worker_id}"
+                + (f": {update.error}" if update.error else "")
+            )
+
+    async def process_work_queue(
+            self,
+            queue: WorkQueue,
+            context: Context,
+            worker_id: Optional[str] = None,
+        ) -> int:
+        """
+        Process items leased from a work queue until the queue is closed or no unfinished items
+        remain, committing the data of each item back to the queue.
+
+        Up to `max_concurrent_items` items are processed at once. While an item is processed, its
+        lease is renewed every third of the `lease_duration` parameter, so items held by a worker
+        that stops responding are given to another worker.
+
+        Args:
+            queue (WorkQueue): The queue to lease items from.
+            context (Context): The context to use for processing.
+            worker_id (Optional[str]): The id of this worker. Defaults to a unique id based on the
+                host name and process id.
+
+        Returns:
+            int: The number of items processed.
+        """
+        worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        lease_duration = float(context.params.get("lease_duration") or DEFAULT_LEASE_DURATION)
+        poll_interval = float(
+            context.params.get("work_queue_poll_interval") or DEFAULT_WORK_QUEUE_POLL_INTERVAL
+        )
+        max_concurrent_items = context.params.get("max_concurrent_items", 1)
+        context = self._with_concurrency_budget(context, max_concurrent_items)
+        processed = 0
+
+        logger.info(f"Worker {worker_id} processing items from work queue {queue.path}")
+
+        async def is_queue_done() -> bool:
+            state = await anyio.to_thread.run_sync(queue.get_state)
+            if state == "open":
+                return not await anyio.to_thread.run_sync(queue.has_unfinished_items)
+            else:
+                return state == "closed"
+
+        async def worker():
+            nonlocal processed
+
+            while True:
+                work_item = await anyio.to_thread.run_sync(queue.lease, worker_id, lease_duration)
+
+                if work_item:
+                    await self._process_work_item(
+                        queue, work_item, worker_id, lease_duration, context
+                    )
+                    processed += 1
+                elif await is_queue_done():
+                    return
+                else:
+                    await anyio.sleep(poll_interval)
+
+        async with start_item_batchers(self._steps), anyio.create_task_group() as tg:
+            for _ in range(max(1, max_concurrent_items)):
+                tg.start_soon(worker)
+
+        logger.info(f"Worker {worker_id} finished after processing {processed} items")
+
+        return processed
+
+    async def _process_work_item(
+            self,
+            queue: WorkQueue,
+            work_item: WorkItem,
+            worker_id: str,
+            lease_duration: float,
+            context: Context,
+        ) -> None:
+        item = DatasetItem(work_item.id, work_item.data)
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(self._renew_lease, queue, item.id, worker_id, lease_duration)
+            info = await self._process_item(item, work_item.index, context)
+            tg.cancel_scope.cancel()
+
+        committed = await anyio.to_thread.run_sync(
+            queue.complete, item.id, worker_id, info.status, item.data
+        )
+        if not committed:
+            logger.warning(
+                f"Discarding result for item {item.id} since its lease expired and it was given "
+                "to another worker"
+            )
+
+    async def _renew_lease(
+            self,
+            queue: WorkQueue,
+            item_id: str,
+            worker_id: str,
+            lease_duration: float,
+        ) -> None:
+        while True:
+            await anyio.sleep(lease_duration / 3)
+
+            if not await anyio.to_thread.run_sync(queue.renew, item_id, worker_id, lease_duration):
+                logger.warning(f"Lost the lease on item {item_id}")
+                return
+
+    def _get_work_queue(self, context: Context) -> WorkQueue:
+        path = context.params.get("work_queue")
+        log_dir = context.params.get("log_dir")
+
+        if not path and log_dir:
+            path = Path(log_dir) / WORK_QUEUE_FILENAME
+        elif not path:
+            raise ValueError(
+                "The `queue` execution mode requires a `work_queue` or `log_dir` parameter"
+            )
+
+        return WorkQueue(path, max_attempts=int(context.params.get("max_item_attempts") or 3))
+
+    def _update_stage_queue(
+            self,
+            stage: StageExecutionInfo,
+            stream: MemoryObjectReceiveStream | MemoryObjectSendStream,
+        ) -> None:
+        queue_depth = stream.statistics().current_buffer_used
+        if queue_depth != stage.queue_depth:
+            pipeline_service.update_stage(stage, { "queue_depth": queue_depth })
 
-    async def process_data_item(self, item: Optional[DatasetItem], context: Optional[Context]):
-        for action in self._steps:
+    def _get_stage_workers(
+            self,
+            index: int,
+            action: ItemAction,
+            context: Context,
+            max_concurrent_items: int,
+        ) -> int:
+        stage_workers = context.params.get("stage_workers") or {}
+
+        for key in (index, str(index), _get_step_name(action)):
+            if key in stage_workers:
+                return max(1, int(stage_workers[key]))
+
+        return max(1, max_concurrent_items)
+
+    def _create_concurrency_controller(
+            self,
+            limiter: anyio.CapacityLimiter,
+            context: Context,
+            max_concurrent_items: int,
+        ) -> Optional[AdaptiveConcurrencyController]:
+        adaptive_concurrency = context.params.get("adaptive_concurrency")
+        if not adaptive_concurrency:
+            return None
+
+        options = adaptive_concurrency if isinstance(adaptive_concurrency, dict) else {}
+        execution_id = current_pipeline_execution_id.get(None)
+
+        def report_concurrency(concurrency: int):
+            if execution_id:
+                pipeline_service.update_pipeline(execution_id, { "concurrency": concurrency })
+
+        return AdaptiveConcurrencyController(
+            limiter,
+            min_concurrency=context.params.get("min_concurrent_items") or 1,
+            max_concurrency=max_concurrent_items,
+            on_change=report_concurrency,
+            **options,
+        )
+
+    async def _process_item(
+            self,
+            data_item: DatasetItem,
+            item_index: int,
+            context: Context,
+            journal: Optional[CheckpointJournal] = None,
+        ) -> DatasetItemExecutionInfo:
+        """
+        Process an item, tracking its execution in the pipeline service.
+
+        Returns:
+            DatasetItemExecutionInfo: The info for the item, with the status it finished with.
+        """
+        async with self._acquire_concurrency_slot(context) as slot:
+            info = pipeline_service.start_item(data_item)
             try:
-                await action(item, context)
+                data_item.push({ "index": item_index }, "item_pipeline")
+                item_context = self._create_item_context(context, slot)
+                await self.process_data_item(data_item, item_context, journal)
+                pipeline_service.stop_item(info, status="success")
             except anyio.get_cancelled_exc_class():
-                # Re-raise cancellation to propagate up the call stack
+                # Re-raise cancellation to allow proper cleanup
+                pipeline_service.stop_item(info, status="cancelled")
                 raise
+            except TimeoutError:
+                # Already logged by `_run_step`
+                pipeline_service.stop_item(info, status="timeout")
             except Exception as e:
-                logger.error(
-                    f"Error during item pipeline {self.name} in step {action.__name__}"
-                    f" processing item {item.id}: {e}"
+                # Don't re-raise exceptions - allow other items to continue processing
+                pipeline_service.stop_item(info, status="error")
+                logger.error(f"Error processing item {data_item.id}: {e}", exc_info=True)
+
+        return info
+
+    def _get_timings_name(self) -> str:
+        return self.name or type(self).__name__
+
+    def _get_item_timings(self, context: Context) -> Optional[ItemTimings]:
+        path = context.params.get("item_timings_file")
+        log_dir = context.params.get("log_dir")
+
+        if not path and log_dir:
+            path = Path(log_dir) / ITEM_TIMINGS_FILENAME
+
+        return ItemTimings(path) if path else None
+
+    def _save_item_timings(self, timings: Optional[ItemTimings]) -> None:
+        execution_id = current_pipeline_execution_id.get(None)
+        if not timings or not execution_id:
+            return
+
+        items = pipeline_service.get_items(execution_id)
+        if timings.record(self._get_timings_name(), items):
+            try:
+                timings.save()
+            except OSError as e:
+                logger.warning(f"Unable to save item timings to {timings.path}: {e}")
+
+    def _order_items(
+            self,
+            items: List[DatasetItem],
+            context: Context,
+            timings: Optional[ItemTimings],
+        ) -> List[IndexedItem]:
+        indexed_items = list(enumerate(items))
+        item_order: ItemOrder = context.params.get("item_order") or "input"
+
+        if item_order == "input":
+            return indexed_items
+
+        durations = timings.get_durations(self._get_timings_name()) if timings else {}
+
+        if callable(item_order):
+            return sorted(
+                indexed_items,
+                key=lambda entry: item_order(entry[1], durations.get(entry[1].id)),
+            )
+        elif item_order != "longest_first":
+            raise ValueError(f"Invalid item order for item pipeline: {item_order}")
+
+        known_durations = [durations[item.id] for item in items if item.id in durations]
+        if not known_durations:
+            logger.info("No previous item durations found; processing items in input order")
+            return indexed_items
+
+        default_duration = statistics.fmean(known_durations)
+
+        # `sorted` is stable, so items with the same duration stay in input order
+        return sorted(
+            indexed_items,
+            key=lambda entry: -durations.get(entry[1].id, default_duration),
+        )
+
+    def _open_checkpoint_journal(
+            self,
+            context: Context,
+            execution_mode: ItemExecutionMode,
+        ) -> Optional[CheckpointJournal]:
+        resume = bool(context.params.get("resume"))
+
+        # Pipelines run within a step are redone along with the step, and may be run for many items
+        # at once, so only journal pipelines processing items at the top level
+        if current_item_id.get(None) is not None:
+            return None
+
+        # Items in the queue are processed by other processes, and the queue itself is durable
+        if execution_mode == "queue":
+            if resume:
+                logger.warning("Resuming from checkpoints is not supported in queue mode; ignoring")
+            return None
+
+        path = context.params.get("checkpoint_journal_file")
+        log_dir = context.params.get("log_dir")
+
+        if not path and log_dir:
+            path = Path(log_dir) / CHECKPOINTS_DIRNAME / f"{self._get_timings_name()}.journal"
+        elif not path:
+            if resume:
+                logger.warning("Unable to resume without a `log_dir` or `checkpoint_journal_file`")
+            return None
+
+        sync_interval = float(
+            context.params.get("checkpoint_sync_interval") or DEFAULT_SYNC_INTERVAL
+        )
+
+        try:
+            return CheckpointJournal(path, resume=resume, sync_interval=sync_interval)
+        except OSError as e:
+            logger.warning(f"Unable to open checkpoint journal {path}: {e}")
+            return None
+
+    def _restore_items(
+            self,
+            items: List[IndexedItem],
+            journal: CheckpointJournal,
+        ) -> List[IndexedItem]:
+        """
+        Restore the data of items with checkpoints in the journal, returning the items that still
+        need to be processed.
+        """
+        remaining_items = [
+            (item_index, item) for item_index, item in items
+            if item.id is None or not journal.restore_item(item)
+        ]
+
+        skipped = len(items) - len(remaining_items)
+        if skipped:
+            logger.info(f"Skipping {skipped} items that finished in a previous run")
+
+        return remaining_items
+
+    def _get_execution_mode(
+            self,
+            dataset: Dataset,
+            context: Context,
+            streaming: bool = False,
+        ) -> ItemExecutionMode:
+        execution_mode = self._get_requested_execution_mode(context)
+
+        if execution_mode == "auto":
+            if streaming:
+                return "workers"
+
+            return "workers" if len(dataset.items) > WORKERS_MODE_MIN_ITEMS else "tasks"
+        elif execution_mode in ("tasks", "workers", "staged", "queue"):
+            return execution_mode
+        else:
+            raise ValueError(f"Invalid execution mode for item pipeline: {execution_mode}")
+
+    def _get_requested_execution_mode(self, context: Context) -> str:
+        execution_mode = context.params.get("execution_mode") or "auto"
+
+        # Nested pipelines inherit the mode from the context, but publishing to the queue would
+        # replace the items of the outer pipeline and closing it would stop every worker
+        if execution_mode == "queue" and current_item_id.get(None) is not None:
+            return "tasks"
+
+        return execution_mode
+
+    async def process_data_item(
+            self,
+            item: Optional[DatasetItem],
+            context: Optional[Context],
+            journal: Optional[CheckpointJournal] = None,
+        ):
+        start_step = journal.get_completed_steps(item.id) if journal else 0
+
+        for step_index in range(start_step, len(self._steps)):
+            await self._run_step(self._steps[step_index], item, context, step_index, journal)
+
+        if journal and item.id is not None:
+            journal.record_finished(item.id)
+
+    def _create_item_context(self, context: Context, slot: Optional[ConcurrencySlot]) -> Context:
+        """
+        Create the context used to process a single item, carrying the item's slot in the
+        concurrency budget and a deadline if the `item_timeout` parameter is set.
+        """
+        item_timeout = context.params.get("item_timeout")
+        if not item_timeout and not slot:
+            return context
+
+        return context.create_child(
+            timeout=float(item_timeout) if item_timeout else None,
+            concurrency_slot=slot,
+        )
+
+    def _with_concurrency_budget(self, context: Context, max_concurrent_items: int) -> Context:
+        """
+        Get a context carrying a concurrency budget, creating one if this is the outermost item
+        pipeline.
+        """
+        if context.concurrency_budget:
+            return context
+
+        total_tokens = context.params.get("concurrency_budget") or max_concurrent_items
+        return context.create_child(concurrency_budget=ConcurrencyBudget(int(total_tokens)))
+
+    def _acquire_concurrency_slot(self, context: Context):
+        budget = context.concurrency_budget
+        return budget.acquire() if budget else nullcontext()
+
+    async def _run_step(
+            self,
+            action: ItemAction,
+            item: DatasetItem,
+            context: Context,
+            step_index: Optional[int] = None,
+            journal: Optional[CheckpointJournal] = None,
+        ):
+        step_timeout = context.params.get("step_timeout")
+        if step_timeout:
+            context = context.create_child(timeout=float(step_timeout))
+
+        history_length = len(item.data_history)
+
+        try:
+            # Actions can read `context.remaining_time` to fit their own timeouts into the budget
+            with anyio.fail_after(context.remaining_time):
+                batcher = get_item_batcher(action)
+                if batcher:
+                    await batcher.submit(item, context)
+                else:
+                    await action(item, context)
+
+            if journal and item.id is not None:
+                pushes = item.data_history[history_length:]
+                journal.record_step(
+                    item.id, step_index, [(push["step"], push["data"]) for push in pushes]
                 )
-                raise e
+        except anyio.get_cancelled_exc_class():
+            # Re-raise cancellation to propagate up the call stack
+            raise
+        except TimeoutError:
+            logger.error(
+                f"Timed out during item pipeline {self.name} in step {_get_step_name(action)}"
+                f" processing item {item.id}"
+            )
+            raise
+        except Exception as e:
+            logger.error(
+                f"Error during item pipeline {self.name} in step {_get_step_name(action)}"
+                f" processing item {item.id}: {e}"
+            )
+            raise e
+
+
+def _get_step_name(action: ItemAction) -> str:
+    return getattr(action, "__name__", type(action).__name__)
+
+
+async def _iterate_items(items: ItemFeed) -> AsyncIterator[IndexedItem]:
+    if isinstance(items, list):
+        for entry in items:
+            yield entry
+    else:
+        async for entry in items:
+            yield entry
+
+
+async def _next_item(
+        items: Iterator[IndexedItem] | MemoryObjectReceiveStream[IndexedItem],
+    ) -> Optional[IndexedItem]:
+    if isinstance(items, MemoryObjectReceiveStream):
+        try:
+            return await items.receive()
+        except anyio.EndOfStream:
+            return None
+    else:
+        return next(items, None)
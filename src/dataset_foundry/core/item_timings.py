@@ -0,0 +1,138 @@
+import json
+import logging
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+# File locking is only available on POSIX platforms
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from ..types.dataset_item_execution_info import DatasetItemExecutionInfo
+
+logger = logging.getLogger(__name__)
+
+ITEM_TIMINGS_FILENAME = "item_timings.json"
+"""
+The name of the file in the log directory where item durations are stored between runs.
+"""
+
+class ItemTimings:
+    """
+    Durations of items from previous runs, keyed by pipeline name and item id, used to estimate how
+    long each item will take the next time it's processed.
+
+    Durations are stored in a JSON file so they carry over between runs. Only items that finished
+    successfully are recorded, since failures tend to end early and would underestimate the work.
+
+    The file is only read when durations are requested, so recording durations on every run stays
+    cheap. Several pipelines can share the file, so saving merges the durations recorded since the
+    last save into the current contents of the file, holding a lock on the file where the platform
+    supports it.
+    """
+
+    def __init__(self, path: Optional[Path | str] = None):
+        """
+        Initialize the timings. Durations previously saved to `path` are loaded on first use.
+
+        Args:
+            path: The path of the JSON file to load from and save to. If `None`, timings are only
+                kept in memory.
+        """
+        self._path = Path(path) if path else None
+        self._durations: Optional[Dict[str, Dict[str, float]]] = None
+        self._recorded: Dict[str, Dict[str, float]] = {}
+
+    @property
+    def path(self) -> Optional[Path]:
+        """The path of the file the timings are saved to."""
+        return self._path
+
+    def get_durations(self, pipeline_name: str) -> Dict[str, float]:
+        """
+        Get the durations of the items previously processed by a pipeline.
+
+        Args:
+            pipeline_name: The name of the pipeline.
+
+        Returns:
+            A mapping of item ids to their last duration in seconds.
+        """
+        if self._durations is None:
+            self._durations = self._read()
+
+        return {
+            **self._durations.get(pipeline_name, {}),
+            **self._recorded.get(pipeline_name, {}),
+        }
+
+    def record(self, pipeline_name: str, items: Iterable[DatasetItemExecutionInfo]) -> int:
+        """
+        Record the durations of the successfully processed items.
+
+        Args:
+            pipeline_name: The name of the pipeline that processed the items.
+            items: The execution info for the items.
+
+        Returns:
+            int: The number of durations recorded.
+        """
+        recorded = self._recorded.setdefault(pipeline_name, {})
+        count = 0
+
+        for info in items:
+            if info.status == "success" and info.start_time and info.end_time:
+                recorded[info.id] = round(info.end_time - info.start_time, 3)
+                count += 1
+
+        return count
+
+    def save(self) -> None:
+        """
+        Merge the durations recorded since the last save into the file, if any, so durations saved
+        by other pipelines in the meantime are kept.
+        """
+        if not self._path or not self._recorded:
+            return
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._lock():
+            durations = self._read()
+            for pipeline_name, recorded in self._recorded.items():
+                durations.setdefault(pipeline_name, {}).update(recorded)
+
+            # Write to a temporary file first so an interrupted save doesn't lose the previous
+            # timings
+            temp_path = self._path.with_suffix(self._path.suffix + ".tmp")
+            temp_path.write_text(json.dumps(durations, indent=2, sort_keys=True))
+            os.replace(temp_path, self._path)
+
+        self._durations = durations
+        self._recorded = {}
+
+    def _read(self) -> Dict[str, Dict[str, float]]:
+        if not self._path or not self._path.exists():
+            return {}
+
+        try:
+            return json.loads(self._path.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable item timings in {self._path}: {e}")
+            return {}
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        if not fcntl:
+            yield
+            return
+
+        with open(self._path.with_suffix(self._path.suffix + ".lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
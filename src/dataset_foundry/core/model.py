@@ -1,27 +1,86 @@
 import logging
-from typing import List
+import time
+from typing import Dict, List, Literal, Optional
 
+import anyio
+import httpx
+
+from anthropic import AsyncAnthropic
 from langchain.chat_models.base import BaseChatModel
 from langchain_core.messages import BaseMessage
 from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
 
+from .event_emitter import EventEmitter
+from .execution_context import current_item_id
+from .hedging_policy import HedgingPolicy
+from .model_cache import ModelCache, ModelCacheMissError
+from .pipeline_service import pipeline_service
+from .rate_limiter import estimate_tokens, rate_limiters
+from .retry_policy import RetryErrorClass, RetryPolicy
+
 MAX_TOKENS = 8096
 
 logger = logging.getLogger(__name__)
 
+ModelEventType = Literal[
+    "invoke_succeeded",
+    "invoke_failed",
+    "hedge_sent",
+    "hedge_won",
+    "rate_limit_waited",
+    "retry_scheduled",
+]
+
+model_events = EventEmitter[ModelEventType]()
+"""
+Events sent after each call to a model, with the `model`, the `latency` of the call in seconds and,
+for failed calls, the `error` raised and whether the failure was due to `rate_limited`. Models with
+a hedging policy also send `hedge_sent` when a hedge is sent and `hedge_won` when it returns first,
+with the `model` being hedged and the `hedge_model` the hedge was sent to. Models with a rate limit
+send `rate_limit_waited` with the `model` and the `wait_time` in seconds when a call was queued.
+Models with a retry policy send `retry_scheduled` with the `model`, the `error`, its `error_class`
+and the `delay` in seconds before each retry.
+"""
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """
+    Return whether `error` indicates that a provider rejected a request due to rate limiting.
+    """
+    status_code = getattr(error, "status_code", None) or \
+        getattr(getattr(error, "response", None), "status_code", None)
+
+    return status_code == 429 or "RateLimit" in type(error).__name__
+
 class Model:
     _provider: str
     _model_name: str
     _model: BaseChatModel
     _temperature: float | None
+    _hedging: HedgingPolicy | None
+    _cache: ModelCache | None
+    _retry: RetryPolicy | None
 
-    def __init__(self, model: str, temperature: float | None = None):
+    def __init__(
+            self,
+            model: str,
+            temperature: float | None = None,
+            hedging: HedgingPolicy | None = None,
+            cache: ModelCache | None = None,
+            http_async_client: httpx.AsyncClient | None = None,
+            retry: RetryPolicy | None = None,
+        ):
         provider, model_name = Model._parse_model_string(model)
 
         self._provider = provider
         self._model_name = model_name
         self._temperature = temperature
+        self._hedging = hedging
+        self._cache = cache
+        self._retry = retry
+
+        # Leave retrying to the retry policy rather than also retrying within the client
+        client_args = { "max_retries": 0 } if retry else {}
 
         if provider == "openai":
             args = {
@@ -29,14 +88,28 @@ class Model:
                 **({
                     "temperature": temperature,
                 } if temperature is not None and model_name not in ['o1-mini', 'o3-mini'] else {}),
+                **({ "http_async_client": http_async_client } if http_async_client else {}),
+                **client_args,
             }
             self._model = ChatOpenAI(**args)
         elif provider == "anthropic":
             self._model = ChatAnthropic(
                 model=model_name,
                 temperature=temperature,
-                max_tokens=MAX_TOKENS
+                max_tokens=MAX_TOKENS,
+                **client_args,
             )
+
+            if http_async_client:
+                # `ChatAnthropic` doesn't accept an HTTP client, so replace the client it would
+                # create with one using the shared HTTP client
+                self._model._async_client = AsyncAnthropic(
+                    api_key=self._model.anthropic_api_key.get_secret_value(),
+                    base_url=self._model.anthropic_api_url,
+                    max_retries=self._model.max_retries,
+                    default_headers=self._model.default_headers,
+                    http_client=http_async_client,
+                )
         else:
             raise ValueError(f"Unsupported model provider: {provider}")
 
@@ -68,8 +141,221 @@ class Model:
             "temperature": self._temperature,
         }
 
+    @property
+    def hedging(self) -> Optional[HedgingPolicy]:
+        """
+        The hedging policy of the model, whose counters show how often hedges were sent and won.
+        """
+        return self._hedging
+
+    @property
+    def cache(self) -> Optional[ModelCache]:
+        """
+        The cache of responses of the model, whose counters show how many requests were cached.
+        """
+        return self._cache
+
+    @property
+    def retry(self) -> Optional[RetryPolicy]:
+        """
+        The retry policy of the model, whose counters show how often calls were retried.
+        """
+        return self._retry
+
     async def ainvoke(self, messages: List[BaseMessage], **kwargs) -> BaseMessage:
-        response = await self._model.ainvoke(messages, **kwargs)
+        if self._cache:
+            return await self._ainvoke_cached(self._cache, messages, **kwargs)
+        else:
+            return await self._ainvoke_uncached(messages, **kwargs)
+
+    async def _ainvoke_cached(
+            self,
+            cache: ModelCache,
+            messages: List[BaseMessage],
+            **kwargs,
+        ) -> BaseMessage:
+        key = cache.get_key(self.info, messages, kwargs)
+        response = await anyio.to_thread.run_sync(cache.get, key)
+
+        if response is not None:
+            return response
+        elif cache.mode == "replay":
+            raise ModelCacheMissError(
+                f"No cached response for {self._provider}/{self._model_name} in {cache.path}"
+            )
+
+        response = await self._ainvoke_uncached(messages, **kwargs)
+        await anyio.to_thread.run_sync(cache.put, key, response)
+
+        return response
+
+    async def _ainvoke_uncached(self, messages: List[BaseMessage], **kwargs) -> BaseMessage:
+        if self._retry:
+            return await self._ainvoke_retried(self._retry, messages, **kwargs)
+        else:
+            return await self._ainvoke_attempt(messages, **kwargs)
+
+    async def _ainvoke_retried(
+            self,
+            policy: RetryPolicy,
+            messages: List[BaseMessage],
+            **kwargs,
+        ) -> BaseMessage:
+        policy.start_call()
+        retries: Dict[RetryErrorClass, int] = {}
+        start_time = time.monotonic()
+
+        try:
+            while True:
+                try:
+                    return await self._ainvoke_attempt(messages, **kwargs)
+                except Exception as error:
+                    error_class = policy.classify(error)
+                    if not error_class or \
+                            not policy.try_start_retry(error_class, retries.get(error_class, 0)):
+                        raise
+
+                    delay = policy.get_delay(error, sum(retries.values()))
+                    retries[error_class] = retries.get(error_class, 0) + 1
+
+                    logger.warning(
+                        f"Retrying call to {self._model_name} in {delay:.2f}s after {error_class} "
+                        f"error: {error}"
+                    )
+                    model_events.emit("retry_scheduled", {
+                        "model": self,
+                        "error": error,
+                        "error_class": error_class,
+                        "delay": delay,
+                    })
+                    await anyio.sleep(delay)
+        finally:
+            if retries:
+                self._record_retries(sum(retries.values()), time.monotonic() - start_time)
+
+    def _record_retries(self, retries: int, latency: float) -> None:
+        """
+        Add the retries of a call, and the time the call took, to the execution info of the item
+        being processed, if any.
+        """
+        item_id = current_item_id.get(None)
+        if item_id is None:
+            return
+
+        try:
+            pipeline_service.increment_item_property(item_id, "model_retries", retries)
+            pipeline_service.increment_item_property(item_id, "model_retry_latency", latency)
+        except ValueError:
+            logger.debug(f"Not recording retries for untracked item {item_id}")
+
+    async def _ainvoke_attempt(self, messages: List[BaseMessage], **kwargs) -> BaseMessage:
+        if self._hedging:
+            return await self._ainvoke_hedged(self._hedging, messages, **kwargs)
+        else:
+            return await self._ainvoke(messages, **kwargs)
+
+    async def _ainvoke_hedged(
+            self,
+            policy: HedgingPolicy,
+            messages: List[BaseMessage],
+            **kwargs,
+        ) -> BaseMessage:
+        policy.start_call()
+        delay = policy.get_delay()
+        start_time = time.monotonic()
+
+        if delay is None:
+            response = await self._ainvoke(messages, **kwargs)
+            policy.record_latency(time.monotonic() - start_time)
+            return response
+
+        hedge_model = policy.hedge_model or self
+        responses: List[tuple[BaseMessage, bool]] = []
+        errors: List[Exception] = []
+        pending = 1
+
+        async with anyio.create_task_group() as tg:
+            async def attempt(is_hedge: bool):
+                nonlocal pending
+
+                try:
+                    if is_hedge:
+                        response = await hedge_model._ainvoke(messages, **kwargs)
+                    else:
+                        response = await self._ainvoke(messages, **kwargs)
+                except anyio.get_cancelled_exc_class():
+                    if not is_hedge:
+                        # Lost to the hedge, so the latency is at least this long
+                        policy.record_latency(time.monotonic() - start_time)
+                    raise
+                except Exception as error:
+                    errors.append(error)
+                    pending -= 1
+                    if pending == 0:
+                        tg.cancel_scope.cancel()
+                    return
+
+                if not is_hedge:
+                    policy.record_latency(time.monotonic() - start_time)
+
+                responses.append((response, is_hedge))
+                tg.cancel_scope.cancel()
+
+            async def send_hedge():
+                nonlocal pending
+
+                await anyio.sleep(delay)
+                if not policy.try_start_hedge():
+                    return
+
+                logger.debug(f"Sending hedge to {hedge_model._model_name} after {delay:.2f}s")
+                model_events.emit("hedge_sent", { "model": self, "hedge_model": hedge_model })
+                pending += 1
+                tg.start_soon(attempt, True)
+
+            tg.start_soon(attempt, False)
+            tg.start_soon(send_hedge)
+
+        if not responses:
+            raise errors[0]
+
+        response, is_hedge = responses[0]
+        if is_hedge:
+            policy.record_hedge_win()
+            model_events.emit("hedge_won", { "model": self, "hedge_model": hedge_model })
+
+        return response
+
+    async def _ainvoke(self, messages: List[BaseMessage], **kwargs) -> BaseMessage:
+        limiter = rate_limiters.get(f"{self._provider}/{self._model_name}")
+        estimated_tokens = estimate_tokens(messages)
+
+        if limiter:
+            wait_time = await limiter.acquire(estimated_tokens)
+            if wait_time > 0.001:
+                model_events.emit("rate_limit_waited", { "model": self, "wait_time": wait_time })
+
+        start_time = time.monotonic()
+
+        try:
+            response = await self._model.ainvoke(messages, **kwargs)
+        except Exception as error:
+            model_events.emit("invoke_failed", {
+                "model": self,
+                "latency": time.monotonic() - start_time,
+                "error": error,
+                "rate_limited": is_rate_limit_error(error),
+            })
+            raise
+
+        model_events.emit("invoke_succeeded", {
+            "model": self,
+            "latency": time.monotonic() - start_time,
+        })
+
+        usage = getattr(response, "usage_metadata", None)
+        if limiter and usage and usage.get("total_tokens"):
+            limiter.record_usage(estimated_tokens, usage["total_tokens"])
 
         if (
             'stop_reason' in response.response_metadata and
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import logging
+import pickle
+from pathlib import Path
+from typing import Any, Dict, Literal, Optional
+
+from .sqlite_lru_cache import DEFAULT_MAX_SIZE, SqliteLruCache
+
+logger = logging.getLogger(__name__)
+
+ModelCacheMode = Literal["use", "replay", "refresh"]
+
+MODEL_CACHE_FILENAME = "model_cache.sqlite"
+"""
+The name of the file in the cache directory used for the model cache.
+"""
+
+
+class ModelCacheMissError(Exception):
+    """
+    Raised when a model cache in `replay` mode doesn't have a response for a request.
+    """
+
+
+class ModelCache(SqliteLruCache):
+    """
+    An on-disk cache of model responses, keyed by a hash of the model and the request, stored in a
+    SQLite database.
+
+    The `mode` controls how the cache is used:
+
+    - `use`: return cached responses and cache new ones (default).
+    - `replay`: only return cached responses, raising `ModelCacheMissError` for requests that
+      aren't cached, so a run can be repeated without calling any model.
+    - `refresh`: call the model for every request, replacing the cached responses.
+
+    Responses older than `max_age` seconds are treated as missing. When the responses stored exceed
+    `max_size` bytes, expired responses and then the least recently used responses are evicted.
+    The number of hits, misses and evictions since the cache was opened are kept as counters.
+
+    Each call opens its own connection, so a cache can be shared between threads and processes.
+    """
+
+    def __init__(
+            self,
+            path: Path | str,
+            mode: ModelCacheMode = "use",
+            max_size: int = DEFAULT_MAX_SIZE,
+            max_age: Optional[float] = None,
+            busy_timeout: float = 30.0,
+        ):
+        """
+        Initialize the cache, creating the database if it doesn't exist.
+
+        Args:
+            path: The path of the SQLite database.
+            mode: How to use the cache: `use`, `replay` or `refresh`.
+            max_size: The maximum number of bytes of responses to store.
+            max_age: The number of seconds a response stays valid, or `None` to keep responses until
+                they're evicted.
+            busy_timeout: The number of seconds to wait for other processes to release a lock.
+        """
+        if mode not in ("use", "replay", "refresh"):
+            raise ValueError(f"Invalid model cache mode: {mode}")
+
+        super().__init__(path, max_size=max_size, max_age=max_age, busy_timeout=busy_timeout)
+        self._mode = mode
+
+    @property
+    def mode(self) -> ModelCacheMode:
+        """How the cache is used: `use`, `replay` or `refresh`."""
+        return self._mode
+
+    def get_key(self, model_info: Dict[str, Any], messages: list, kwargs: Dict[str, Any]) -> str:
+        """
+        Get the key for a request.
+
+        Args:
+            model_info: The provider, name, temperature and arguments of the model.
+            messages: The messages sent to the model.
+            kwargs: The arguments passed with the request.
+
+        Returns:
+            str: A hash of the model and the request.
+        """
+        serialized = json.dumps(
+            {
+                "model": model_info,
+                "messages": [_serialize_message(message) for message in messages],
+                "kwargs": kwargs,
+            },
+            sort_keys=True,
+            default=repr,
+        )
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get the response cached for a key, marking it as recently used. Always returns `None` in
+        `refresh` mode.
+
+        Args:
+            key: The key of the request.
+
+        Returns:
+            Optional[Any]: The response, or `None` if it isn't cached or has expired.
+        """
+        value = self._get_value(key) if self._mode != "refresh" else None
+
+        response = None
+        if value is not None:
+            try:
+                response = pickle.loads(value)
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable model cache entry {key}: {e}")
+
+        self._record_lookup(response is not None)
+
+        return response
+
+    def put(self, key: str, response: Any) -> None:
+        """
+        Cache the response to a request, evicting expired and least recently used responses if the
+        cache grows past its maximum size. Does nothing in `replay` mode.
+
+        Args:
+            key: The key of the request.
+            response: The response of the model.
+        """
+        if self._mode == "replay":
+            return
+
+        try:
+            value = pickle.dumps(response, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.warning(f"Not caching model response {key} since it can't be pickled: {e}")
+            return
+
+        self._put_value(key, value)
+
+
+def _serialize_message(message: Any) -> Any:
+    if hasattr(message, "type") and hasattr(message, "content"):
+        return {
+            "type": message.type,
+            "content": message.content,
+            "additional_kwargs": getattr(message, "additional_kwargs", {}),
+        }
+    else:
+        return message
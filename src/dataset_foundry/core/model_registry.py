@@ -0,0 +1,225 @@
+import importlib.util
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from .hedging_policy import HedgingPolicy
+from .model import Model
+from .model_cache import ModelCache
+from .retry_policy import RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONNECTIONS = 100
+"""
+The default maximum number of open connections to each provider.
+"""
+
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+"""
+The default maximum number of idle connections kept open to each provider.
+"""
+
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+"""
+The default number of seconds an idle connection is kept open.
+"""
+
+
+class ModelRegistry:
+    """
+    Caches the models used in the process, so pipelines that pick a model per step or per item
+    reuse one `Model` for each combination of model and parameters instead of creating a new client
+    each time.
+
+    Every model of a provider shares one async HTTP client, whose pool keeps connections alive
+    between requests so they don't repeat TLS handshakes. HTTP/2 is used when the optional `h2`
+    package is installed. Call `aclose` on shutdown to close the connections.
+
+    Models given as strings to actions are resolved with `get_model`, which uses the default
+    parameters set with `set_defaults` (e.g. the temperature, hedging, cache and retry options from
+    the command line). Each of these models gets its own hedging policy, since hedging depends on
+    the latencies of the model being hedged.
+    """
+
+    def __init__(
+            self,
+            max_connections: int = DEFAULT_MAX_CONNECTIONS,
+            max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+            http2: Optional[bool] = None,
+        ):
+        """
+        Initialize the registry.
+
+        Args:
+            max_connections: The maximum number of open connections to each provider.
+            max_keepalive_connections: The maximum number of idle connections kept open to each
+                provider.
+            keepalive_expiry: The number of seconds an idle connection is kept open.
+            http2: Whether to use HTTP/2, or `None` to use it if the `h2` package is installed.
+        """
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._http2 = http2 if http2 is not None else importlib.util.find_spec("h2") is not None
+        self._models: Dict[Tuple, Model] = {}
+        self._http_clients: Dict[str, httpx.AsyncClient] = {}
+        self._defaults: Dict[str, Any] = {}
+        self._hedging: Optional[Dict[str, Any]] = None
+        self._hedging_policies: Dict[str, HedgingPolicy] = {}
+
+    def set_defaults(
+            self,
+            temperature: Optional[float] = None,
+            hedging: Optional[Dict[str, Any]] = None,
+            cache: Optional[ModelCache] = None,
+            retry: Optional[RetryPolicy] = None,
+        ) -> None:
+        """
+        Set the default parameters of models resolved with `get_model`. The retry policy and cache
+        are shared by every model created with the defaults.
+
+        Args:
+            temperature: The temperature of the models.
+            hedging: The arguments of the `HedgingPolicy` created for each model, or `None` to not
+                hedge.
+            cache: The cache of responses of the models.
+            retry: The retry policy of the models.
+        """
+        self._defaults = {
+            "temperature": temperature,
+            "cache": cache,
+            "retry": retry,
+        }
+        self._hedging = hedging
+        self._hedging_policies.clear()
+
+    def get_default(self, model: str) -> Model:
+        """
+        Get a model using the default parameters set with `set_defaults`.
+
+        Args:
+            model: The model, as a `provider/model` string.
+
+        Returns:
+            Model: The model.
+        """
+        return self.get(model, hedging=self.get_hedging_policy(model), **self._defaults)
+
+    def get_hedging_policy(
+            self,
+            model: str,
+            hedge_model: Optional[Model] = None,
+        ) -> Optional[HedgingPolicy]:
+        """
+        Get the hedging policy used by `get_default` for a model, creating it from the default
+        hedging arguments on first use.
+
+        Args:
+            model: The model, as a `provider/model` string.
+            hedge_model: The model to send hedges to when creating the policy. Defaults to the
+                model being hedged.
+
+        Returns:
+            Optional[HedgingPolicy]: The hedging policy, or `None` if hedging isn't enabled.
+        """
+        if self._hedging is None:
+            return None
+
+        if model not in self._hedging_policies:
+            self._hedging_policies[model] = HedgingPolicy(**self._hedging, hedge_model=hedge_model)
+
+        return self._hedging_policies[model]
+
+    def get(
+            self,
+            model: str,
+            temperature: Optional[float] = None,
+            hedging: Optional[HedgingPolicy] = None,
+            cache: Optional[ModelCache] = None,
+            retry: Optional[RetryPolicy] = None,
+        ) -> Model:
+        """
+        Get the model for a combination of parameters, creating it on first use.
+
+        Args:
+            model: The model, as a `provider/model` string.
+            temperature: The temperature of the model.
+            hedging: The hedging policy of the model.
+            cache: The cache of responses of the model.
+            retry: The retry policy of the model.
+
+        Returns:
+            Model: The model.
+        """
+        key = (
+            model,
+            temperature,
+            *(id(value) if value else None for value in (hedging, cache, retry)),
+        )
+
+        if key not in self._models:
+            provider, _ = Model._parse_model_string(model)
+            self._models[key] = Model(
+                model,
+                temperature=temperature,
+                hedging=hedging,
+                cache=cache,
+                retry=retry,
+                http_async_client=self.get_http_client(provider),
+            )
+            logger.debug(f"Created model {model} with temperature {temperature}")
+
+        return self._models[key]
+
+    def get_http_client(self, provider: str) -> httpx.AsyncClient:
+        """
+        Get the async HTTP client shared by the models of a provider, creating it on first use.
+
+        Args:
+            provider: The provider of the models.
+
+        Returns:
+            httpx.AsyncClient: The HTTP client.
+        """
+        client = self._http_clients.get(provider)
+
+        if not client or client.is_closed:
+            client = httpx.AsyncClient(
+                limits=self._limits,
+                http2=self._http2,
+                follow_redirects=True,
+            )
+            self._http_clients[provider] = client
+
+        return client
+
+    async def aclose(self) -> None:
+        """
+        Close the HTTP clients and forget the models created, so later calls to `get` create new
+        ones.
+        """
+        clients = list(self._http_clients.values())
+
+        self._models.clear()
+        self._http_clients.clear()
+
+        for client in clients:
+            await client.aclose()
+
+model_registry = ModelRegistry()
+
+
+def get_model(model: Model | str) -> Model:
+    """
+    Get a model from a `provider/model` string using the model registry and its default parameters,
+    or return `model` if it is already a model.
+    """
+    if isinstance(model, Model):
+        return model
+
+    return model_registry.get_default(model)
@@ -4,9 +4,13 @@ from pathlib import Path
 from typing import List, Optional, TypeAlias
 
 from ..types.dataset_action import DatasetAction
+from ..types.dataset_source import DatasetSource, is_dataset_source
 from .config import Config
 from .dataset import Dataset
 from .pipeline_service import pipeline_service
+from .rate_limiter import rate_limiters
+from .resource_pools import resource_pools
+from .sharding import parse_shard, shard_dataset, shard_source
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +28,12 @@ class Pipeline(ABC):
     The name of the pipeline.
     """
 
+    module: Optional[str] = None
+    """
+    The name of the module the pipeline was imported from, if it was loaded by module name (e.g. by
+    `run_pipeline`).
+    """
+
     metadata: dict = {}
     """
     Metadata about the pipeline.
@@ -68,6 +78,10 @@ class Pipeline(ABC):
             # TODO: Consider removing this in favor of `run_pipeline` [fastfedora 27.Feb.25]
             if isinstance(step, Pipeline):
                 dataset = await step.run(dataset, context)
+            elif is_dataset_source(step):
+                # Sources add their items to the dataset as they yield them
+                async for _ in step(dataset, context):
+                    pass
             else:
                 try:
                     await step(dataset, context)
@@ -86,6 +100,13 @@ class Pipeline(ABC):
         """
         Run the pipeline.
 
+        If this is the top-level pipeline and the `shard` parameter is set (as `INDEX/COUNT` or a
+        tuple), only the items of the dataset that belong to that shard are processed after setup.
+
+        If the last setup step is a `DatasetSource` and the pipeline supports streaming, the source
+        is passed to `execute` instead of being run during setup, so items can be processed as
+        they load.
+
         Args:
             dataset (Optional[Dataset]): The dataset to process.
             context (Optional[Context]): The parent context, if running within another pipeline.
@@ -93,6 +114,7 @@ class Pipeline(ABC):
         """
         from .context import Context # avoid circular import
 
+        is_top_level = context is None
         dataset = dataset if dataset else Dataset()
         context = context.create_child(self, dataset, params) if context \
             else Context(self, dataset, params)
@@ -100,6 +122,16 @@ class Pipeline(ABC):
         if self.name:
             logger.info(f"Running pipeline: {self.name}")
 
+        # Limits passed in as parameters take precedence over those in the pipeline config
+        resource_pools.set_limits({
+            **(self.config.get("resource_limits") or {}),
+            **(context.params.get("resource_limits") or {}),
+        })
+        rate_limiters.set_limits({
+            **(self.config.get("rate_limits") or {}),
+            **(context.params.get("rate_limits") or {}),
+        })
+
         execution_token = None
 
         # TODO: Think about whether `setup` should be considered part of the pipeline execution.
@@ -108,12 +140,26 @@ class Pipeline(ABC):
         #       this prevents listening to setup events. Another approach may be to call the
         #       pipeline service for each stage in the execution (setup, execute, teardown).
         #       [fastfedora 9.Oct.25]
-        await self.setup(dataset, context)
+        source = await self.setup(dataset, context, stream=self._supports_streaming(context))
+
+        # Nested pipelines often work on datasets derived from an item (e.g. the elements of a
+        # list), so only shard the dataset the run started with
+        shard = context.params.get("shard")
+        if shard and is_top_level:
+            shard = parse_shard(shard) if isinstance(shard, str) else shard
+            shard_dataset(dataset, shard)
+
+            if source:
+                source = shard_source(source, shard)
 
         try:
             execution_token = pipeline_service.start_pipeline(self, dataset, context)
 
-            await self.execute(dataset, context)
+            if source:
+                await self.execute(dataset, context, source)
+            else:
+                await self.execute(dataset, context)
+
             await self.teardown(dataset, context)
         finally:
             if execution_token:
@@ -125,20 +171,41 @@ class Pipeline(ABC):
             self,
             dataset: Optional[Dataset],
             context: 'Context', # type: ignore - avoid circular import
-        ) -> Dataset:
+            stream: bool = False,
+        ) -> Optional[DatasetSource]:
         """
         Setup the pipeline and prepare the dataset for processing.
 
         Args:
             dataset (Optional[Dataset]): An existing dataset to process, if any.
             context (Context): The context to use for processing.
+            stream (bool): Whether to skip the last setup step if it's a `DatasetSource` and return
+                it instead, so its items can be processed as they load.
 
         Returns:
-            Dataset: The dataset after setup.
+            Optional[DatasetSource]: The source that was skipped, if any.
         """
-        if self._setup_steps:
+        steps = self._setup_steps or []
+        source = steps[-1] if stream and steps and is_dataset_source(steps[-1]) else None
+
+        if source:
+            steps = steps[:-1]
+
+        if steps:
             logger.info("Setting up pipeline")
-            await self._do_steps(self._setup_steps, dataset, context)
+            await self._do_steps(steps, dataset, context)
+
+        return source
+
+    def _supports_streaming(
+            self,
+            context: 'Context', # type: ignore - avoid circular import
+        ) -> bool:
+        """
+        Whether `execute` can process items while a `DatasetSource` is loading them, in which case
+        the source is passed as its third argument.
+        """
+        return False
 
     @abstractmethod
     async def execute(
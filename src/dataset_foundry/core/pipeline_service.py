@@ -2,10 +2,11 @@ import logging
 import time
 import uuid
 from contextvars import Token
-from typing import Any, Callable, Dict, List, Literal, Optional, TYPE_CHECKING
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, TYPE_CHECKING
 
 from ..types.pipeline_execution_info import PipelineExecutionId, PipelineExecutionInfo
 from ..types.dataset_item_execution_info import DatasetItemExecutionInfo, DatasetItemExecutionStatus
+from ..types.stage_execution_info import StageExecutionInfo
 from .dataset_item import DatasetItem
 from .event_emitter import EventEmitter
 from .execution_context import current_pipeline_execution_id, current_item_id
@@ -20,7 +21,10 @@ PipelineServiceEventType = Literal[
     "item_removed",
     "item_updated",
     "pipeline_started",
+    "pipeline_updated",
     "pipeline_ended",
+    "stage_added",
+    "stage_updated",
 ]
 
 
@@ -53,6 +57,18 @@ class PipelineService:
                 flat.append(info)
         return flat
 
+    def get_items(self, execution_id: PipelineExecutionId) -> List[DatasetItemExecutionInfo]:
+        """
+        Get the items for a pipeline execution.
+
+        Args:
+            execution_id: The id of the pipeline execution.
+
+        Returns:
+            List[DatasetItemExecutionInfo]: The info for each item, in the order they were added.
+        """
+        return list(self._items.get(execution_id, {}).values())
+
     def start_pipeline(self, pipeline: 'Pipeline', dataset: 'Dataset', context: 'Context') -> Token:
         """
         Start a new pipeline execution.
@@ -65,6 +81,11 @@ class PipelineService:
         Returns:
             Token: The token used to track the pipeline execution.
         """
+        # Pipelines nested within an item are part of the work of the pipeline processing the item,
+        # so they're scheduled with it rather than competing with it for resources
+        parent = self._pipelines.get(current_pipeline_execution_id.get(None)) \
+            if current_item_id.get(None) else None
+
         execution_id = str(uuid.uuid4())
         execution_token = current_pipeline_execution_id.set(execution_id)
         self._pipelines[execution_id] = PipelineExecutionInfo(
@@ -74,6 +95,11 @@ class PipelineService:
             dataset=dataset,
             context=context,
             start_time=time.time(),
+            scheduling_group=parent.scheduling_group if parent else execution_id,
+            scheduling_weight=parent.scheduling_weight if parent else float(
+                context.params.get("scheduling_weight") or
+                pipeline.config.get("scheduling_weight") or 1.0
+            ),
         )
 
         for item in dataset.items:
@@ -105,12 +131,85 @@ class PipelineService:
             info.end_time = time.time()
             self._emit("pipeline_ended", { "execution_id": execution_id })
 
-    def start_item(self, item: DatasetItem) -> DatasetItemExecutionInfo:
+    def get_scheduling_flow(self) -> Tuple[Optional[PipelineExecutionId], float]:
+        """
+        Get the flow that resources acquired by the calling task are shared under.
+
+        Top-level pipelines and pipelines started by dataset actions (e.g. `run_pipeline`) each
+        form their own flow, while pipelines started within an item join the flow of the pipeline
+        processing the item.
+
+        Returns:
+            Tuple[Optional[PipelineExecutionId], float]: The id of the execution that started the
+                flow, or `None` outside a pipeline, and the weight of the flow.
+        """
+        info = self._pipelines.get(current_pipeline_execution_id.get(None))
+        if not info:
+            return None, 1.0
+
+        return info.scheduling_group, info.scheduling_weight
+
+    def update_pipeline(self, execution_id: PipelineExecutionId, values: Dict[str, Any]) -> None:
+        """
+        Update the info for a pipeline execution.
+
+        Args:
+            execution_id: The id of the pipeline execution.
+            values: The values to update. Values that aren't attributes of the info are stored in
+                its metadata.
+
+        Raises:
+            ValueError: If no pipeline execution exists with the given id.
+        """
+        info = self._pipelines.get(execution_id)
+        if not info:
+            raise ValueError(f"Pipeline execution with ID {execution_id} not found")
+
+        changed_fields: List[str] = []
+        for key, value in values.items():
+            if hasattr(info, key):
+                setattr(info, key, value)
+                changed_fields.append(key)
+            else:
+                info.metadata[key] = value
+                changed_fields.append(f"metadata.{key}")
+
+        if changed_fields:
+            self._emit("pipeline_updated", {
+                "execution_id": execution_id,
+                "pipeline": info,
+                "fields": changed_fields,
+            })
+
+    def add_item(self, item: DatasetItem) -> DatasetItemExecutionInfo:
+        """
+        Start tracking an item added to the dataset of the active pipeline execution after it
+        started, such as an item loaded by a `DatasetSource` while other items are processed.
+
+        Args:
+            item: The item to track.
+
+        Returns:
+            DatasetItemExecutionInfo: The info for the item.
+
+        Raises:
+            ValueError: If no active pipeline execution exists.
+        """
+        execution_id = current_pipeline_execution_id.get(None)
+        if not execution_id:
+            raise ValueError("No pipeline execution is currently active")
+
+        return self._get_item_info(execution_id, item) or self._add_item_info(execution_id, item)
+
+    def start_item(self, item: DatasetItem, bind_context: bool = True) -> DatasetItemExecutionInfo:
         """
         Start tracking an item for the active pipeline execution.
 
         Args:
             item: The item to track.
+            bind_context: Whether to make `item` the current item for the calling task. Pass
+                `False` when the item will be processed across several tasks, in which case each
+                task is responsible for setting `current_item_id` itself.
 
         Returns:
             DatasetItemExecutionInfo: The info for the item.
@@ -131,7 +230,7 @@ class PipelineService:
 
         info.status = "running"
         info.start_time = info.start_time or time.time()
-        info.execution_token = current_item_id.set(item.id)
+        info.execution_token = current_item_id.set(item.id) if bind_context else None
 
         self._emit("item_updated", {
             "item": info,
@@ -151,14 +250,15 @@ class PipelineService:
         Raises:
             ValueError: If `item` is not actively tracked.
         """
-        if not info.execution_token:
+        if info.status != "running":
             raise ValueError("`item` must be an actively tracked item")
 
         info.status = status
         info.end_time = time.time()
 
-        current_item_id.reset(info.execution_token)
-        info.execution_token = None
+        if info.execution_token:
+            current_item_id.reset(info.execution_token)
+            info.execution_token = None
 
         self._emit("item_updated", {
             "item": info,
@@ -210,6 +310,79 @@ class PipelineService:
 
         self.update_item(item_id, { property: getattr(info, property, []) + [value] })
 
+    def increment_item_property(self, item_id: str, property: str, amount: float) -> None:
+        """
+        Add an amount to a numeric property in the info for an item.
+
+        Args:
+            item_id: The id of the item.
+            property: The property to add to, which starts at 0 if it isn't set.
+            amount: The amount to add.
+
+        Raises:
+            ValueError: If the item is not actively tracked.
+        """
+        info = self._find_info_by_id(item_id)
+        if not info:
+            raise ValueError(f"Item with ID {item_id} not found")
+
+        value = getattr(info, property) if hasattr(info, property) else info.metadata.get(property)
+        self.update_item(item_id, { property: (value or 0) + amount })
+
+    def add_stage(self, name: str, workers: int, buffer_size: int) -> StageExecutionInfo:
+        """
+        Start tracking a stage of the active pipeline execution.
+
+        Args:
+            name: The name of the stage.
+            workers: The number of workers processing items in the stage.
+            buffer_size: The number of items that can wait in the stage's input queue.
+
+        Returns:
+            StageExecutionInfo: The info for the stage.
+
+        Raises:
+            ValueError: If no active pipeline execution exists.
+        """
+        execution_id = current_pipeline_execution_id.get(None)
+        info = self._pipelines.get(execution_id)
+        if not info:
+            raise ValueError("No pipeline execution is currently active")
+
+        stage = StageExecutionInfo(
+            name=name,
+            index=len(info.stages),
+            pipeline_execution_id=execution_id,
+            workers=workers,
+            buffer_size=buffer_size,
+            start_time=time.time(),
+        )
+        info.stages.append(stage)
+
+        self._emit("stage_added", { "execution_id": execution_id, "stage": stage })
+
+        return stage
+
+    def update_stage(self, stage: StageExecutionInfo, values: Dict[str, Any]) -> None:
+        """
+        Update the info for a stage.
+
+        Args:
+            stage: The info for the stage.
+            values: The values to update.
+        """
+        changed_fields: List[str] = []
+        for key, value in values.items():
+            setattr(stage, key, value)
+            changed_fields.append(key)
+
+        if changed_fields:
+            self._emit("stage_updated", {
+                "execution_id": stage.pipeline_execution_id,
+                "stage": stage,
+                "fields": changed_fields,
+            })
+
     def subscribe(
         self,
         event_type: PipelineServiceEventType,
@@ -302,6 +475,16 @@ class PipelineService:
             if fields and not (set(fields) & changed):
                 return False
 
+        if event_type in ("pipeline_updated", "stage_added", "stage_updated"):
+            execution_id = filter.get("execution_id")
+            if execution_id and execution_id != payload.get("execution_id"):
+                return False
+
+            fields = filter.get("fields")
+            changed = set(payload.get("fields", []))
+            if fields and not (set(fields) & changed):
+                return False
+
         # No filters for pipeline events currently
         return True
 
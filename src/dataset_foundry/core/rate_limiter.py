@@ -0,0 +1,282 @@
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+import anyio
+
+logger = logging.getLogger(__name__)
+
+RateLimit = Dict[str, Optional[float]] | str | None
+
+CHARS_PER_TOKEN = 4
+"""
+The number of characters assumed per token when estimating the size of a request.
+"""
+
+
+class TokenBucket:
+    """
+    A bucket that refills at a constant rate up to its capacity. The level can go negative when more
+    is taken than was available, which delays later callers until the debt has been refilled.
+    """
+
+    def __init__(self, per_minute: float):
+        """
+        Initialize the bucket, starting full.
+
+        Args:
+            per_minute: The capacity of the bucket, refilled evenly over a minute.
+        """
+        self.capacity = per_minute
+        self.level = per_minute
+        self._updated = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        """The number of units refilled each second."""
+        return self.capacity / 60
+
+    def refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def get_delay(self, amount: float) -> float:
+        """
+        Get the number of seconds until `amount` is available, capped at the capacity of the bucket
+        so large requests can still be sent.
+        """
+        self.refill()
+        deficit = min(amount, self.capacity) - self.level
+        return deficit / self.rate if deficit > 0 else 0.0
+
+
+class RateLimiter:
+    """
+    Limits the requests and estimated tokens sent to a model per minute using token buckets.
+
+    Callers wait in the order they arrive until both buckets have room, rather than failing. Since
+    the tokens used by a request aren't known until it returns, callers pass an estimate when
+    acquiring and then report the actual usage, so the bucket is corrected for later requests.
+    """
+
+    def __init__(
+            self,
+            requests_per_minute: Optional[float] = None,
+            tokens_per_minute: Optional[float] = None,
+        ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            requests_per_minute: The maximum number of requests per minute, or `None` for no limit.
+            tokens_per_minute: The maximum number of tokens per minute, or `None` for no limit.
+        """
+        self._lock = anyio.Lock()
+        self._requests: Optional[TokenBucket] = None
+        self._tokens: Optional[TokenBucket] = None
+
+        self.requests = 0
+        self.waits = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+
+        self.set_limits(requests_per_minute, tokens_per_minute)
+
+    @property
+    def requests_per_minute(self) -> Optional[float]:
+        """The maximum number of requests per minute, or `None` for no limit."""
+        return self._requests.capacity if self._requests else None
+
+    @property
+    def tokens_per_minute(self) -> Optional[float]:
+        """The maximum number of tokens per minute, or `None` for no limit."""
+        return self._tokens.capacity if self._tokens else None
+
+    def set_limits(
+            self,
+            requests_per_minute: Optional[float],
+            tokens_per_minute: Optional[float],
+        ) -> None:
+        """
+        Set the limits of the rate limiter. Changing a limit starts its bucket full.
+
+        Args:
+            requests_per_minute: The maximum number of requests per minute, or `None` for no limit.
+            tokens_per_minute: The maximum number of tokens per minute, or `None` for no limit.
+        """
+        if requests_per_minute != self.requests_per_minute:
+            self._requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        if tokens_per_minute != self.tokens_per_minute:
+            self._tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+    async def acquire(self, tokens: int = 0) -> float:
+        """
+        Wait until a request of an estimated number of tokens can be sent, then take it from the
+        buckets.
+
+        Args:
+            tokens: The estimated number of tokens the request will use.
+
+        Returns:
+            float: The number of seconds spent waiting.
+        """
+        start_time = time.monotonic()
+
+        # Hold the lock while waiting so callers are served in the order they arrived
+        async with self._lock:
+            while (delay := self._get_delay(tokens)) > 0:
+                await anyio.sleep(delay)
+
+            if self._requests:
+                self._requests.level -= 1
+            if self._tokens:
+                self._tokens.level -= tokens
+
+        wait_time = time.monotonic() - start_time
+
+        self.requests += 1
+        if wait_time > 0.001:
+            self.waits += 1
+            self.total_wait_time += wait_time
+            self.max_wait_time = max(self.max_wait_time, wait_time)
+
+        return wait_time
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """
+        Correct the token bucket once the actual number of tokens used by a request is known.
+
+        Args:
+            estimated_tokens: The number of tokens estimated when the request was acquired.
+            actual_tokens: The number of tokens the request used.
+        """
+        if self._tokens:
+            self._tokens.refill()
+            self._tokens.level -= actual_tokens - estimated_tokens
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Get the counters of the rate limiter.
+
+        Returns:
+            Dict[str, float]: The number of `requests` acquired, the number of `waits` that were
+                delayed, and the `total_wait_time` and `max_wait_time` in seconds.
+        """
+        return {
+            "requests": self.requests,
+            "waits": self.waits,
+            "total_wait_time": self.total_wait_time,
+            "max_wait_time": self.max_wait_time,
+        }
+
+    def _get_delay(self, tokens: int) -> float:
+        return max(
+            self._requests.get_delay(1) if self._requests else 0.0,
+            self._tokens.get_delay(tokens) if self._tokens else 0.0,
+        )
+
+
+class RateLimiters:
+    """
+    Rate limiters for each `provider/model`, shared by every item and pipeline running in the
+    process, so the limits apply to the total traffic sent to each model.
+
+    Models without limits aren't rate limited.
+    """
+
+    def __init__(self):
+        """
+        Initialize the rate limiters.
+        """
+        self._limiters: Dict[str, RateLimiter] = {}
+
+    @property
+    def limits(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """Get the limits that have been set for each model."""
+        return {
+            model: {
+                "requests_per_minute": limiter.requests_per_minute,
+                "tokens_per_minute": limiter.tokens_per_minute,
+            }
+            for model, limiter in self._limiters.items()
+        }
+
+    def set_limits(self, limits: Optional[Dict[str, RateLimit]]) -> None:
+        """
+        Set the limits for multiple models.
+
+        Args:
+            limits: A mapping of `provider/model` strings to their limits (see `set_limit`).
+        """
+        for model, limit in (limits or {}).items():
+            self.set_limit(model, limit)
+
+    def set_limit(self, model: str, limit: RateLimit) -> None:
+        """
+        Set the limit for a model. If the model is in use, the new limit applies to the next
+        request.
+
+        Args:
+            model: The model, as a `provider/model` string.
+            limit: A dict with `requests_per_minute` and `tokens_per_minute` keys, or a string in
+                the format `RPM[:TPM]` (e.g. `500:200000`). A limit of `None`, `0` or an empty
+                string removes the limit.
+        """
+        requests_per_minute, tokens_per_minute = _parse_limit(limit)
+
+        if (requests_per_minute or 0) < 0 or (tokens_per_minute or 0) < 0:
+            raise ValueError(f"The rate limit for model '{model}' must not be negative")
+
+        limiter = self._limiters.get(model)
+        if limiter:
+            limiter.set_limits(requests_per_minute, tokens_per_minute)
+        else:
+            self._limiters[model] = RateLimiter(requests_per_minute, tokens_per_minute)
+
+        logger.debug(
+            f"Set rate limit for model '{model}' to {requests_per_minute} requests and "
+            f"{tokens_per_minute} tokens per minute"
+        )
+
+    def get(self, model: str) -> Optional[RateLimiter]:
+        """
+        Get the rate limiter for a model.
+
+        Args:
+            model: The model, as a `provider/model` string.
+
+        Returns:
+            Optional[RateLimiter]: The rate limiter, or `None` if no limit has been set for it.
+        """
+        return self._limiters.get(model)
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get the counters of the rate limiter for each model (see `RateLimiter.get_stats`).
+        """
+        return { model: limiter.get_stats() for model, limiter in self._limiters.items() }
+
+rate_limiters = RateLimiters()
+
+
+def estimate_tokens(messages: List[Any]) -> int:
+    """
+    Estimate the number of tokens in a list of messages from the length of their content.
+    """
+    return sum(
+        len(str(getattr(message, "content", message))) // CHARS_PER_TOKEN + 4
+        for message in messages
+    )
+
+
+def _parse_limit(limit: RateLimit) -> tuple[Optional[float], Optional[float]]:
+    if isinstance(limit, dict):
+        values = (limit.get("requests_per_minute"), limit.get("tokens_per_minute"))
+    elif limit:
+        parts = str(limit).split(":")
+        values = (parts[0], parts[1] if len(parts) > 1 else None)
+    else:
+        values = (None, None)
+
+    return tuple(float(value) if value not in (None, "", 0, "0") else None for value in values)
@@ -0,0 +1,120 @@
+import logging
+import math
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+from .fair_limiter import FairLimiter
+from .pipeline_service import pipeline_service
+
+logger = logging.getLogger(__name__)
+
+ResourceLimit = int | float | str | None
+
+
+class ResourcePools:
+    """
+    Named pools of capacity (e.g. `llm`, `container`, `agent`, `cpu`) that item actions acquire
+    around their expensive sections. This lets heavy steps be capped independently of how many items
+    are processed concurrently, while cheap steps keep flowing.
+
+    Pools are created on first use and are unlimited unless a limit has been set for them.
+
+    Pools are shared by every pipeline running in the process. When a pool is full, its slots are
+    shared between the pipelines waiting for it using weighted fair queuing, so a pipeline that
+    started first can't take the whole pool. Pipelines get a weight of 1 unless the
+    `scheduling_weight` parameter or config value is set, and pipelines nested within an item share
+    the slots of the pipeline processing that item (see `PipelineService.get_scheduling_flow`).
+    """
+
+    def __init__(self):
+        """
+        Initialize the resource pools.
+        """
+        self._limits: Dict[str, float] = {}
+        self._limiters: Dict[str, FairLimiter] = {}
+
+    @property
+    def limits(self) -> Dict[str, float]:
+        """Get the limits that have been set for each pool."""
+        return dict(self._limits)
+
+    def set_limits(self, limits: Optional[Dict[str, ResourceLimit]]) -> None:
+        """
+        Set the limits for multiple pools.
+
+        Args:
+            limits: A mapping of pool names to the maximum number of concurrent holders. A value of
+                `None`, `0` or an empty string removes the limit for that pool.
+        """
+        for name, limit in (limits or {}).items():
+            self.set_limit(name, limit)
+
+    def set_limit(self, name: str, limit: ResourceLimit) -> None:
+        """
+        Set the limit for a pool. If the pool is in use, the new limit applies immediately to any
+        waiting holders.
+
+        Args:
+            name: The name of the pool.
+            limit: The maximum number of concurrent holders. A value of `None`, `0` or an empty
+                string removes the limit for the pool.
+        """
+        total_tokens = int(limit) if limit not in (None, "", 0, "0") else math.inf
+
+        if total_tokens < 0:
+            raise ValueError(f"The limit for resource pool '{name}' must not be negative")
+
+        self._limits[name] = total_tokens
+
+        if name in self._limiters:
+            self._limiters[name].total_tokens = total_tokens
+
+        logger.debug(f"Set limit for resource pool '{name}' to {total_tokens}")
+
+    def get_usage(self, name: str) -> Dict[str, float]:
+        """
+        Get the usage of a pool.
+
+        Args:
+            name: The name of the pool.
+
+        Returns:
+            A dict with the number of `borrowed` and `total` tokens and the number of `waiting`
+            holders for the pool.
+        """
+        limiter = self._limiters.get(name)
+        if not limiter:
+            return { "borrowed": 0, "total": self._limits.get(name, math.inf), "waiting": 0 }
+
+        return limiter.get_usage()
+
+    @asynccontextmanager
+    async def acquire(self, name: Optional[str]) -> AsyncIterator[None]:
+        """
+        Hold a slot in the named pool for the duration of the context. If `name` is empty, no pool
+        is acquired.
+
+        Args:
+            name: The name of the pool to acquire.
+        """
+        if not name:
+            yield
+            return
+
+        limiter = self._get_limiter(name)
+        flow, weight = pipeline_service.get_scheduling_flow()
+
+        await limiter.acquire(flow, weight)
+        try:
+            yield
+        finally:
+            limiter.release()
+
+    def _get_limiter(self, name: str) -> FairLimiter:
+        limiter = self._limiters.get(name)
+        if not limiter:
+            limiter = FairLimiter(self._limits.get(name, math.inf))
+            self._limiters[name] = limiter
+        return limiter
+
+resource_pools = ResourcePools()
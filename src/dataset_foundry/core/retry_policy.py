@@ -0,0 +1,183 @@
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Literal, Optional
+
+import httpx
+
+RetryErrorClass = Literal["rate_limit", "server", "connection"]
+
+DEFAULT_RETRY_BUDGETS: Dict[RetryErrorClass, int] = {
+    "rate_limit": 5,
+    "server": 3,
+    "connection": 3,
+}
+"""
+The default maximum number of times a call is retried for each class of error.
+"""
+
+_CONNECTION_ERROR_NAMES = ("APIConnectionError", "APITimeoutError")
+
+
+class RetryPolicy:
+    """
+    A policy for retrying model calls that fail with transient errors: rate limits (429), server
+    errors (5xx) and connection errors. Other errors are raised immediately.
+
+    Retries wait using exponential backoff with full jitter, starting at `base_delay` seconds and
+    capped at `max_delay`, unless the provider sent a `Retry-After` header, in which case that delay
+    is used (up to `max_retry_after`).
+
+    Each call can be retried up to the budget for the class of error it failed with. Across calls,
+    retries are capped at `min_retries` plus `max_retry_ratio` of the calls made, so that when a
+    provider is down, retries can't multiply the load sent to it.
+
+    The number of calls, retries per class of error and retries refused by the budget are kept as
+    counters.
+    """
+
+    def __init__(
+            self,
+            budgets: Optional[Dict[RetryErrorClass, int]] = None,
+            base_delay: float = 1.0,
+            max_delay: float = 60.0,
+            max_retry_after: float = 300.0,
+            max_retry_ratio: float = 0.2,
+            min_retries: int = 10,
+        ):
+        """
+        Initialize the policy.
+
+        Args:
+            budgets: The maximum number of retries of a call for each class of error. Classes not
+                given use `DEFAULT_RETRY_BUDGETS`.
+            base_delay: The number of seconds to back off before the first retry.
+            max_delay: The maximum number of seconds to back off between retries.
+            max_retry_after: The maximum number of seconds to wait when honouring `Retry-After`.
+            max_retry_ratio: The maximum number of retries as a fraction of the calls made, beyond
+                `min_retries`.
+            min_retries: The number of retries allowed regardless of the number of calls made.
+        """
+        self._budgets = { **DEFAULT_RETRY_BUDGETS, **(budgets or {}) }
+        self._base_delay = max(0.0, float(base_delay))
+        self._max_delay = max(self._base_delay, float(max_delay))
+        self._max_retry_after = float(max_retry_after)
+        self._max_retry_ratio = max(0.0, float(max_retry_ratio))
+        self._min_retries = max(0, int(min_retries))
+
+        self.calls = 0
+        self.retries: Dict[RetryErrorClass, int] = dict.fromkeys(self._budgets, 0)
+        self.refused = 0
+
+    def classify(self, error: BaseException) -> Optional[RetryErrorClass]:
+        """
+        Get the class of a transient error.
+
+        Args:
+            error: The error raised by a call.
+
+        Returns:
+            Optional[RetryErrorClass]: The class of the error, or `None` if it shouldn't be retried.
+        """
+        status_code = _get_status_code(error)
+
+        if status_code == 429 or "RateLimit" in type(error).__name__:
+            return "rate_limit"
+        elif status_code is not None and 500 <= status_code < 600:
+            return "server"
+        elif isinstance(error, (ConnectionError, TimeoutError, httpx.TransportError)) or \
+                type(error).__name__ in _CONNECTION_ERROR_NAMES:
+            return "connection"
+        else:
+            return None
+
+    def get_delay(self, error: BaseException, retries: int) -> float:
+        """
+        Get the number of seconds to wait before retrying a call.
+
+        Args:
+            error: The error raised by the last attempt.
+            retries: The number of times the call has already been retried.
+
+        Returns:
+            float: The delay from the `Retry-After` header of the error, if any, or otherwise a
+                random delay of up to `base_delay * 2 ** retries`, capped at `max_delay`.
+        """
+        retry_after = _get_retry_after(error)
+        if retry_after is not None:
+            return min(retry_after, self._max_retry_after)
+
+        return random.uniform(0, min(self._max_delay, self._base_delay * 2 ** retries))
+
+    def start_call(self) -> None:
+        """
+        Count a call that may be retried.
+        """
+        self.calls += 1
+
+    def try_start_retry(self, error_class: RetryErrorClass, retries: int) -> bool:
+        """
+        Count a retry, if it stays within the budget for its class of error and the global budget.
+
+        Args:
+            error_class: The class of the error the call failed with.
+            retries: The number of times the call has already been retried for this class of error.
+
+        Returns:
+            bool: Whether the call can be retried.
+        """
+        if retries >= self._budgets.get(error_class, 0):
+            return False
+
+        if sum(self.retries.values()) + 1 > self._min_retries + self._max_retry_ratio * self.calls:
+            self.refused += 1
+            return False
+
+        self.retries[error_class] = self.retries.get(error_class, 0) + 1
+        return True
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Get the counters of the policy.
+
+        Returns:
+            Dict[str, float]: The number of `calls`, the number of `retries` in total and for each
+                class of error (e.g. `rate_limit_retries`), the number of retries `refused` by the
+                global budget, and the `retry_rate` (retries per call).
+        """
+        retries = sum(self.retries.values())
+
+        return {
+            "calls": self.calls,
+            "retries": retries,
+            **{ f"{error_class}_retries": count for error_class, count in self.retries.items() },
+            "refused": self.refused,
+            "retry_rate": retries / self.calls if self.calls else 0.0,
+        }
+
+
+def _get_status_code(error: BaseException) -> Optional[int]:
+    return getattr(error, "status_code", None) or \
+        getattr(getattr(error, "response", None), "status_code", None)
+
+
+def _get_retry_after(error: BaseException) -> Optional[float]:
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    retry_after = headers.get("retry-after")
+
+    try:
+        if retry_after_ms:
+            return max(0.0, float(retry_after_ms) / 1000)
+        elif retry_after:
+            return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
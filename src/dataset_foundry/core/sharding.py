@@ -0,0 +1,106 @@
+import hashlib
+import logging
+from typing import AsyncIterator, Tuple
+
+from ..types.dataset_source import DatasetSource
+from .dataset import Dataset
+from .dataset_item import DatasetItem
+
+logger = logging.getLogger(__name__)
+
+Shard = Tuple[int, int]
+"""
+A shard of a dataset, given as the zero-based index of the shard and the total number of shards.
+"""
+
+def parse_shard(value: str) -> Shard:
+    """
+    Parse a shard given in the format `INDEX/COUNT` (e.g. `0/4`).
+
+    Args:
+        value (str): The shard to parse.
+
+    Returns:
+        Shard: The index of the shard and the number of shards.
+
+    Raises:
+        ValueError: If `value` is not a valid shard.
+    """
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{value}'; expected INDEX/COUNT (e.g. 0/4)")
+
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard '{value}'; INDEX must be between 0 and COUNT - 1")
+
+    return index, count
+
+def get_shard_index(item_id: str, count: int) -> int:
+    """
+    Get the shard an item belongs to.
+
+    Uses a hash of the item id rather than Python's `hash()`, which is randomized per process, so
+    every machine assigns an item to the same shard regardless of the order items were loaded in.
+
+    Args:
+        item_id (str): The id of the item.
+        count (int): The number of shards.
+
+    Returns:
+        int: The index of the shard the item belongs to.
+    """
+    digest = hashlib.sha256(str(item_id).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count
+
+def shard_dataset(dataset: Dataset, shard: Shard) -> None:
+    """
+    Remove the items that don't belong to a shard from a dataset, keeping the order of the rest.
+
+    Args:
+        dataset (Dataset): The dataset to shard.
+        shard (Shard): The shard to keep.
+    """
+    index, count = shard
+    total = len(dataset.items)
+
+    dataset.items[:] = [
+        item for item_index, item in enumerate(dataset.items)
+        if get_shard_index(item.id if item.id is not None else item_index, count) == index
+    ]
+
+    logger.info(f"Processing shard {index}/{count}: {len(dataset.items)} of {total} items")
+
+def shard_source(source: DatasetSource, shard: Shard) -> DatasetSource:
+    """
+    Wrap a dataset source so only the items that belong to a shard are kept, removing the rest
+    from the dataset as they load.
+
+    Args:
+        source (DatasetSource): The source to shard.
+        shard (Shard): The shard to keep.
+
+    Returns:
+        DatasetSource: A source yielding the items of `source` in the shard.
+    """
+    index, count = shard
+
+    async def sharded_source(dataset: Dataset, context) -> AsyncIterator[DatasetItem]:
+        kept = 0
+        total = 0
+
+        async for item in source(dataset, context):
+            item_index = len(dataset.items) - 1
+            total += 1
+
+            if get_shard_index(item.id if item.id is not None else item_index, count) == index:
+                kept += 1
+                yield item
+            elif dataset.items and dataset.items[-1] is item:
+                dataset.items.pop()
+            else:
+                dataset.items.remove(item)
+
+        logger.info(f"Processed shard {index}/{count}: {kept} of {total} loaded items")
+
+    return sharded_source
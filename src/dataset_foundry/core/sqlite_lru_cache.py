@@ -0,0 +1,213 @@
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 1024 * 1024 * 1024
+"""
+The default maximum number of bytes of values stored in a cache.
+"""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_by_last_used ON entries (last_used);
+CREATE INDEX IF NOT EXISTS entries_by_created_at ON entries (created_at);
+"""
+
+
+class SqliteLruCache:
+    """
+    An on-disk cache of serialized values, keyed by strings, stored in a SQLite database. Subclasses
+    decide how values are serialized and read and write them with `_get_value` and `_put_value`.
+
+    Values older than `max_age` seconds are treated as missing. When the values stored exceed
+    `max_size` bytes, expired values and then the least recently used values are evicted. The
+    number of hits, misses and evictions since the cache was opened are kept as counters.
+
+    Each call opens its own connection, so a cache can be shared between threads and processes.
+    """
+
+    def __init__(
+            self,
+            path: Path | str,
+            max_size: int = DEFAULT_MAX_SIZE,
+            max_age: Optional[float] = None,
+            busy_timeout: float = 30.0,
+        ):
+        """
+        Initialize the cache, creating the database if it doesn't exist.
+
+        Args:
+            path: The path of the SQLite database.
+            max_size: The maximum number of bytes of values to store.
+            max_age: The number of seconds a value stays valid, or `None` to keep values until
+                they're evicted.
+            busy_timeout: The number of seconds to wait for other processes to release a lock.
+        """
+        self._path = Path(path)
+        self._max_size = max_size
+        self._max_age = max_age
+        self._busy_timeout = busy_timeout
+        self._counter_lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.executescript(_SCHEMA)
+
+    @property
+    def path(self) -> Path:
+        """The path of the SQLite database."""
+        return self._path
+
+    @property
+    def max_size(self) -> int:
+        """The maximum number of bytes of values stored in the cache."""
+        return self._max_size
+
+    @property
+    def max_age(self) -> Optional[float]:
+        """The number of seconds a value stays valid, or `None` if values don't expire."""
+        return self._max_age
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get the counters and current size of the cache.
+
+        Returns:
+            Dict[str, int]: The `hits`, `misses` and `evictions` since the cache was opened, along
+                with the number of `entries` and total `size` in bytes of the cache.
+        """
+        with self._connect() as connection:
+            entries, size = connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": entries,
+            "size": size,
+        }
+
+    def clear(self) -> None:
+        """
+        Remove every entry from the cache.
+        """
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM entries")
+
+    def _get_value(self, key: str) -> Optional[bytes]:
+        """
+        Get the value stored for a key, marking it as recently used. Doesn't update the counters,
+        since only the subclass knows whether the value can be read (see `_record_lookup`).
+        """
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT value FROM entries WHERE key = ? AND created_at >= ?",
+                (key, self._get_expiry_time()),
+            ).fetchone()
+
+            if row:
+                connection.execute(
+                    "UPDATE entries SET last_used = ? WHERE key = ?",
+                    (time.time(), key),
+                )
+
+        return row[0] if row else None
+
+    def _put_value(self, key: str, value: bytes) -> None:
+        """
+        Store the value for a key, evicting expired and least recently used values if the cache
+        grows past its maximum size.
+        """
+        if len(value) > self._max_size:
+            logger.debug(f"Not caching {key} since its {len(value)} bytes exceed the cache size")
+            return
+
+        now = time.time()
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now, now),
+            )
+            evicted = self._evict(connection)
+
+        if evicted:
+            with self._counter_lock:
+                self.evictions += evicted
+
+    def _record_lookup(self, hit: bool) -> None:
+        with self._counter_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _get_expiry_time(self) -> float:
+        return time.time() - self._max_age if self._max_age else 0.0
+
+    def _evict(self, connection: sqlite3.Connection) -> int:
+        (size,) = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if size <= self._max_size:
+            return 0
+
+        evicted = 0
+        if self._max_age:
+            cursor = connection.execute(
+                "DELETE FROM entries WHERE created_at < ?",
+                (self._get_expiry_time(),),
+            )
+            evicted = cursor.rowcount
+            (size,) = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+
+        rows = connection.execute("SELECT key, size FROM entries ORDER BY last_used").fetchall()
+        for key, entry_size in rows:
+            if size <= self._max_size:
+                break
+
+            connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+            size -= entry_size
+            evicted += 1
+
+        return evicted
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(
+            self._path,
+            timeout=self._busy_timeout,
+            isolation_level=None,
+        )
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._connect() as connection:
+            # Take the write lock up front so concurrent evictions don't overlap
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
@@ -0,0 +1,358 @@
+import logging
+import pickle
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Optional, Tuple
+
+from ..utils.concurrency.pickle_values import pickle_values
+from .dataset_item import DatasetItem
+
+logger = logging.getLogger(__name__)
+
+WorkQueueState = Literal["open", "closed"]
+
+WorkItemStatus = Literal["pending", "leased", "success", "error", "timeout"]
+
+WORK_QUEUE_FILENAME = "work_queue.sqlite"
+"""
+The name of the file in the log directory used for the work queue when no path is given.
+"""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value BLOB
+);
+CREATE TABLE IF NOT EXISTS items (
+    id TEXT PRIMARY KEY,
+    item_index INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker_id TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    version INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_by_status ON items (status, item_index);
+CREATE INDEX IF NOT EXISTS items_by_version ON items (version);
+"""
+
+# Every change to an item gets a version higher than any before it, so the coordinator can find
+# changes without relying on the clocks of the hosts running workers being in sync
+_NEXT_VERSION = "(SELECT COALESCE(MAX(version), 0) + 1 FROM items)"
+
+
+@dataclass
+class WorkItem:
+    """An item leased from a work queue."""
+    id: str
+    index: int
+    data: Dict[str, Any]
+    attempts: int
+
+
+@dataclass
+class WorkItemResult:
+    """The current state of an item in a work queue."""
+    id: str
+    index: int
+    status: WorkItemStatus
+    data: Dict[str, Any]
+    worker_id: Optional[str]
+    error: Optional[str]
+    version: int
+
+
+class WorkQueue:
+    """
+    A durable queue of dataset items stored in a SQLite database, shared by a coordinator that
+    publishes items and any number of worker processes that lease and process them.
+
+    Workers lease one item at a time. A lease expires unless it's renewed, so items held by a
+    worker that crashed are handed to another worker, up to `max_attempts` times. Results are only
+    accepted from the worker currently holding the lease.
+
+    Each call opens its own connection, so a queue can be shared between threads and processes.
+    Workers on several hosts can share a queue stored on a shared filesystem, as long as the
+    filesystem supports the file locking SQLite relies on.
+    """
+
+    def __init__(self, path: Path | str, max_attempts: int = 3, busy_timeout: float = 30.0):
+        """
+        Initialize the work queue, creating the database if it doesn't exist.
+
+        Args:
+            path: The path of the SQLite database.
+            max_attempts: The number of times an item can be leased before it's marked as an error.
+            busy_timeout: The number of seconds to wait for other processes to release a lock.
+        """
+        self._path = Path(path)
+        self._max_attempts = max_attempts
+        self._busy_timeout = busy_timeout
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.executescript(_SCHEMA)
+
+    @property
+    def path(self) -> Path:
+        """The path of the SQLite database."""
+        return self._path
+
+    def publish(
+            self,
+            items: Iterable[Tuple[int, DatasetItem]],
+            metadata: Optional[Dict[str, Any]] = None,
+        ) -> int:
+        """
+        Replace the contents of the queue with `items` and open it to workers.
+
+        Args:
+            items: The items to publish, with their index in the dataset.
+            metadata: Values workers need to process the items (e.g. the pipeline name and params).
+                Values that can't be pickled are dropped.
+
+        Returns:
+            int: The number of items published.
+        """
+        rows = [
+            (item.id, index, pickle_values(item.data), version)
+            for version, (index, item) in enumerate(items, start=1)
+        ]
+
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM items")
+            connection.execute("DELETE FROM meta")
+            connection.executemany(
+                "INSERT INTO items (id, item_index, data, version) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            connection.executemany(
+                "INSERT INTO meta (key, value) VALUES (?, ?)",
+                [
+                    ("state", pickle.dumps("open")),
+                    ("metadata", pickle_values(metadata or {})),
+                ],
+            )
+
+        return len(rows)
+
+    def close(self) -> None:
+        """
+        Mark the queue as closed, telling any remaining workers to exit.
+        """
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('state', ?)",
+                (pickle.dumps("closed"),),
+            )
+
+    def get_state(self) -> Optional[WorkQueueState]:
+        """
+        Get the state of the queue, or `None` if no items have been published yet.
+        """
+        value = self._get_meta("state")
+        return pickle.loads(value) if value else None
+
+    def get_metadata(self) -> Dict[str, Any]:
+        """
+        Get the metadata published along with the items.
+        """
+        value = self._get_meta("metadata")
+        return pickle.loads(value) if value else {}
+
+    def lease(self, worker_id: str, lease_duration: float) -> Optional[WorkItem]:
+        """
+        Lease the next available item, which is the first pending item or an item whose lease has
+        expired.
+
+        Args:
+            worker_id: The id of the worker leasing the item.
+            lease_duration: The number of seconds before the lease expires unless renewed.
+
+        Returns:
+            Optional[WorkItem]: The leased item, or `None` if no item is available.
+        """
+        now = time.time()
+
+        with self._transaction() as connection:
+            # Items whose lease expired too many times likely crash the workers processing them
+            connection.execute(
+                f"""
+                UPDATE items
+                SET status = 'error', error = 'Lease expired too many times',
+                    version = {_NEXT_VERSION}
+                WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?
+                """,
+                (now, self._max_attempts),
+            )
+
+            row = connection.execute(
+                """
+                SELECT id, item_index, data, attempts FROM items
+                WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?)
+                ORDER BY item_index
+                LIMIT 1
+                """,
+                (now,),
+            ).fetchone()
+
+            if not row:
+                return None
+
+            id, index, data, attempts = row
+            connection.execute(
+                f"""
+                UPDATE items
+                SET status = 'leased', worker_id = ?, lease_expires = ?, attempts = ?,
+                    version = {_NEXT_VERSION}
+                WHERE id = ?
+                """,
+                (worker_id, now + lease_duration, attempts + 1, id),
+            )
+
+        return WorkItem(id=id, index=index, data=pickle.loads(data), attempts=attempts + 1)
+
+    def renew(self, item_id: str, worker_id: str, lease_duration: float) -> bool:
+        """
+        Extend the lease on an item.
+
+        Args:
+            item_id: The id of the item.
+            worker_id: The id of the worker holding the lease.
+            lease_duration: The number of seconds from now before the lease expires.
+
+        Returns:
+            bool: `True` if the lease was renewed, `False` if the worker no longer holds it.
+        """
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                """
+                UPDATE items SET lease_expires = ?
+                WHERE id = ? AND worker_id = ? AND status = 'leased'
+                """,
+                (time.time() + lease_duration, item_id, worker_id),
+            )
+
+        return cursor.rowcount > 0
+
+    def complete(
+            self,
+            item_id: str,
+            worker_id: str,
+            status: WorkItemStatus,
+            data: Dict[str, Any],
+            error: Optional[str] = None,
+        ) -> bool:
+        """
+        Record the result of processing an item.
+
+        Args:
+            item_id: The id of the item.
+            worker_id: The id of the worker holding the lease.
+            status: The final status of the item.
+            data: The data of the item after processing. Values that can't be pickled are dropped.
+            error: A description of the error, if the item failed.
+
+        Returns:
+            bool: `True` if the result was recorded, `False` if the worker no longer holds the lease
+                (e.g. because it expired and the item was given to another worker).
+        """
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                f"""
+                UPDATE items
+                SET status = ?, data = ?, error = ?, lease_expires = NULL,
+                    version = {_NEXT_VERSION}
+                WHERE id = ? AND worker_id = ? AND status = 'leased'
+                """,
+                (status, pickle_values(data), error, item_id, worker_id),
+            )
+
+        return cursor.rowcount > 0
+
+    def get_counts(self) -> Dict[WorkItemStatus, int]:
+        """
+        Get the number of items with each status.
+        """
+        with self._connect() as connection:
+            rows = connection.execute("SELECT status, COUNT(*) FROM items GROUP BY status")
+            return { status: count for status, count in rows }
+
+    def has_unfinished_items(self) -> bool:
+        """
+        Return whether any items are still pending or leased.
+        """
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT 1 FROM items WHERE status IN ('pending', 'leased') LIMIT 1"
+            ).fetchone()
+
+        return row is not None
+
+    def get_updates(self, since_version: int = 0) -> List[WorkItemResult]:
+        """
+        Get the items that changed after a version.
+
+        Args:
+            since_version: The highest version already seen.
+
+        Returns:
+            List[WorkItemResult]: The changed items, ordered by version.
+        """
+        with self._connect() as connection:
+            rows = connection.execute(
+                """
+                SELECT id, item_index, status, data, worker_id, error, version FROM items
+                WHERE version > ?
+                ORDER BY version
+                """,
+                (since_version,),
+            ).fetchall()
+
+        return [
+            WorkItemResult(
+                id=id,
+                index=index,
+                status=status,
+                data=pickle.loads(data),
+                worker_id=worker_id,
+                error=error,
+                version=version,
+            )
+            for id, index, status, data, worker_id, error, version in rows
+        ]
+
+    def _get_meta(self, key: str) -> Optional[bytes]:
+        with self._connect() as connection:
+            row = connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+
+        return row[0] if row else None
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(
+            self._path,
+            timeout=self._busy_timeout,
+            isolation_level=None,
+        )
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._connect() as connection:
+            # Take the write lock up front so two workers can't lease the same item
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
@@ -0,0 +1,153 @@
+import logging
+from typing import Optional
+
+import anyio
+
+from ..utils.imports.load_pipeline import load_pipeline
+from .context import Context
+from .dataset import Dataset
+from .item_pipeline import DEFAULT_WORK_QUEUE_POLL_INTERVAL, ItemPipeline
+from .pipeline import Pipeline
+from .work_queue import WorkQueue
+
+logger = logging.getLogger(__name__)
+
+WORKER_PARAMS = ["max_concurrent_items", "lease_duration", "work_queue_poll_interval"]
+"""
+Parameters set by each worker that take precedence over the parameters published by the
+coordinator.
+"""
+
+class WorkQueueWorker(Pipeline):
+    """
+    A pipeline that processes items published to a work queue by a coordinator running an item
+    pipeline in `queue` execution mode.
+
+    The worker waits for the coordinator to publish items, loads the item pipeline from the module
+    published by the coordinator, or, if the pipeline wasn't loaded by module name, finds the item
+    pipeline with the published name within `pipeline`, and processes items using the parameters
+    published by the coordinator. Values that couldn't be published (e.g. models that can't be
+    pickled) and the parameters in `WORKER_PARAMS` come from the parameters passed to this worker.
+    """
+
+    def __init__(
+            self,
+            pipeline: Pipeline,
+            queue: WorkQueue,
+            worker_id: Optional[str] = None,
+        ):
+        """
+        Initialize the worker.
+
+        Args:
+            pipeline (Pipeline): The item pipeline, or a pipeline containing it in its setup,
+                steps or teardown.
+            queue (WorkQueue): The queue to process items from.
+            worker_id (Optional[str]): The id of the worker. Defaults to a unique id.
+        """
+        super().__init__(
+            name=f"{pipeline.name or type(pipeline).__name__} worker",
+            config=pipeline.config,
+            metadata=pipeline.metadata,
+        )
+        self._pipeline = pipeline
+        self._queue = queue
+        self._worker_id = worker_id
+
+    async def execute(self, dataset: Optional[Dataset], context: Optional[Context]) -> None:
+        """
+        Process items from the work queue until it's closed or no unfinished items remain.
+
+        Args:
+            dataset (Dataset): Unused; the items come from the work queue.
+            context (Context): The context with the parameters for this worker.
+        """
+        poll_interval = float(
+            context.params.get("work_queue_poll_interval") or DEFAULT_WORK_QUEUE_POLL_INTERVAL
+        )
+
+        if not await anyio.to_thread.run_sync(self._queue.get_state):
+            logger.info(f"Waiting for items to be published to {self._queue.path}")
+
+            while not await anyio.to_thread.run_sync(self._queue.get_state):
+                await anyio.sleep(poll_interval)
+
+        metadata = await anyio.to_thread.run_sync(self._queue.get_metadata)
+        item_pipeline = load_item_pipeline(metadata.get("module"), metadata.get("pipeline")) or \
+            find_item_pipeline(self._pipeline, metadata.get("pipeline"))
+
+        if not item_pipeline:
+            raise ValueError(
+                f"No item pipeline named '{metadata.get('pipeline')}' found in the pipeline "
+                f"{self._pipeline.name}"
+            )
+
+        worker_params = {
+            key: context.params[key] for key in WORKER_PARAMS if key in context.params
+        }
+        params = { **context.params, **metadata.get("params", {}), **worker_params }
+
+        await item_pipeline.process_work_queue(
+            self._queue,
+            context.create_child(item_pipeline, params=params, merge_params=False),
+            self._worker_id,
+        )
+
+
+def load_item_pipeline(module: Optional[str], name: Optional[str]) -> Optional[ItemPipeline]:
+    """
+    Load the item pipeline exported as `pipeline` by a module, as `run_pipeline` and
+    `do_item_steps` do for pipelines referenced by module name.
+
+    Args:
+        module (Optional[str]): The name of the module. If `None`, no pipeline is loaded.
+        name (Optional[str]): The name of the item pipeline, if it must match.
+
+    Returns:
+        Optional[ItemPipeline]: The item pipeline, or `None` if the module doesn't export a
+            matching item pipeline.
+    """
+    if not module:
+        return None
+
+    try:
+        pipeline = load_pipeline(module)
+    except (ImportError, AttributeError) as e:
+        logger.warning(f"Unable to import pipeline module {module}: {e}")
+        return None
+
+    if isinstance(pipeline, ItemPipeline) and (name is None or pipeline.name == name):
+        return pipeline
+
+    return None
+
+
+def find_item_pipeline(pipeline: Pipeline, name: Optional[str]) -> Optional[ItemPipeline]:
+    """
+    Find an item pipeline with the given name within `pipeline`, searching its setup, steps and
+    teardown depth-first.
+
+    Args:
+        pipeline (Pipeline): The pipeline to search.
+        name (Optional[str]): The name of the item pipeline. If `None`, the first item pipeline
+            found is returned.
+
+    Returns:
+        Optional[ItemPipeline]: The item pipeline, or `None` if none was found.
+    """
+    if isinstance(pipeline, ItemPipeline) and (name is None or pipeline.name == name):
+        return pipeline
+
+    steps = [
+        *(pipeline._setup_steps or []),
+        *(getattr(pipeline, "_steps", None) or []),
+        *(pipeline._teardown_steps or []),
+    ]
+
+    for step in steps:
+        if isinstance(step, Pipeline):
+            found = find_item_pipeline(step, name)
+            if found:
+                return found
+
+    return None
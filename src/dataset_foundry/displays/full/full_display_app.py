@@ -64,6 +64,11 @@ class FullDisplayApp(App):
             self.query_one('#tab_pipeline').display = False
 
         pipeline_service.subscribe("pipeline_started", {}, self._on_pipeline_started)
+        pipeline_service.subscribe(
+            "pipeline_updated",
+            { "fields": ["concurrency"] },
+            self._on_concurrency_updated
+        )
 
     def on_list_view_selected(self, event: ListView.Selected):
         # Only handle selections from the item tabs list
@@ -79,6 +84,11 @@ class FullDisplayApp(App):
         """Show Pipeline tab when a pipeline starts"""
         self._select_tab('tab_pipeline')
 
+    def _on_concurrency_updated(self, _event_type, payload):
+        """Show the current concurrency of an adaptive pipeline in the Pipeline tab label"""
+        concurrency = payload["pipeline"].concurrency
+        self.query_one('#tab_pipeline', Tab).label = f"Pipeline (concurrency: {concurrency})"
+
     def on_tabs_tab_activated(self, event: Tabs.TabActivated):
         # HACK: The `TabActivated` event appears to be being send when tabs are added into the DOM
         #       even if they are not actually active. Checking the `-active` class ensures we only
@@ -10,6 +10,8 @@ STATUS_EMOJI = {
     "success": "✅",
     "failure": "❌",
     "error": "💥",
+    "timeout": "⌛",
+    "cancelled": "🚫",
 }
 
 class ItemTab(ListItem):
@@ -0,0 +1,39 @@
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from ..core.dataset_item import DatasetItem
+from ..core.context import Context
+
+BatchItemErrors = Optional[Dict[str, Exception]]
+BatchItemFunction = Callable[[List[DatasetItem], Context], Awaitable[BatchItemErrors]]
+
+@dataclass
+class BatchItemAction:
+    """
+    An item action that processes many items at once, so work can be shared across items (e.g. one
+    batch request to a provider, one bulk write or one container running many test suites).
+
+    When used as a step of an `ItemPipeline`, items reaching the step are collected into batches of
+    up to `max_batch_size` items, waiting at most `max_wait` seconds after the first item arrives
+    for the batch to fill. The function is called once per batch, with the context of the first
+    item in the batch, and each item moves on to the next step once its batch finishes. If the
+    function raises an error, every item in the batch fails with that error. To fail only some of
+    the items, the function can instead return a dict mapping the ids of the failed items to their
+    errors.
+
+    Anywhere else, such as within `if_item`, the action can be called like any other item action,
+    in which case the function is called with a batch of one item.
+    """
+    function: BatchItemFunction
+    max_batch_size: int = 10
+    max_wait: float = 0.5
+    name: Optional[str] = None
+
+    @property
+    def __name__(self) -> str:
+        return self.name or getattr(self.function, "__name__", type(self).__name__)
+
+    async def __call__(self, item: DatasetItem, context: Context) -> None:
+        errors = await self.function([item], context)
+        if errors and item.id in errors:
+            raise errors[item.id]
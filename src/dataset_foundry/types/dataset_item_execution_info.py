@@ -5,7 +5,15 @@ from contextvars import Token
 from ..core.dataset_item import DatasetItem
 from .pipeline_execution_info import PipelineExecutionId
 
-DatasetItemExecutionStatus = Literal["created", "running", "success", "failure", "error"]
+DatasetItemExecutionStatus = Literal[
+    "created",
+    "running",
+    "success",
+    "failure",
+    "error",
+    "timeout",
+    "cancelled",
+]
 
 
 @dataclass
@@ -19,3 +27,5 @@ class DatasetItemExecutionInfo:
     end_time: float | None = None
     execution_token: Token | None = None
     logs: List[str] = field(default_factory=list)
+    model_retries: int = 0
+    model_retry_latency: float = 0.0
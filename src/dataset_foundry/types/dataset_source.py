@@ -0,0 +1,19 @@
+import inspect
+from typing import Any, AsyncIterator, Callable, TypeAlias
+
+from ..core.dataset import Dataset
+from ..core.dataset_item import DatasetItem
+
+DatasetSource: TypeAlias = Callable[
+    [Dataset, 'Context'], # type: ignore - circular import
+    AsyncIterator[DatasetItem],
+]
+"""
+A dataset action that adds items to the dataset as they load, yielding each item it adds.
+"""
+
+def is_dataset_source(action: Any) -> bool:
+    """
+    Return whether `action` is a `DatasetSource` rather than a regular dataset action.
+    """
+    return inspect.isasyncgenfunction(action)
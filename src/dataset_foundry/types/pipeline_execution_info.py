@@ -1,11 +1,12 @@
 from contextvars import Token
-from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from ..core.pipeline import Pipeline
     from ..core.dataset import Dataset
     from ..core.context import Context
+    from .stage_execution_info import StageExecutionInfo
 
 type PipelineExecutionId = str
 
@@ -19,3 +20,8 @@ class PipelineExecutionInfo:
     context: 'Context'
     start_time: float
     end_time: float | None = None
+    concurrency: int | None = None
+    scheduling_group: PipelineExecutionId | None = None
+    scheduling_weight: float = 1.0
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    stages: List['StageExecutionInfo'] = field(default_factory=list)
@@ -0,0 +1,29 @@
+import time
+from dataclasses import dataclass
+
+from .pipeline_execution_info import PipelineExecutionId
+
+
+@dataclass
+class StageExecutionInfo:
+    name: str
+    index: int
+    pipeline_execution_id: PipelineExecutionId
+    workers: int
+    buffer_size: int
+    queue_depth: int = 0
+    in_progress: int = 0
+    completed: int = 0
+    failed: int = 0
+    busy_time: float = 0.0
+    start_time: float | None = None
+    end_time: float | None = None
+
+    @property
+    def throughput(self) -> float:
+        """The number of items completed per second since the stage started."""
+        if not self.start_time:
+            return 0.0
+
+        elapsed = (self.end_time or time.time()) - self.start_time
+        return self.completed / elapsed if elapsed > 0 else 0.0
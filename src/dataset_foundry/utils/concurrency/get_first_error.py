@@ -0,0 +1,14 @@
+def get_first_error(group: BaseExceptionGroup) -> BaseException:
+    """
+    Get the first error in an exception group raised by a task group, looking inside any nested
+    groups, so the error raised by a failing task can be re-raised on its own.
+
+    Args:
+        group (BaseExceptionGroup): The exception group.
+
+    Returns:
+        BaseException: The first error that isn't an exception group.
+    """
+    error = group.exceptions[0]
+
+    return get_first_error(error) if isinstance(error, BaseExceptionGroup) else error
@@ -0,0 +1,32 @@
+import logging
+import pickle
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+def pickle_values(values: Dict[str, Any]) -> bytes:
+    """
+    Pickle `values` so they can be sent to another process, dropping any entries that can't be
+    pickled (e.g. models holding network clients).
+
+    Args:
+        values (Dict[str, Any]): The values to pickle.
+
+    Returns:
+        bytes: The pickled values.
+    """
+    try:
+        return pickle.dumps(values, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        pass
+
+    picklable = {}
+
+    for key, value in values.items():
+        try:
+            pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            picklable[key] = value
+        except Exception:
+            logger.debug(f"Not sending '{key}' to another process since it can't be pickled")
+
+    return pickle.dumps(picklable, protocol=pickle.HIGHEST_PROTOCOL)
@@ -0,0 +1,54 @@
+import atexit
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_process_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Get the process pool shared by all actions that offload work to other processes, creating it on
+    first use.
+
+    Worker processes are started using `spawn`, so any function run in the pool, along with its
+    arguments, must be importable and picklable.
+
+    Args:
+        max_workers: The number of worker processes to create the pool with. Ignored if the pool
+            already exists. Defaults to the number of CPUs.
+
+    Returns:
+        ProcessPoolExecutor: The shared process pool.
+    """
+    global _process_pool
+
+    if _process_pool is None:
+        max_workers = int(max_workers) if max_workers else None
+        _process_pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        logger.debug(f"Started process pool (max workers: {_process_pool._max_workers})")
+
+    return _process_pool
+
+
+def shutdown_process_pool(wait: bool = True) -> None:
+    """
+    Shut down the shared process pool, if it has been started.
+
+    Args:
+        wait: Whether to wait for pending work to finish before returning.
+    """
+    global _process_pool
+
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=wait, cancel_futures=not wait)
+        _process_pool = None
+
+
+atexit.register(shutdown_process_pool)
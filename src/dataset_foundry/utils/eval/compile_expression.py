@@ -0,0 +1,26 @@
+from functools import lru_cache
+from types import CodeType
+
+Expression = str | CodeType
+
+@lru_cache(maxsize=1024)
+def compile_expression(expression: str) -> CodeType:
+    """
+    Compile an expression so it can be evaluated many times without being parsed again.
+
+    Compiled expressions are cached, so compiling the same expression twice returns the same code
+    object.
+
+    Args:
+        expression: The expression to compile.
+
+    Returns:
+        CodeType: The compiled expression.
+
+    Raises:
+        ValueError: If `expression` isn't a valid Python expression.
+    """
+    try:
+        return compile(expression, "<expression>", "eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid expression '{expression}': {e.msg}") from e
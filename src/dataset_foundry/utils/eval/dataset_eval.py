@@ -1,21 +1,18 @@
+from collections import ChainMap
 from typing import Optional
 
 from ...core.context import Context
 from ...core.dataset import Dataset
+from .compile_expression import Expression
 from .safe_eval import safe_eval
 
 def dataset_eval(
-        expression: str,
+        expression: Expression,
         dataset: Dataset,
         context: Context,
         variables: dict = {},
         functions: Optional[dict] = None,
     ):
-    locals = {
-        **variables,
-        **dataset.metadata,
-        'dataset': dataset,
-        'context': context,
-    }
+    locals = ChainMap({ 'dataset': dataset, 'context': context }, dataset.metadata, variables)
 
     return safe_eval(expression, locals, functions)
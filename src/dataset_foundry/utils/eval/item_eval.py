@@ -1,21 +1,19 @@
+from collections import ChainMap
 from typing import Optional
 
 from ...core.context import Context
 from ...core.dataset_item import DatasetItem
+from .compile_expression import Expression
 from .safe_eval import safe_eval
 
 def item_eval(
-        expression: str,
+        expression: Expression,
         item: DatasetItem,
         context: Context,
         variables: dict = {},
         functions: Optional[dict] = None,
     ):
-    locals = {
-        **variables,
-        **item.data,
-        'id': item.id,
-        'context': context,
-    }
+    # Look up names in the item data without copying it, since conditions are checked often
+    locals = ChainMap({ 'id': item.id, 'context': context }, item.data, variables)
 
     return safe_eval(expression, locals, functions)
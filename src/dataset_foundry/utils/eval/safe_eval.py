@@ -1,6 +1,7 @@
-from typing import Optional
+from typing import Mapping, Optional
 
 from ..filesystem.path_exists import path_exists
+from .compile_expression import Expression, compile_expression
 
 ALLOWED_GLOBALS = ['len', 'list', 'dict']
 
@@ -8,21 +9,43 @@ DEFAULT_FUNCTIONS = {
     'path_exists': path_exists,
 }
 
+def _get_builtins(allowed_globals: list) -> dict:
+    return { name: __builtins__[name] for name in allowed_globals }
+
+_DEFAULT_GLOBALS = {
+    "__builtins__": _get_builtins(ALLOWED_GLOBALS),
+    **DEFAULT_FUNCTIONS,
+}
+
 def safe_eval(
-        expression: str,
-        locals: dict = {},
+        expression: Expression,
+        locals: Mapping = {},
         functions: Optional[dict] = None,
         allowed_globals: Optional[list] = ALLOWED_GLOBALS,
     ):
-    if functions is None:
-        functions = DEFAULT_FUNCTIONS
-
-    safe_globals = {
-        "__builtins__": {
-            name: __builtins__[name]
-            for name in allowed_globals
-        },
-        **functions,
-    }
+    """
+    Evaluate an expression with access to only the given variables, functions and built-ins.
+
+    Args:
+        expression: The expression to evaluate, either as a string or compiled using
+            `compile_expression`.
+        locals: The variables available to the expression. Can be any mapping, so variables can be
+            looked up lazily rather than copied into a dict.
+        functions: The functions available to the expression (default: `DEFAULT_FUNCTIONS`).
+        allowed_globals: The names of the built-ins available to the expression.
+
+    Returns:
+        The result of the expression.
+    """
+    if functions is None and allowed_globals is ALLOWED_GLOBALS:
+        safe_globals = _DEFAULT_GLOBALS
+    else:
+        safe_globals = {
+            "__builtins__": _get_builtins(allowed_globals),
+            **(DEFAULT_FUNCTIONS if functions is None else functions),
+        }
+
+    if isinstance(expression, str):
+        expression = compile_expression(expression)
 
     return eval(expression, safe_globals, locals)
@@ -0,0 +1,21 @@
+import importlib
+
+from ...core.pipeline import Pipeline
+
+def load_pipeline(module_name: str) -> Pipeline:
+    """
+    Imports a module by name and returns the pipeline it exports as `pipeline`, recording the name
+    of the module on the pipeline so it can be imported again elsewhere (e.g. by workers).
+
+    Args:
+        module_name (str): The name of the module to import.
+
+    Returns:
+        Pipeline: The pipeline exported by the module.
+    """
+    pipeline = importlib.import_module(module_name).pipeline
+
+    if isinstance(pipeline, Pipeline):
+        pipeline.module = module_name
+
+    return pipeline
@@ -4,7 +4,7 @@ from pathlib import Path
 import re
 from subprocess import CompletedProcess, CalledProcessError, run
 import sys
-from typing import Union
+from typing import Optional, Union
 
 from dataset_foundry.types.unit_test_result import UnitTestResult
 
@@ -25,12 +25,13 @@ def parse_pytest_results(result: Union[CompletedProcess, CalledProcessError]) ->
         stderr=result.stderr
     )
 
-def run_python_unit_tests(test_path: Path) -> UnitTestResult:
+def run_python_unit_tests(test_path: Path, timeout: Optional[float] = None) -> UnitTestResult:
     """
     Run the unit tests using pytest.
 
     Args:
         test_path (str): The path to the Python module file to run the unit tests on.
+        timeout (Optional[float]): The maximum number of seconds to let the tests run.
 
     Returns:
         result: The result of the unit tests.
@@ -50,7 +51,8 @@ def run_python_unit_tests(test_path: Path) -> UnitTestResult:
             [str(pytest_path), test_path, "-v"],
             check=True,
             capture_output=True,
-            text=True
+            text=True,
+            timeout=timeout,
         ))
     except CalledProcessError as e:
         result = parse_pytest_results(e)
@@ -0,0 +1,115 @@
+import anyio
+import pytest
+
+from dataset_foundry.core.adaptive_concurrency import AdaptiveConcurrencyController
+from dataset_foundry.core.dataset import Dataset
+from dataset_foundry.core.dataset_item import DatasetItem
+from dataset_foundry.core.item_pipeline import ItemPipeline
+from dataset_foundry.core.model import model_events
+from dataset_foundry.core.pipeline_service import pipeline_service
+
+
+def create_controller(**kwargs) -> AdaptiveConcurrencyController:
+    limiter = anyio.CapacityLimiter(16)
+    options = { "min_concurrency": 2, "window_size": 4, "cooldown": 0, **kwargs }
+    return AdaptiveConcurrencyController(limiter, **options)
+
+
+def emit_success(latency: float):
+    model_events.emit("invoke_succeeded", { "model": None, "latency": latency })
+
+
+def test_increases_additively_after_healthy_windows():
+    controller = create_controller()
+    controller.start()
+    try:
+        assert controller.concurrency == 8
+
+        for _ in range(8):
+            emit_success(1.0)
+
+        assert controller.concurrency == 10
+    finally:
+        controller.stop()
+
+
+def test_decreases_multiplicatively_on_rate_limits_down_to_minimum():
+    controller = create_controller()
+    controller.start()
+    try:
+        for expected in [4, 2, 2]:
+            model_events.emit("invoke_failed", {
+                "model": None,
+                "latency": 0.1,
+                "error": Exception("429"),
+                "rate_limited": True,
+            })
+            assert controller.concurrency == expected
+    finally:
+        controller.stop()
+
+    # Events after stopping are ignored
+    model_events.emit("invoke_failed", { "rate_limited": True })
+    assert controller.concurrency == 2
+
+
+def test_decreases_on_latency_and_item_failures():
+    controller = create_controller(latency_tolerance=2.0)
+    controller.start()
+    try:
+        for _ in range(4):
+            emit_success(1.0)
+        for _ in range(4):
+            emit_success(5.0)
+
+        assert controller.concurrency == 4
+
+        for succeeded in [True, False, False, True]:
+            controller.record_item(succeeded)
+
+        assert controller.concurrency == 2
+    finally:
+        controller.stop()
+
+
+def test_cooldown_limits_decreases():
+    controller = create_controller(cooldown=60)
+    controller.start()
+    try:
+        for _ in range(3):
+            model_events.emit("invoke_failed", { "rate_limited": True })
+
+        assert controller.concurrency == 4
+    finally:
+        controller.stop()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("execution_mode", ["tasks", "workers"])
+async def test_item_pipeline_adapts_concurrency(execution_mode):
+    active = 0
+    max_active = 0
+
+    async def call_model(item: DatasetItem, context):
+        nonlocal active, max_active
+        active += 1
+        max_active = max(max_active, active)
+        try:
+            await anyio.sleep(0.01)
+            model_events.emit("invoke_failed", { "rate_limited": True })
+        finally:
+            active -= 1
+
+    pipeline = ItemPipeline(name=f"test_adaptive_{execution_mode}", steps=[call_model])
+    dataset = Dataset([DatasetItem(f"item_{index:03d}", {}) for index in range(20)])
+
+    await pipeline.run(dataset, params={
+        "max_concurrent_items": 8,
+        "min_concurrent_items": 1,
+        "adaptive_concurrency": { "cooldown": 0 },
+        "execution_mode": execution_mode,
+    })
+
+    execution = next(info for info in pipeline_service.pipelines if info.pipeline is pipeline)
+    assert max_active <= 4
+    assert execution.concurrency == 1
@@ -0,0 +1,230 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from dataset_foundry.actions.item.generate_item import generate_item
+from dataset_foundry.core.batch_model import BatchModel, BatchRequestError
+from dataset_foundry.core.dataset import Dataset
+from dataset_foundry.core.dataset_item import DatasetItem
+from dataset_foundry.core.item_pipeline import ItemPipeline
+from dataset_foundry.core.model import Model
+from dataset_foundry.core.pipeline_service import pipeline_service
+
+
+class StandInBatchServer(ThreadingHTTPServer):
+    """
+    A local stand-in for the Anthropic Message Batches API, which ends each batch on the second poll
+    and replies to every request by echoing its last message, failing requests that contain "fail".
+    """
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StandInBatchHandler)
+        self.batches = {}
+        self.polls = {}
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def get_batch(self, batch_id: str) -> dict:
+        ended = self.polls.get(batch_id, 0) >= 2
+
+        return {
+            "id": batch_id,
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {
+                "processing": 0 if ended else len(self.batches[batch_id]),
+                "succeeded": 0,
+                "errored": 0,
+                "canceled": 0,
+                "expired": 0,
+            },
+            "created_at": "2025-01-01T00:00:00Z",
+            "expires_at": "2025-01-02T00:00:00Z",
+            "ended_at": "2025-01-01T00:01:00Z" if ended else None,
+            "archived_at": None,
+            "cancel_initiated_at": None,
+            "results_url": f"{self.url}/v1/messages/batches/{batch_id}/results" if ended else None,
+        }
+
+    def get_result(self, request: dict) -> dict:
+        content = request["params"]["messages"][-1]["content"]
+        if "fail" in str(content):
+            result = {
+                "type": "errored",
+                "error": {
+                    "type": "error",
+                    "error": { "type": "invalid_request_error", "message": "Bad request" },
+                },
+            }
+        else:
+            result = {
+                "type": "succeeded",
+                "message": {
+                    "id": f"msg_{request['custom_id']}",
+                    "type": "message",
+                    "role": "assistant",
+                    "model": request["params"]["model"],
+                    "content": [{ "type": "text", "text": f"Reply to: {content}" }],
+                    "stop_reason": "end_turn",
+                    "stop_sequence": None,
+                    "usage": { "input_tokens": 1, "output_tokens": 1 },
+                },
+            }
+
+        return { "custom_id": request["custom_id"], "result": result }
+
+
+class StandInBatchHandler(BaseHTTPRequestHandler):
+    server: StandInBatchServer
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        batch_id = f"msgbatch_{len(self.server.batches)}"
+        self.server.batches[batch_id] = body["requests"]
+        self._send_json(self.server.get_batch(batch_id))
+
+    def do_GET(self):
+        parts = self.path.strip("/").split("/")
+        batch_id = parts[3]
+
+        if parts[-1] == "results":
+            lines = [
+                json.dumps(self.server.get_result(request))
+                for request in self.server.batches[batch_id]
+            ]
+            self._send("\n".join(lines).encode("utf-8"), "application/x-jsonl")
+        else:
+            self.server.polls[batch_id] = self.server.polls.get(batch_id, 0) + 1
+            self._send_json(self.server.get_batch(batch_id))
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, data: dict):
+        self._send(json.dumps(data).encode("utf-8"), "application/json")
+
+    def _send(self, body: bytes, content_type: str):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def batch_server(monkeypatch):
+    server = StandInBatchServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test")
+    monkeypatch.setenv("ANTHROPIC_BASE_URL", server.url)
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_batch_model_returns_responses_in_request_order(batch_server):
+    batch_model = BatchModel(Model("anthropic/claude-3-5-haiku-latest"), poll_interval=0.01)
+
+    responses = await batch_model.abatch([
+        [HumanMessage(content="first")],
+        [HumanMessage(content="please fail")],
+        [HumanMessage(content="third")],
+    ])
+
+    assert len(batch_server.batches) == 1
+    # The batch ends on the second poll, and the SDK fetches it once more to find the results
+    assert batch_server.polls["msgbatch_0"] == 3
+    assert responses[0].content == "Reply to: first"
+    assert isinstance(responses[1], BatchRequestError)
+    assert responses[2].content == "Reply to: third"
+
+
+@pytest.mark.asyncio
+async def test_generate_item_batch_mode_routes_responses_to_items(batch_server):
+    pipeline = ItemPipeline(
+        name="test_generate_item_batch",
+        steps=[
+            generate_item(
+                prompt="Say {word}",
+                model=Model("anthropic/claude-3-5-haiku-latest"),
+                batch=True,
+                max_batch_size=10,
+                max_wait=0.05,
+                poll_interval=0.01,
+            ),
+        ],
+    )
+    words = ["apple", "fail", "cherry", "date"]
+    dataset = Dataset([
+        DatasetItem(f"item_{index}", { "word": word }) for index, word in enumerate(words)
+    ])
+
+    await pipeline.run(dataset, params={ "max_concurrent_items": 4 })
+
+    statuses = {
+        info.item.id: info.status for info in pipeline_service.items if info.item in dataset.items
+    }
+
+    assert len(batch_server.batches) == 1
+    assert statuses["item_1"] != "success"
+    assert [statuses[item_id] for item_id in ("item_0", "item_2", "item_3")] == ["success"] * 3
+    assert {item.id: item.data.get("output") for item in dataset.items} == {
+        "item_0": "Reply to: Say apple",
+        "item_1": None,
+        "item_2": "Reply to: Say cherry",
+        "item_3": "Reply to: Say date",
+    }
+
+
+@pytest.mark.asyncio
+async def test_generate_item_batch_mode_resolves_values_per_item(batch_server):
+    def prompt(item, context):
+        if item.data["word"] == "broken":
+            raise ValueError("Unable to format prompt")
+        return "Say {word}"
+
+    pipeline = ItemPipeline(
+        name="test_generate_item_batch_per_item",
+        steps=[
+            generate_item(
+                prompt=prompt,
+                model=lambda item, context: f"anthropic/{item.data['model']}",
+                output_key=lambda item, context: f"{item.data['word']}_output",
+                batch=True,
+                max_batch_size=10,
+                max_wait=0.05,
+                poll_interval=0.01,
+            ),
+        ],
+    )
+    items = [
+        ("apple", "claude-3-5-haiku-latest"),
+        ("broken", "claude-3-5-haiku-latest"),
+        ("cherry", "claude-3-5-sonnet-latest"),
+    ]
+    dataset = Dataset([
+        DatasetItem(f"per_item_{index}", { "word": word, "model": model })
+        for index, (word, model) in enumerate(items)
+    ])
+
+    await pipeline.run(dataset, params={ "max_concurrent_items": 3 })
+
+    statuses = {
+        info.item.id: info.status for info in pipeline_service.items if info.item in dataset.items
+    }
+    models = sorted(requests[0]["params"]["model"] for requests in batch_server.batches.values())
+
+    assert models == ["claude-3-5-haiku-latest", "claude-3-5-sonnet-latest"]
+    assert statuses["per_item_1"] != "success"
+    assert dataset.items[0].data["apple_output"] == "Reply to: Say apple"
+    assert dataset.items[2].data["cherry_output"] == "Reply to: Say cherry"
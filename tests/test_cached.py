@@ -0,0 +1,72 @@
+import pytest
+from unittest.mock import MagicMock
+
+from dataset_foundry.actions.item.cached import cached
+from dataset_foundry.actions.item.validate_code_syntax import validate_code_syntax
+from dataset_foundry.core.action_cache import ActionCache
+from dataset_foundry.core.dataset_item import DatasetItem
+from dataset_foundry.core.key import Key
+
+
+def create_context(tmp_path):
+    context = MagicMock()
+    context.params = { "action_cache_file": tmp_path / "cache.sqlite" }
+    return context
+
+
+def count_calls(calls: list):
+    def create_action(output_key: str = "count", input: Key = Key("code")):
+        async def count_action(item: DatasetItem, context):
+            calls.append(item.id)
+            item.push({ output_key: len(item.data["code"]) }, count_action)
+
+        return count_action
+
+    return create_action
+
+
+@pytest.mark.asyncio
+async def test_cached_replays_results_for_identical_inputs(tmp_path):
+    calls = []
+    context = create_context(tmp_path)
+    action = cached(count_calls(calls), output_key="length")
+
+    items = [DatasetItem("a", { "code": "x = 1" }), DatasetItem("b", { "code": "x = 1" })]
+    for item in items:
+        await action(item, context)
+
+    changed_item = DatasetItem("c", { "code": "x = 22" })
+    await action(changed_item, context)
+
+    assert calls == ["a", "c"]
+    assert [item.data["length"] for item in items] == [5, 5]
+    assert changed_item.data["length"] == 6
+
+
+@pytest.mark.asyncio
+async def test_cached_works_with_actions_from_the_library(tmp_path):
+    context = create_context(tmp_path)
+    action = cached(validate_code_syntax, input=Key("code"), output_key="syntax")
+
+    for _ in range(2):
+        item = DatasetItem("test_id", { "code": "def broken(:\n    pass" })
+        await action(item, context)
+        assert item.data["syntax"]["is_valid"] is False
+
+    cache = ActionCache(tmp_path / "cache.sqlite")
+    assert cache.get_stats()["entries"] == 1
+
+
+def test_action_cache_evicts_least_recently_used_entries(tmp_path):
+    cache = ActionCache(tmp_path / "cache.sqlite", max_size=400)
+
+    cache.put("a", [("step", { "value": "a" * 100 })])
+    cache.put("b", [("step", { "value": "b" * 100 })])
+    assert cache.get("a") == [("step", { "value": "a" * 100 })]
+
+    cache.put("c", [("step", { "value": "c" * 100 })])
+
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["entries"]) == (2, 1, 1, 2)
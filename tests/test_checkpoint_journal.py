@@ -0,0 +1,72 @@
+import pytest
+
+from dataset_foundry.core.checkpoint_journal import CheckpointJournal
+from dataset_foundry.core.dataset import Dataset
+from dataset_foundry.core.dataset_item import DatasetItem
+from dataset_foundry.core.item_pipeline import ItemPipeline
+
+
+def create_dataset(count: int) -> Dataset:
+    return Dataset([DatasetItem(f"item_{index:03d}", { "value": index }) for index in range(count)])
+
+
+def test_journal_loads_completed_steps_and_ignores_partial_records(tmp_path):
+    path = tmp_path / "test.journal"
+
+    journal = CheckpointJournal(path)
+    journal.record_step("a", 0, [("first", { "x": 1 })])
+    journal.record_step("a", 1, [("second", { "y": 2 })])
+    journal.record_finished("a")
+    journal.record_step("b", 0, [("first", { "x": 3 })])
+    journal.close()
+
+    # Simulate a record cut off when the process died
+    with open(path, "ab") as file:
+        file.write(b"\x80\x05\x95garbage")
+
+    journal = CheckpointJournal(path, resume=True)
+    item_a = DatasetItem("a")
+    item_b = DatasetItem("b")
+
+    assert journal.restore_item(item_a)
+    assert not journal.restore_item(item_b)
+    assert item_a.data == { "x": 1, "y": 2 }
+    assert item_b.data == { "x": 3 }
+    assert journal.get_completed_steps("b") == 1
+
+    journal.record_step("b", 1, [("second", { "y": 4 })])
+    journal.close()
+
+    journal = CheckpointJournal(path, resume=True)
+    assert journal.get_completed_steps("b") == 2
+    journal.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("execution_mode", ["tasks", "staged"])
+async def test_resume_skips_completed_steps(tmp_path, execution_mode):
+    calls = []
+
+    async def generate(item: DatasetItem, context):
+        calls.append(("generate", item.id))
+        item.push({ "generated": item.data["value"] * 10 }, generate)
+
+    async def validate(item: DatasetItem, context):
+        calls.append(("validate", item.id))
+        if context.params.get("fail") and item.data["value"] % 2:
+            raise ValueError("Validation failed")
+        item.push({ "valid": True }, validate)
+
+    pipeline = ItemPipeline(name="test_resume", steps=[generate, validate])
+    params = { "log_dir": tmp_path, "execution_mode": execution_mode, "max_concurrent_items": 2 }
+
+    await pipeline.run(create_dataset(4), params={ **params, "fail": True })
+    assert (tmp_path / "checkpoints" / "test_resume.journal").exists()
+
+    calls.clear()
+    dataset = create_dataset(4)
+    await pipeline.run(dataset, params={ **params, "resume": True })
+
+    assert sorted(calls) == [("validate", "item_001"), ("validate", "item_003")]
+    assert [item.data["generated"] for item in dataset.items] == [0, 10, 20, 30]
+    assert all(item.data["valid"] for item in dataset.items)
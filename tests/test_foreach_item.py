@@ -1,9 +1,12 @@
+import anyio
 import pytest
 from unittest.mock import MagicMock
 
 from dataset_foundry.actions.item.foreach_item_element import foreach_item_element
+from dataset_foundry.core.dataset import Dataset
 from dataset_foundry.core.dataset_item import DatasetItem
 from dataset_foundry.core.context import Context
+from dataset_foundry.core.item_pipeline import ItemPipeline
 from dataset_foundry.core.key import Key
 
 @pytest.mark.asyncio
@@ -108,4 +111,39 @@ async def test_foreach_item_element_item_id_generation():
         actions=[record_action]
     )
     await foreach_action(item, context)
-    assert seen_ids == ["test_id_0", "test_id_1"]
\ No newline at end of file
+    assert seen_ids == ["test_id_0", "test_id_1"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("order", ["input", "completion"])
+async def test_foreach_item_element_concurrent(order):
+    item = DatasetItem("test_id", { "delays": [0.05, 0.01, 0.02, 0.0] })
+    context = Context(ItemPipeline([]), Dataset())
+    active = 0
+    max_active = 0
+
+    async def delay_action(item, context):
+        nonlocal active, max_active
+        active += 1
+        max_active = max(max_active, active)
+        try:
+            await anyio.sleep(item.data["element"])
+        finally:
+            active -= 1
+
+        if item.data["index"] == 2:
+            raise ValueError("Element failed")
+        item.push({ "result": item.data["index"] * 10 }, "delay_action")
+
+    foreach_action = foreach_item_element(
+        collection=Key("delays"),
+        actions=[delay_action],
+        max_concurrency=2,
+        output_key="results",
+        order=order,
+    )
+    await foreach_action(item, context)
+
+    results = [result["result"] for result in item.data["results"]]
+    assert max_active == 2
+    assert results == ([0, 10, 30] if order == "input" else [10, 30, 0])
@@ -0,0 +1,75 @@
+import anyio
+import pytest
+from langchain_core.messages import AIMessage
+
+from dataset_foundry.core.hedging_policy import HedgingPolicy
+from dataset_foundry.core.model import Model
+
+
+class FakeChatModel:
+    def __init__(self, name: str, delays: list):
+        self.name = name
+        self.delays = delays
+        self.calls = 0
+        self.cancelled = 0
+        self.model_kwargs = {}
+
+    async def ainvoke(self, messages, **kwargs):
+        delay = self.delays[min(self.calls, len(self.delays) - 1)]
+        self.calls += 1
+        try:
+            await anyio.sleep(delay)
+        except anyio.get_cancelled_exc_class():
+            self.cancelled += 1
+            raise
+        return AIMessage(content=self.name)
+
+
+def create_model(monkeypatch, name: str, delays: list, hedging=None) -> Model:
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    model = Model("openai/gpt-4o-mini", hedging=hedging)
+    model._model = FakeChatModel(name, delays)
+    return model
+
+
+def test_delay_uses_percentile_after_warm_up():
+    policy = HedgingPolicy(percentile=0.9, min_samples=5)
+
+    for latency in [0.1, 0.2, 0.3, 0.4]:
+        policy.record_latency(latency)
+    assert policy.get_delay() is None
+
+    for latency in [0.5, 0.6, 0.7, 0.8, 0.9, 1.0]:
+        policy.record_latency(latency)
+    assert policy.get_delay() == 0.9
+
+
+def test_hedges_are_capped_by_extra_ratio():
+    policy = HedgingPolicy(max_extra_ratio=0.2)
+
+    sent = 0
+    for _ in range(20):
+        policy.start_call()
+        sent += policy.try_start_hedge()
+
+    assert sent == 4
+    assert policy.get_stats()["hedge_rate"] == 0.2
+
+
+@pytest.mark.asyncio
+async def test_slow_call_is_hedged_and_loser_cancelled(monkeypatch):
+    hedge_model = create_model(monkeypatch, "hedge", [0.01])
+    policy = HedgingPolicy(max_extra_ratio=0.5, hedge_model=hedge_model, min_samples=3)
+    model = create_model(monkeypatch, "primary", [0.01, 0.01, 0.01, 1.0], hedging=policy)
+
+    for _ in range(3):
+        assert (await model.ainvoke([])).content == "primary"
+    assert hedge_model._model.calls == 0
+
+    with anyio.fail_after(0.5):
+        response = await model.ainvoke([])
+
+    assert response.content == "hedge"
+    assert model._model.cancelled == 1
+    assert policy.get_stats()["hedges"] == 1
+    assert policy.get_stats()["hedge_wins"] == 1
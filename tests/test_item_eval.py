@@ -0,0 +1,38 @@
+import pytest
+from unittest.mock import MagicMock
+
+from dataset_foundry.actions.item.while_item import while_item
+from dataset_foundry.core.dataset_item import DatasetItem
+from dataset_foundry.utils.eval.compile_expression import compile_expression
+from dataset_foundry.utils.eval.item_eval import item_eval
+
+
+def test_item_eval_reads_item_data_and_variables():
+    item = DatasetItem("test_id", { "attempts": 2, "iteration": "from item" })
+    context = MagicMock()
+    condition = compile_expression("attempts < 3 and id == 'test_id' and len(iteration) > 2")
+
+    assert item_eval(condition, item, context, { "iteration": 0 })
+    assert item_eval("iteration", DatasetItem("other", {}), context, { "iteration": 5 }) == 5
+
+    item.data["attempts"] = 3
+    assert not item_eval(condition, item, context)
+
+
+def test_compile_expression_rejects_invalid_conditions():
+    assert compile_expression("attempts < 3") is compile_expression("attempts < 3")
+
+    with pytest.raises(ValueError, match="Invalid expression"):
+        while_item("attempts <", [])
+
+
+@pytest.mark.asyncio
+async def test_while_item_uses_compiled_condition():
+    item = DatasetItem("test_id", { "count": 0 })
+
+    async def increment(item, context):
+        item.push({ "count": item.data["count"] + 1 }, increment)
+
+    await while_item("count < 3", [increment])(item, MagicMock())
+
+    assert item.data["count"] == 3
@@ -0,0 +1,358 @@
+from types import SimpleNamespace
+
+import anyio
+import pytest
+
+from dataset_foundry.core.dataset import Dataset
+from dataset_foundry.core.dataset_item import DatasetItem
+from dataset_foundry.core.item_pipeline import ItemPipeline
+from dataset_foundry.core.item_timings import ItemTimings
+from dataset_foundry.core.pipeline_service import pipeline_service
+from dataset_foundry.types.batch_item_action import BatchItemAction
+
+
+def create_dataset(count: int) -> Dataset:
+    return Dataset([DatasetItem(f"item_{index:03d}", { "value": index }) for index in range(count)])
+
+
+class ConcurrencyTracker:
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self.seen = []
+
+    async def __call__(self, item: DatasetItem, context):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await anyio.sleep(0.01)
+            self.seen.append(item.id)
+        finally:
+            self.active -= 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("execution_mode", ["tasks", "workers"])
+async def test_execution_modes_process_all_items_within_concurrency(execution_mode):
+    tracker = ConcurrencyTracker()
+    pipeline = ItemPipeline(name=f"test_{execution_mode}", steps=[tracker])
+    dataset = create_dataset(20)
+
+    await pipeline.run(dataset, params={
+        "max_concurrent_items": 4,
+        "execution_mode": execution_mode,
+    })
+
+    assert sorted(tracker.seen) == [item.id for item in dataset.items]
+    assert tracker.max_active == 4
+    assert [item.data["index"] for item in dataset.items] == list(range(20))
+
+
+@pytest.mark.asyncio
+async def test_workers_mode_starts_items_in_order():
+    started = []
+
+    async def record(item: DatasetItem, context):
+        started.append(item.id)
+        await anyio.sleep(0)
+
+    pipeline = ItemPipeline(name="test_workers_order", steps=[record])
+    dataset = create_dataset(10)
+
+    await pipeline.run(dataset, params={ "max_concurrent_items": 1, "execution_mode": "workers" })
+
+    assert started == [item.id for item in dataset.items]
+
+
+@pytest.mark.asyncio
+async def test_workers_mode_isolates_item_errors():
+    async def fail_on_odd(item: DatasetItem, context):
+        if item.data["value"] % 2:
+            raise ValueError("odd item")
+
+    pipeline = ItemPipeline(name="test_workers_errors", steps=[fail_on_odd])
+    dataset = create_dataset(6)
+
+    await pipeline.run(dataset, params={ "max_concurrent_items": 2, "execution_mode": "workers" })
+
+    statuses = {
+        info.id: info.status for info in pipeline_service.items if info.item in dataset.items
+    }
+    assert statuses == {
+        item.id: "error" if item.data["value"] % 2 else "success" for item in dataset.items
+    }
+
+
+def test_auto_mode_uses_workers_for_large_datasets():
+    pipeline = ItemPipeline(name="test_auto", steps=[])
+    context = type("FakeContext", (), { "params": { "execution_mode": "auto" } })()
+
+    assert pipeline._get_execution_mode(create_dataset(10), context) == "tasks"
+    assert pipeline._get_execution_mode(create_dataset(1001), context) == "workers"
+
+
+@pytest.mark.asyncio
+async def test_staged_mode_runs_stages_with_own_workers():
+    slow_stage = ConcurrencyTracker()
+    fast_stage = ConcurrencyTracker()
+
+    async def fail_on_three(item: DatasetItem, context):
+        if item.data["value"] == 3:
+            raise ValueError("bad item")
+
+    pipeline = ItemPipeline(name="test_staged", steps=[fail_on_three, slow_stage, fast_stage])
+    dataset = create_dataset(12)
+
+    await pipeline.run(dataset, params={
+        "max_concurrent_items": 2,
+        "execution_mode": "staged",
+        "stage_workers": { 1: 4 },
+        "stage_buffer_size": 3,
+    })
+
+    expected_ids = [item.id for item in dataset.items if item.data["value"] != 3]
+    assert sorted(slow_stage.seen) == expected_ids
+    assert sorted(fast_stage.seen) == expected_ids
+    assert slow_stage.max_active == 4
+    assert fast_stage.max_active <= 2
+
+    execution = next(info for info in pipeline_service.pipelines if info.pipeline is pipeline)
+    assert [stage.workers for stage in execution.stages] == [2, 4, 2]
+    assert [stage.completed for stage in execution.stages] == [11, 11, 11]
+    assert [stage.failed for stage in execution.stages] == [1, 0, 0]
+    assert all(stage.queue_depth == 0 and stage.in_progress == 0 for stage in execution.stages)
+    assert all(stage.end_time is not None for stage in execution.stages)
+
+    statuses = [info.status for info in pipeline_service.items if info.item in dataset.items]
+    assert statuses.count("success") == 11
+    assert statuses.count("error") == 1
+
+
+@pytest.mark.asyncio
+async def test_longest_first_order_uses_previous_durations(tmp_path):
+    started = []
+
+    async def sleep_for_value(item: DatasetItem, context):
+        started.append(item.id)
+        await anyio.sleep(item.data["value"] * 0.01)
+
+    pipeline = ItemPipeline(name="test_longest_first", steps=[sleep_for_value])
+    params = {
+        "max_concurrent_items": 1,
+        "item_order": "longest_first",
+        "item_timings_file": tmp_path / "item_timings.json",
+    }
+
+    # Without previous durations, items are processed in input order
+    await pipeline.run(create_dataset(4), params=params)
+    assert started == ["item_000", "item_001", "item_002", "item_003"]
+
+    started.clear()
+    dataset = create_dataset(5)
+    await pipeline.run(dataset, params=params)
+
+    # The new item is assumed to take an average amount of time
+    assert started == ["item_003", "item_002", "item_004", "item_001", "item_000"]
+    assert [item.data["index"] for item in dataset.items] == list(range(5))
+
+
+@pytest.mark.asyncio
+async def test_input_order_records_durations_for_longest_first(tmp_path):
+    started = []
+
+    async def sleep_for_value(item: DatasetItem, context):
+        started.append(item.id)
+        await anyio.sleep(item.data["value"] * 0.01)
+
+    pipeline = ItemPipeline(name="test_input_order_timings", steps=[sleep_for_value])
+    params = {
+        "max_concurrent_items": 1,
+        "item_timings_file": tmp_path / "item_timings.json",
+    }
+
+    await pipeline.run(create_dataset(3), params=params)
+    started.clear()
+    await pipeline.run(create_dataset(3), params={ **params, "item_order": "longest_first" })
+
+    assert started == ["item_002", "item_001", "item_000"]
+
+
+def test_item_timings_merge_durations_saved_by_other_pipelines(tmp_path):
+    def info(id: str, duration: float):
+        return SimpleNamespace(id=id, status="success", start_time=1.0, end_time=1.0 + duration)
+
+    timings_file = tmp_path / "item_timings.json"
+    first = ItemTimings(timings_file)
+    second = ItemTimings(timings_file)
+
+    first.record("first", [info("a", 1.0)])
+    first.save()
+    second.record("second", [info("b", 2.0)])
+    second.save()
+
+    saved = ItemTimings(timings_file)
+    assert saved.get_durations("first") == { "a": 1.0 }
+    assert saved.get_durations("second") == { "b": 2.0 }
+
+
+@pytest.mark.asyncio
+async def test_item_order_accepts_priority_function():
+    started = []
+
+    async def record(item: DatasetItem, context):
+        started.append(item.id)
+
+    pipeline = ItemPipeline(name="test_priority_order", steps=[record])
+
+    await pipeline.run(create_dataset(4), params={
+        "max_concurrent_items": 1,
+        "execution_mode": "workers",
+        "item_order": lambda item, duration: -item.data["value"],
+    })
+
+    assert started == ["item_003", "item_002", "item_001", "item_000"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("execution_mode", ["tasks", "staged"])
+async def test_item_timeout_marks_slow_items(execution_mode):
+    remaining_times = []
+
+    async def record_budget(item: DatasetItem, context):
+        remaining_times.append(context.remaining_time)
+
+    async def hang_on_two(item: DatasetItem, context):
+        if item.data["value"] == 2:
+            await anyio.sleep(10)
+
+    pipeline = ItemPipeline(
+        name=f"test_timeout_{execution_mode}",
+        steps=[record_budget, hang_on_two],
+    )
+    dataset = create_dataset(4)
+
+    with anyio.fail_after(5):
+        await pipeline.run(dataset, params={
+            "max_concurrent_items": 4,
+            "execution_mode": execution_mode,
+            "item_timeout": 0.2,
+        })
+
+    assert all(0 < remaining_time <= 0.2 for remaining_time in remaining_times)
+
+    statuses = [info.status for info in pipeline_service.items if info.item in dataset.items]
+    assert statuses == ["success", "success", "timeout", "success"]
+
+
+@pytest.mark.asyncio
+async def test_step_timeout_never_extends_item_deadline():
+    timeouts = []
+
+    async def record_timeout(item: DatasetItem, context):
+        timeouts.append(context.get_timeout(60))
+
+    pipeline = ItemPipeline(name="test_step_timeout", steps=[record_timeout])
+
+    await pipeline.run(create_dataset(1), params={ "item_timeout": 30, "step_timeout": 120 })
+    await pipeline.run(create_dataset(1), params={ "item_timeout": 120, "step_timeout": 10 })
+
+    assert 29 < timeouts[0] <= 30
+    assert 9 < timeouts[1] <= 10
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("execution_mode", ["tasks", "workers"])
+async def test_nested_pipelines_share_concurrency_budget(execution_mode):
+    tracker = ConcurrencyTracker()
+    inner_pipeline = ItemPipeline(name="test_inner", steps=[tracker])
+
+    async def run_inner_pipeline(item: DatasetItem, context):
+        inner_dataset = Dataset([DatasetItem(f"{item.id}_{index}") for index in range(5)])
+        await inner_pipeline.run(inner_dataset, context)
+
+    pipeline = ItemPipeline(name="test_outer", steps=[run_inner_pipeline])
+
+    await pipeline.run(create_dataset(4), params={
+        "max_concurrent_items": 4,
+        "execution_mode": execution_mode,
+    })
+
+    assert len(tracker.seen) == 20
+    assert tracker.max_active == 4
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("execution_mode", ["tasks", "workers", "staged"])
+async def test_batch_item_actions_receive_batches(execution_mode):
+    batches = []
+
+    async def double_values(items, context):
+        batches.append([item.id for item in items])
+        for item in items:
+            if item.data["value"] == 7:
+                raise ValueError("Batch failed")
+            item.push({ "doubled": item.data["value"] * 2 }, "double_values")
+
+    async def check_doubled(item: DatasetItem, context):
+        assert item.data["doubled"] == item.data["value"] * 2
+
+    pipeline = ItemPipeline(
+        name=f"test_batch_{execution_mode}",
+        steps=[BatchItemAction(double_values, max_batch_size=4, max_wait=0.05), check_doubled],
+    )
+    dataset = create_dataset(10)
+
+    await pipeline.run(dataset, params={
+        "max_concurrent_items": 10,
+        "execution_mode": execution_mode,
+    })
+
+    statuses = {
+        info.item.id: info.status for info in pipeline_service.items if info.item in dataset.items
+    }
+    failed = [item_id for item_id, status in statuses.items() if status != "success"]
+
+    assert sorted(item_id for batch in batches for item_id in batch) == \
+        [item.id for item in dataset.items]
+    assert max(len(batch) for batch in batches) == 4
+    assert sorted(failed) == sorted(next(batch for batch in batches if "item_007" in batch))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("execution_mode", ["tasks", "workers", "staged"])
+async def test_streamed_setup_overlaps_loading_with_processing(execution_mode):
+    first_item_processed = anyio.Event()
+    processed = []
+
+    async def load_items(dataset: Dataset, context):
+        for index in range(6):
+            item = DatasetItem(f"{execution_mode}_item_{index:03d}", { "value": index })
+            dataset.add(item)
+            yield item
+
+            # Only finishes loading if items are processed while loading
+            if index == 0:
+                await first_item_processed.wait()
+
+    async def process(item: DatasetItem, context):
+        processed.append(item.id)
+        first_item_processed.set()
+
+    pipeline = ItemPipeline(
+        name=f"test_stream_{execution_mode}",
+        steps=[process],
+        setup=[load_items],
+    )
+    dataset = Dataset()
+
+    with anyio.fail_after(5):
+        await pipeline.run(dataset, params={
+            "max_concurrent_items": 2,
+            "execution_mode": execution_mode,
+            "source_buffer_size": 1,
+        })
+
+    assert sorted(processed) == [f"{execution_mode}_item_{index:03d}" for index in range(6)]
+    assert [item.data["index"] for item in dataset.items] == list(range(6))
+    assert { info.item.id for info in pipeline_service.items if info.item in dataset.items } == \
+        set(processed)
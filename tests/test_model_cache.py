@@ -0,0 +1,71 @@
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from dataset_foundry.core.model import Model
+from dataset_foundry.core.model_cache import ModelCache, ModelCacheMissError
+
+
+class FakeChatModel:
+    def __init__(self):
+        self.calls = 0
+        self.model_kwargs = {}
+
+    async def ainvoke(self, messages, **kwargs):
+        self.calls += 1
+        return AIMessage(content=f"response {self.calls}")
+
+
+def create_model(monkeypatch, cache: ModelCache, temperature: float = 0.5) -> Model:
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    model = Model("openai/gpt-4o-mini", temperature=temperature, cache=cache)
+    model._model = FakeChatModel()
+    return model
+
+
+@pytest.mark.asyncio
+async def test_identical_requests_use_cached_response(monkeypatch, tmp_path):
+    cache = ModelCache(tmp_path / "cache.sqlite")
+    model = create_model(monkeypatch, cache)
+
+    first = await model.ainvoke([HumanMessage(content="Hello")])
+    second = await model.ainvoke([HumanMessage(content="Hello")])
+    other = await model.ainvoke([HumanMessage(content="Goodbye")])
+    warmer = await create_model(monkeypatch, cache, 1.0).ainvoke([HumanMessage(content="Hello")])
+
+    assert first.content == second.content == "response 1"
+    assert other.content == "response 2"
+    assert warmer.content == "response 1"
+    assert model._model.calls == 2
+    assert cache.get_stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_replay_and_refresh_modes(monkeypatch, tmp_path):
+    path = tmp_path / "cache.sqlite"
+    await create_model(monkeypatch, ModelCache(path)).ainvoke([HumanMessage(content="Hello")])
+
+    replay = create_model(monkeypatch, ModelCache(path, mode="replay"))
+    assert (await replay.ainvoke([HumanMessage(content="Hello")])).content == "response 1"
+    with pytest.raises(ModelCacheMissError):
+        await replay.ainvoke([HumanMessage(content="Goodbye")])
+    assert replay._model.calls == 0
+
+    refresh = create_model(monkeypatch, ModelCache(path, mode="refresh"))
+    refresh._model.calls = 1
+    assert (await refresh.ainvoke([HumanMessage(content="Hello")])).content == "response 2"
+
+    replay = create_model(monkeypatch, ModelCache(path, mode="replay"))
+    assert (await replay.ainvoke([HumanMessage(content="Hello")])).content == "response 2"
+
+
+def test_evicts_least_recently_used_responses(tmp_path):
+    cache = ModelCache(tmp_path / "cache.sqlite", max_size=350)
+
+    for index in range(3):
+        cache.put(f"key_{index}", "x" * 100)
+    cache.get("key_0")
+    cache.put("key_3", "x" * 100)
+
+    assert cache.get("key_0") is not None
+    assert cache.get("key_1") is None
+    assert cache.get_stats()["evictions"] == 1
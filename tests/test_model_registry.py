@@ -0,0 +1,91 @@
+import pytest
+
+from dataset_foundry.core.model import Model
+from dataset_foundry.core.model_registry import ModelRegistry, get_model, model_registry
+from dataset_foundry.core.retry_policy import RetryPolicy
+
+
+@pytest.fixture(autouse=True)
+def api_keys(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test")
+
+
+@pytest.mark.asyncio
+async def test_models_are_cached_by_parameters():
+    registry = ModelRegistry()
+
+    model = registry.get("openai/gpt-4o-mini", temperature=0.5)
+
+    assert registry.get("openai/gpt-4o-mini", temperature=0.5) is model
+    assert registry.get("openai/gpt-4o-mini", temperature=1.0) is not model
+    assert registry.get("openai/gpt-4o", temperature=0.5) is not model
+
+    await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_models_of_a_provider_share_an_http_client():
+    registry = ModelRegistry(max_connections=10, http2=False)
+
+    openai_client = registry.get_http_client("openai")
+    anthropic_client = registry.get_http_client("anthropic")
+    gpt = registry.get("openai/gpt-4o-mini")
+    claude = registry.get("anthropic/claude-3-5-haiku-latest")
+
+    assert openai_client is not anthropic_client
+    assert gpt._model.http_async_client is openai_client
+    assert registry.get("openai/gpt-4o")._model.http_async_client is openai_client
+    assert claude._model._async_client._client is anthropic_client
+
+    await registry.aclose()
+
+    assert openai_client.is_closed
+    assert anthropic_client.is_closed
+    assert registry.get("openai/gpt-4o-mini") is not gpt
+    assert not registry.get_http_client("openai").is_closed
+
+    await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_get_model_resolves_strings():
+    model = Model("openai/gpt-4o-mini")
+
+    assert get_model(model) is model
+    assert get_model("openai/gpt-4o-mini") is get_model("openai/gpt-4o-mini")
+
+    await model_registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_get_model_uses_default_parameters():
+    retry = RetryPolicy()
+    model_registry.set_defaults(temperature=0.2, retry=retry)
+
+    try:
+        model = get_model("openai/gpt-4o-mini")
+
+        assert model.retry is retry
+        assert model.info["temperature"] == 0.2
+        assert model_registry.get("openai/gpt-4o-mini") is not model
+    finally:
+        model_registry.set_defaults()
+        await model_registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_models_resolved_by_name_get_their_own_hedging_policy():
+    model_registry.set_defaults(hedging={ "percentile": 0.9 })
+
+    try:
+        gpt = get_model("openai/gpt-4o-mini")
+        claude = get_model("anthropic/claude-3-5-haiku-latest")
+
+        assert gpt.hedging is not None
+        assert claude.hedging is not None
+        assert gpt.hedging is not claude.hedging
+        assert get_model("openai/gpt-4o-mini") is gpt
+    finally:
+        model_registry.set_defaults()
+        await model_registry.aclose()
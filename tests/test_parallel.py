@@ -0,0 +1,78 @@
+import anyio
+import pytest
+
+from dataset_foundry.actions.dataset.parallel import parallel
+from dataset_foundry.core.dataset import Dataset
+from dataset_foundry.core.dataset_item import DatasetItem
+from dataset_foundry.core.dataset_pipeline import DatasetPipeline
+from dataset_foundry.core.item_pipeline import ItemPipeline
+
+
+def create_dataset(count: int) -> Dataset:
+    return Dataset([DatasetItem(f"item_{index:03d}", { "value": index }) for index in range(count)])
+
+
+@pytest.mark.asyncio
+async def test_branches_run_concurrently():
+    both_started = anyio.Event()
+    started = []
+
+    def create_branch(name: str):
+        async def branch(dataset: Dataset, context):
+            started.append(name)
+            if len(started) == 2:
+                both_started.set()
+            await both_started.wait()
+
+        return branch
+
+    pipeline = DatasetPipeline(steps=[parallel([create_branch("a"), create_branch("b")])])
+
+    with anyio.fail_after(5):
+        await pipeline.run(create_dataset(1))
+
+    assert sorted(started) == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_forked_branches_merge_in_branch_order():
+    async def slow_label(item: DatasetItem, context):
+        await anyio.sleep(0.05)
+        item.push({ "label": "slow", "slow": True }, slow_label)
+
+    async def fast_label(item: DatasetItem, context):
+        item.push({ "label": "fast", "fast": True }, fast_label)
+
+    async def add_item(dataset: Dataset, context):
+        dataset.add(DatasetItem("parallel_added", { "value": -1 }))
+        dataset.metadata["added_by"] = "add_item"
+
+    pipeline = DatasetPipeline(steps=[
+        parallel([
+            ItemPipeline(name="slow", steps=[slow_label]),
+            [ItemPipeline(name="fast", steps=[fast_label]), add_item],
+        ], fork=True),
+    ])
+    dataset = create_dataset(3)
+
+    await pipeline.run(dataset, params={ "max_concurrent_items": 2 })
+
+    # The fast branch finishes first but is listed last, so its label wins
+    assert [item.data["label"] for item in dataset.items[:3]] == ["fast"] * 3
+    assert all(item.data["fast"] and item.data["slow"] for item in dataset.items[:3])
+    assert [item.id for item in dataset.items[3:]] == ["parallel_added"]
+    assert dataset.metadata["added_by"] == "add_item"
+
+
+@pytest.mark.asyncio
+async def test_failed_branch_raises_its_error():
+    async def fail(dataset: Dataset, context):
+        raise ValueError("Branch failed")
+
+    async def wait(dataset: Dataset, context):
+        await anyio.sleep(10)
+
+    pipeline = DatasetPipeline(steps=[parallel([wait, fail])])
+
+    with anyio.fail_after(5), pytest.raises(ValueError, match="Branch failed"):
+        await pipeline.run(create_dataset(1))
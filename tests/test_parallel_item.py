@@ -0,0 +1,47 @@
+import anyio
+import pytest
+
+from dataset_foundry.actions.item.parallel_item import parallel_item
+from dataset_foundry.core.dataset_item import DatasetItem
+
+
+def create_step(key: str, value: str, delay: float):
+    async def step(item: DatasetItem, context):
+        await anyio.sleep(delay)
+        item.push({ key: value }, f"set_{key}_{value}")
+
+    return step
+
+
+@pytest.mark.asyncio
+async def test_branches_run_concurrently_and_push_in_branch_order():
+    item = DatasetItem("item", { "spec": "spec" })
+    action = parallel_item([
+        [create_step("code", "slow", 0.2), create_step("label", "first", 0)],
+        create_step("label", "second", 0.1),
+        create_step("tests", "fast", 0),
+    ])
+
+    start_time = anyio.current_time()
+    await action(item, None)
+
+    # Sequential steps would take 0.3 seconds
+    assert anyio.current_time() - start_time < 0.28
+    assert item.data == { "spec": "spec", "code": "slow", "label": "second", "tests": "fast" }
+    assert [record["step"] for record in item.data_history] == [
+        "set_code_slow", "set_label_first", "set_label_second", "set_tests_fast",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_failed_branch_pushes_nothing():
+    async def fail(item: DatasetItem, context):
+        raise ValueError("Branch failed")
+
+    item = DatasetItem("item", { "spec": "spec" })
+    action = parallel_item([create_step("code", "value", 0), fail])
+
+    with pytest.raises(ValueError, match="Branch failed"):
+        await action(item, None)
+
+    assert item.data == { "spec": "spec" }
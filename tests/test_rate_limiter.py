@@ -0,0 +1,104 @@
+import time
+
+import anyio
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from dataset_foundry.core.model import Model, model_events
+from dataset_foundry.core.rate_limiter import RateLimiter, RateLimiters, TokenBucket, rate_limiters
+
+
+def set_level(bucket: TokenBucket, level: float) -> None:
+    # Refill first so the time before the level was set isn't credited on the next refill
+    bucket.refill()
+    bucket.level = level
+
+
+class FakeChatModel:
+    def __init__(self):
+        self.calls = 0
+        self.model_kwargs = {}
+
+    async def ainvoke(self, messages, **kwargs):
+        self.calls += 1
+        return AIMessage(
+            content="response",
+            usage_metadata={ "input_tokens": 10, "output_tokens": 590, "total_tokens": 600 },
+        )
+
+
+@pytest.mark.asyncio
+async def test_callers_queue_until_requests_are_available():
+    # 600 requests per minute refills one request every 0.1s once the burst is used up
+    limiter = RateLimiter(requests_per_minute=600)
+    set_level(limiter._requests, 1)
+    order = []
+
+    async def call(index: int):
+        await limiter.acquire()
+        order.append(index)
+
+    start_time = time.monotonic()
+    async with anyio.create_task_group() as tg:
+        for index in range(3):
+            tg.start_soon(call, index)
+            await anyio.sleep(0.01)
+
+    assert order == [0, 1, 2]
+    assert time.monotonic() - start_time >= 0.18
+    assert limiter.get_stats()["waits"] == 2
+    assert limiter.get_stats()["total_wait_time"] > 0
+
+
+@pytest.mark.asyncio
+async def test_actual_usage_corrects_token_estimate():
+    limiter = RateLimiter(tokens_per_minute=6000)
+
+    assert await limiter.acquire(100) < 0.001
+    limiter.record_usage(100, 6000)
+
+    # 100 tokens per second, so using the whole minute's tokens leaves the next request waiting 1s
+    assert 0.9 < await limiter.acquire(100) < 1.5
+
+
+def test_set_limits_parses_strings_and_dicts():
+    limiters = RateLimiters()
+    limiters.set_limits({
+        "openai/gpt-4o-mini": "500:200000",
+        "anthropic/claude-3-5-haiku": { "requests_per_minute": 50 },
+        "openai/gpt-4o": "",
+    })
+
+    assert limiters.limits["openai/gpt-4o-mini"] == {
+        "requests_per_minute": 500,
+        "tokens_per_minute": 200000,
+    }
+    assert limiters.limits["anthropic/claude-3-5-haiku"]["tokens_per_minute"] is None
+    assert limiters.get("openai/gpt-4o").requests_per_minute is None
+
+    with pytest.raises(ValueError):
+        limiters.set_limit("openai/gpt-4o", "-1")
+
+
+@pytest.mark.asyncio
+async def test_model_waits_for_rate_limit(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setattr(rate_limiters, "_limiters", {})
+    rate_limiters.set_limit("openai/gpt-4o-mini", "6000:6000")
+
+    model = Model("openai/gpt-4o-mini")
+    model._model = FakeChatModel()
+    waits = []
+    listener = lambda _event_type, data: waits.append(data["wait_time"])
+    model_events.on("rate_limit_waited", listener)
+
+    try:
+        set_level(rate_limiters.get("openai/gpt-4o-mini")._tokens, 600)
+        await model.ainvoke([HumanMessage(content="Hello")])
+        await model.ainvoke([HumanMessage(content="Hello")])
+    finally:
+        model_events.off("rate_limit_waited", listener)
+
+    assert model._model.calls == 2
+    assert len(waits) == 1
+    assert waits[0] > 0
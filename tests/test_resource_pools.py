@@ -0,0 +1,132 @@
+import math
+from contextlib import asynccontextmanager
+
+import anyio
+import pytest
+
+import dataset_foundry.actions.item.run_unit_tests as run_unit_tests_module
+from dataset_foundry.core.context import Context
+from dataset_foundry.core.dataset import Dataset
+from dataset_foundry.core.dataset_item import DatasetItem
+from dataset_foundry.core.fair_limiter import FairLimiter
+from dataset_foundry.core.resource_pools import ResourcePools
+
+
+async def run_holders(pools: ResourcePools, name: str, count: int) -> int:
+    active = 0
+    max_active = 0
+
+    async def hold():
+        nonlocal active, max_active
+        async with pools.acquire(name):
+            active += 1
+            max_active = max(max_active, active)
+            await anyio.sleep(0.01)
+            active -= 1
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(count):
+            tg.start_soon(hold)
+
+    return max_active
+
+
+@pytest.mark.asyncio
+async def test_pools_are_unlimited_by_default():
+    pools = ResourcePools()
+
+    assert await run_holders(pools, "llm", 8) == 8
+    assert pools.get_usage("llm")["total"] == math.inf
+
+
+@pytest.mark.asyncio
+async def test_pool_limits_are_independent():
+    pools = ResourcePools()
+    pools.set_limits({ "container": 2, "llm": "3" })
+
+    assert await run_holders(pools, "container", 6) == 2
+    assert await run_holders(pools, "llm", 6) == 3
+    assert await run_holders(pools, "cpu", 6) == 6
+
+
+@pytest.mark.asyncio
+async def test_set_limit_applies_to_existing_pool():
+    pools = ResourcePools()
+    pools.set_limit("agent", 1)
+    assert await run_holders(pools, "agent", 4) == 1
+
+    pools.set_limit("agent", 4)
+    assert await run_holders(pools, "agent", 4) == 4
+
+    pools.set_limit("agent", None)
+    assert pools.limits["agent"] == math.inf
+
+
+@pytest.mark.asyncio
+async def test_same_task_can_hold_pool_more_than_once():
+    pools = ResourcePools()
+    pools.set_limit("cpu", 2)
+
+    async with pools.acquire("cpu"):
+        async with pools.acquire("cpu"):
+            assert pools.get_usage("cpu")["borrowed"] == 2
+
+
+@pytest.mark.asyncio
+async def test_empty_name_skips_pools():
+    pools = ResourcePools()
+
+    async with pools.acquire(None):
+        pass
+
+    assert pools.get_usage("llm")["borrowed"] == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kwargs, expected", [
+    ({}, "cpu"),
+    ({ "resource": "gpu" }, "gpu"),
+    ({ "resource": None }, None),
+])
+async def test_run_unit_tests_resource(monkeypatch, kwargs, expected):
+    acquired = []
+
+    @asynccontextmanager
+    async def acquire(name):
+        acquired.append(name)
+        yield
+
+    monkeypatch.setattr(run_unit_tests_module.resource_pools, "acquire", acquire)
+    monkeypatch.setattr(run_unit_tests_module, "run_python_unit_tests", lambda *args, **kwargs: {})
+
+    action = run_unit_tests_module.run_unit_tests("test_item.py", dir="tests", **kwargs)
+    await action(DatasetItem("item", {}), Context(None, Dataset()))
+
+    assert acquired == [expected]
+
+
+@pytest.mark.asyncio
+async def test_fair_limiter_shares_tokens_by_weight():
+    limiter = FairLimiter(1)
+    granted = []
+
+    async def hold(flow: str, weight: float):
+        await limiter.acquire(flow, weight)
+        granted.append(flow)
+        await anyio.sleep(0.001)
+        limiter.release()
+
+    # The first flow holds the only token and queues up first, but doesn't starve the second
+    await limiter.acquire("bulk", 1)
+    async with anyio.create_task_group() as tg:
+        for _ in range(4):
+            tg.start_soon(hold, "bulk", 1)
+        for _ in range(4):
+            tg.start_soon(hold, "validation", 2)
+
+        await anyio.sleep(0.01)
+        assert limiter.get_usage() == { "borrowed": 1, "total": 1, "waiting": 8 }
+        limiter.release()
+
+    assert granted[:6].count("validation") == 4
+    assert sorted(granted) == ["bulk"] * 4 + ["validation"] * 4
@@ -0,0 +1,122 @@
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from dataset_foundry.core.dataset import Dataset
+from dataset_foundry.core.dataset_item import DatasetItem
+from dataset_foundry.core.item_pipeline import ItemPipeline
+from dataset_foundry.core.model import Model
+from dataset_foundry.core.pipeline_service import pipeline_service
+from dataset_foundry.core.retry_policy import RetryPolicy
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, headers: dict):
+        self.status_code = status_code
+        self.headers = headers
+
+
+class FakeStatusError(Exception):
+    def __init__(self, status_code: int, headers: dict = {}):
+        super().__init__(f"Error code: {status_code}")
+        self.status_code = status_code
+        self.response = FakeResponse(status_code, headers)
+
+
+class FakeChatModel:
+    def __init__(self, errors: list):
+        self.errors = errors
+        self.calls = 0
+        self.model_kwargs = {}
+
+    async def ainvoke(self, messages, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return AIMessage(content="response")
+
+
+def create_model(monkeypatch, errors: list, retry: RetryPolicy) -> Model:
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    model = Model("openai/gpt-4o-mini", retry=retry)
+    model._model = FakeChatModel(errors)
+    return model
+
+
+def test_errors_are_classified():
+    policy = RetryPolicy()
+
+    assert policy.classify(FakeStatusError(429)) == "rate_limit"
+    assert policy.classify(FakeStatusError(503)) == "server"
+    assert policy.classify(ConnectionResetError()) == "connection"
+    assert policy.classify(FakeStatusError(400)) is None
+    assert policy.classify(ValueError("bad output")) is None
+
+
+def test_delay_honours_retry_after_and_backs_off():
+    policy = RetryPolicy(base_delay=1.0, max_delay=5.0, max_retry_after=30.0)
+
+    assert policy.get_delay(FakeStatusError(429, { "retry-after": "12" }), 0) == 12.0
+    assert policy.get_delay(FakeStatusError(429, { "retry-after-ms": "250" }), 0) == 0.25
+    assert policy.get_delay(FakeStatusError(429, { "retry-after": "600" }), 0) == 30.0
+    assert all(0 <= policy.get_delay(FakeStatusError(503), 1) <= 2.0 for _ in range(20))
+    assert all(0 <= policy.get_delay(FakeStatusError(503), 10) <= 5.0 for _ in range(20))
+
+
+def test_retries_are_capped_by_class_and_global_budget():
+    policy = RetryPolicy(budgets={ "server": 1 }, max_retry_ratio=0.5, min_retries=1)
+
+    policy.start_call()
+    assert policy.try_start_retry("server", 0)
+    assert not policy.try_start_retry("server", 1)
+    assert not policy.try_start_retry("rate_limit", 0)
+    assert policy.get_stats()["refused"] == 1
+
+    policy.start_call()
+    assert policy.try_start_retry("rate_limit", 0)
+    assert policy.get_stats()["retries"] == 2
+
+
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried(monkeypatch):
+    policy = RetryPolicy(base_delay=0.01)
+    model = create_model(monkeypatch, [FakeStatusError(429), FakeStatusError(500)], policy)
+
+    response = await model.ainvoke([HumanMessage(content="Hello")])
+
+    assert response.content == "response"
+    assert model._model.calls == 3
+    assert policy.get_stats()["rate_limit_retries"] == 1
+    assert policy.get_stats()["server_retries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_other_errors_are_raised(monkeypatch):
+    model = create_model(monkeypatch, [FakeStatusError(400)], RetryPolicy(base_delay=0.01))
+
+    with pytest.raises(FakeStatusError):
+        await model.ainvoke([HumanMessage(content="Hello")])
+    assert model._model.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_retries_are_recorded_in_item_execution_info(monkeypatch):
+    model = create_model(
+        monkeypatch,
+        [FakeStatusError(503), FakeStatusError(503)],
+        RetryPolicy(base_delay=0.01),
+    )
+
+    async def generate(item: DatasetItem, context):
+        response = await model.ainvoke([HumanMessage(content=item.id)])
+        item.push({ "output": response.content }, "generate")
+
+    dataset = Dataset([DatasetItem("item_retried", {}), DatasetItem("item_clean", {})])
+    pipeline = ItemPipeline(name="test_retries", steps=[generate])
+
+    await pipeline.run(dataset, params={ "max_concurrent_items": 1 })
+
+    infos = { info.item.id: info for info in pipeline_service.items if info.item in dataset.items }
+
+    assert infos["item_retried"].model_retries == 2
+    assert infos["item_retried"].model_retry_latency > 0
+    assert infos["item_clean"].model_retries == 0
@@ -0,0 +1,64 @@
+import threading
+
+import pytest
+from unittest.mock import MagicMock
+
+from dataset_foundry.actions.item.parse_item import parse_item
+from dataset_foundry.actions.item.run_in_process import run_in_process
+from dataset_foundry.actions.item.validate_code_syntax import validate_code_syntax
+from dataset_foundry.core.dataset_item import DatasetItem
+from dataset_foundry.core.key import Key
+from dataset_foundry.utils.concurrency.process_pool import shutdown_process_pool
+
+
+@pytest.fixture(autouse=True)
+def process_pool():
+    yield
+    shutdown_process_pool()
+
+
+def create_context(params: dict = None):
+    context = MagicMock()
+    context.params = { "max_processes": 1, **(params or {}) }
+    context.config = {}
+    return context
+
+
+@pytest.mark.asyncio
+async def test_run_in_process_pushes_results_to_item():
+    item = DatasetItem("test_id", { "code": "def broken(:\n    pass" })
+    action = run_in_process(validate_code_syntax, input=Key("code"), output_key="syntax")
+
+    await action(item, create_context())
+
+    assert item.data["syntax"]["is_valid"] is False
+    assert "invalid syntax" in item.data["syntax"]["syntax_error"]
+
+
+@pytest.mark.asyncio
+async def test_run_in_process_only_sends_requested_fields():
+    item = DatasetItem("test_id", {
+        "output": "```yaml\nname: example\n```",
+        "lock": threading.Lock(),
+    })
+    action = run_in_process(
+        parse_item,
+        code_block="yaml",
+        output_key="parsed",
+        parser=None,
+        fields=["output"],
+    )
+
+    await action(item, create_context())
+
+    assert item.data["parsed"] == { "name": "example" }
+
+
+@pytest.mark.asyncio
+async def test_run_in_process_skips_unpicklable_params():
+    item = DatasetItem("test_id", { "code": "x = 1" })
+    action = run_in_process(validate_code_syntax, input=Key("code"))
+
+    await action(item, create_context({ "lock": threading.Lock() }))
+
+    assert item.data["code_syntax"] == { "is_valid": True, "syntax_error": None }
@@ -0,0 +1,104 @@
+import pytest
+import yaml
+from unittest.mock import MagicMock
+
+from dataset_foundry.actions.dataset.merge_dataset_shards import merge_dataset_shards
+from dataset_foundry.actions.dataset.save_dataset import save_dataset
+from dataset_foundry.core.dataset import Dataset
+from dataset_foundry.core.dataset_item import DatasetItem
+from dataset_foundry.core.item_pipeline import ItemPipeline
+from dataset_foundry.core.sharding import get_shard_index, parse_shard, shard_dataset
+
+
+def create_dataset(count: int) -> Dataset:
+    return Dataset([DatasetItem(f"item_{index:03d}", { "value": index }) for index in range(count)])
+
+
+def test_parse_shard():
+    assert parse_shard("1/4") == (1, 4)
+
+    for value in ["4/4", "-1/4", "1", "a/b", "0/0"]:
+        with pytest.raises(ValueError):
+            parse_shard(value)
+
+
+def test_shards_partition_items_regardless_of_order():
+    ids = [f"item_{index:03d}" for index in range(100)]
+
+    shards = []
+    for index in range(4):
+        dataset = create_dataset(100)
+        dataset.items.reverse()
+        shard_dataset(dataset, (index, 4))
+        shards.append([item.id for item in dataset.items])
+
+    assert sorted(id for shard in shards for id in shard) == ids
+    assert all(shard for shard in shards)
+    assert all(shard == sorted(shard, reverse=True) for shard in shards)
+    assert get_shard_index("item_042", 4) == get_shard_index("item_042", 4)
+
+
+@pytest.mark.asyncio
+async def test_top_level_pipeline_processes_only_its_shard():
+    seen = []
+
+    async def record(item: DatasetItem, context):
+        seen.append(item.id)
+
+    pipeline = ItemPipeline(name="test_shard", steps=[record])
+    dataset = create_dataset(20)
+    expected = [item.id for item in dataset.items if get_shard_index(item.id, 3) == 1]
+
+    await pipeline.run(dataset, params={ "shard": "1/3" })
+
+    assert sorted(seen) == expected
+
+
+@pytest.mark.asyncio
+async def test_merge_dataset_shards(tmp_path):
+    shard_dirs = [tmp_path / f"shard_{index}" for index in range(3)]
+    context = MagicMock()
+
+    for index, shard_dir in enumerate(shard_dirs):
+        dataset = create_dataset(6)
+        shard_dataset(dataset, (index, 3))
+        await save_dataset(dir=shard_dir)(dataset, context)
+
+        (shard_dir / "metadata.yaml").write_text(yaml.safe_dump({
+            "name": "test",
+            "shards": [index],
+        }))
+
+        for item in dataset.items:
+            (shard_dir / item.id).mkdir()
+            (shard_dir / item.id / "info.yaml").write_text(item.id)
+
+    output_dir = tmp_path / "merged"
+    dataset = Dataset()
+    await merge_dataset_shards(str(tmp_path / "shard_*"), dir=output_dir)(dataset, context)
+
+    merged = yaml.safe_load((output_dir / "dataset.yaml").read_text())
+    assert sorted(data["value"] for data in merged) == list(range(6))
+    assert dataset.metadata == { "name": "test", "shards": [0, 1, 2] }
+    assert sorted(path.name for path in output_dir.glob("*/info.yaml")) == ["info.yaml"] * 6
+
+
+@pytest.mark.asyncio
+async def test_merged_dataset_shards_keep_repeated_values(tmp_path):
+    shared = { "language": "python" }
+
+    # `yaml.safe_dump` writes repeated values as anchors, which are named `id001` in every file
+    for index in range(2):
+        shard_dir = tmp_path / f"shard_{index}"
+        shard_dir.mkdir()
+        (shard_dir / "dataset.yaml").write_text(yaml.safe_dump([
+            { "id": f"item_{index}_a", "config": shared },
+            { "id": f"item_{index}_b", "config": shared },
+        ], sort_keys=False))
+
+    output_dir = tmp_path / "merged"
+    await merge_dataset_shards(str(tmp_path / "shard_*"), dir=output_dir)(Dataset(), MagicMock())
+
+    merged = yaml.safe_load((output_dir / "dataset.yaml").read_text())
+    assert [data["id"] for data in merged] == ["item_0_a", "item_0_b", "item_1_a", "item_1_b"]
+    assert all(data["config"] == shared for data in merged)
@@ -0,0 +1,160 @@
+import anyio
+import pytest
+
+from dataset_foundry.actions.dataset.run_pipeline import run_pipeline
+from dataset_foundry.core.dataset import Dataset
+from dataset_foundry.core.dataset_pipeline import DatasetPipeline
+from dataset_foundry.core.dataset_item import DatasetItem
+from dataset_foundry.core.item_pipeline import ItemPipeline
+from dataset_foundry.core.pipeline_service import pipeline_service
+from dataset_foundry.core.work_queue import WorkQueue
+from dataset_foundry.core.work_queue_worker import WorkQueueWorker
+
+
+def create_items(count: int):
+    return [(index, DatasetItem(f"item_{index:03d}", { "value": index })) for index in range(count)]
+
+
+def test_items_are_leased_once_in_order(tmp_path):
+    queue = WorkQueue(tmp_path / "queue.sqlite")
+    assert queue.get_state() is None
+
+    queue.publish(create_items(3), { "pipeline": "test" })
+
+    leased = [queue.lease(f"worker_{index}", 60) for index in range(4)]
+
+    assert [item.id for item in leased[:3]] == ["item_000", "item_001", "item_002"]
+    assert leased[3] is None
+    assert queue.get_state() == "open"
+    assert queue.get_metadata() == { "pipeline": "test" }
+
+
+def test_only_lease_holder_can_complete_item(tmp_path):
+    queue = WorkQueue(tmp_path / "queue.sqlite")
+    queue.publish(create_items(1))
+
+    item = queue.lease("worker_a", 60)
+
+    assert not queue.complete(item.id, "worker_b", "success", { "value": 1 })
+    assert queue.renew(item.id, "worker_a", 60)
+    assert queue.complete(item.id, "worker_a", "success", { **item.data, "result": "done" })
+    assert not queue.has_unfinished_items()
+
+    [result] = [update for update in queue.get_updates() if update.status == "success"]
+    assert result.data == { "value": 0, "result": "done" }
+    assert result.worker_id == "worker_a"
+
+
+def test_expired_leases_are_reassigned_until_max_attempts(tmp_path):
+    queue = WorkQueue(tmp_path / "queue.sqlite", max_attempts=2)
+    queue.publish(create_items(1))
+
+    first = queue.lease("worker_a", -1)
+    second = queue.lease("worker_b", -1)
+
+    assert (first.id, first.attempts) == ("item_000", 1)
+    assert (second.id, second.attempts) == ("item_000", 2)
+    assert not queue.renew(first.id, "worker_a", 60)
+    assert queue.lease("worker_c", 60) is None
+    assert queue.get_counts() == { "error": 1 }
+
+
+@pytest.mark.asyncio
+async def test_workers_process_items_published_by_coordinator(tmp_path):
+    async def double(item: DatasetItem, context):
+        if item.data["value"] == 3:
+            raise ValueError("bad item")
+        await anyio.sleep(0.01)
+        item.push({ "doubled": item.data["value"] * 2 }, "double")
+
+    pipeline = ItemPipeline(name="test_queue", steps=[double])
+    dataset = Dataset([item for _, item in create_items(6)])
+    queue_path = tmp_path / "queue.sqlite"
+    processed = []
+
+    async def run_worker(worker_id: str):
+        worker = WorkQueueWorker(pipeline, WorkQueue(queue_path), worker_id=worker_id)
+        await worker.run(params={ "max_concurrent_items": 2, "work_queue_poll_interval": 0.01 })
+        processed.append(worker_id)
+
+    with anyio.fail_after(10):
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(run_worker, "worker_a")
+            tg.start_soon(run_worker, "worker_b")
+
+            await pipeline.run(dataset, params={
+                "execution_mode": "queue",
+                "work_queue": queue_path,
+                "work_queue_poll_interval": 0.01,
+            })
+
+    assert sorted(processed) == ["worker_a", "worker_b"]
+    assert [item.data.get("doubled") for item in dataset.items] == [0, 2, 4, None, 8, 10]
+    assert [item.data["index"] for item in dataset.items] == list(range(6))
+
+    execution = next(info for info in pipeline_service.pipelines if info.pipeline is pipeline)
+    statuses = [info.status for info in pipeline_service.get_items(execution.execution_id)]
+    assert statuses == ["success", "success", "success", "error", "success", "success"]
+
+
+@pytest.mark.asyncio
+async def test_nested_item_pipelines_run_within_queued_items(tmp_path):
+    async def mark_inner(item: DatasetItem, context):
+        item.push({ "inner": True }, "mark_inner")
+
+    inner = ItemPipeline(name="test_queue_inner", steps=[mark_inner])
+
+    async def run_inner(item: DatasetItem, context):
+        parts = Dataset([DatasetItem(f"{item.id}_part_{index}", {}) for index in range(2)])
+        await inner.run(parts, context)
+        item.push({ "parts": sum(part.data["inner"] for part in parts.items) }, "run_inner")
+
+    pipeline = ItemPipeline(name="test_queue_outer", steps=[run_inner])
+    dataset = Dataset([item for _, item in create_items(3)])
+    queue_path = tmp_path / "queue.sqlite"
+
+    with anyio.fail_after(10):
+        async with anyio.create_task_group() as tg:
+            worker = WorkQueueWorker(pipeline, WorkQueue(queue_path), worker_id="worker_a")
+            tg.start_soon(worker.run, None, None, { "work_queue_poll_interval": 0.01 })
+
+            await pipeline.run(dataset, params={
+                "execution_mode": "queue",
+                "work_queue": queue_path,
+                "work_queue_poll_interval": 0.01,
+            })
+
+    assert [item.data.get("parts") for item in dataset.items] == [2, 2, 2]
+
+
+@pytest.mark.asyncio
+async def test_workers_load_item_pipelines_referenced_by_module(tmp_path, monkeypatch):
+    (tmp_path / "queued_pipeline_module.py").write_text(
+        "from dataset_foundry.core.item_pipeline import ItemPipeline\n"
+        "\n"
+        "async def triple(item, context):\n"
+        "    item.push({ 'tripled': item.data['value'] * 3 }, 'triple')\n"
+        "\n"
+        "pipeline = ItemPipeline(name='test_queue_module', steps=[triple])\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    pipeline = DatasetPipeline(
+        name="test_queue_parent",
+        steps=[run_pipeline("queued_pipeline_module")],
+    )
+    dataset = Dataset([item for _, item in create_items(3)])
+    queue_path = tmp_path / "queue.sqlite"
+
+    with anyio.fail_after(10):
+        async with anyio.create_task_group() as tg:
+            worker = WorkQueueWorker(pipeline, WorkQueue(queue_path), worker_id="worker_a")
+            tg.start_soon(worker.run, None, None, { "work_queue_poll_interval": 0.01 })
+
+            await pipeline.run(dataset, params={
+                "execution_mode": "queue",
+                "work_queue": queue_path,
+                "work_queue_poll_interval": 0.01,
+            })
+
+    assert [item.data.get("tripled") for item in dataset.items] == [0, 3, 6]